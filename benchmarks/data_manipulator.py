@@ -0,0 +1,302 @@
+"""Micro-benchmarks of `utilities/data_manipulator.py` on synthetic SOEP columns.
+
+The columns mimic what the cleaning scripts receive from the raw `.dta` files:
+object columns mixing numbers with labelled missing-data codes like
+`[-1] keine Angabe`, labelled answer categories like `[1] Ja`, and cleaned
+categorical columns. No SOEP data is required.
+
+Run from the project root, e.g.
+
+    $ pixi run python benchmarks/data_manipulator.py --rows 100000 1000000
+
+Results are written as JSON (by default to `bld/benchmarks/`). Pass a previous
+result file via `--compare` to print the ratio of the new to the old timings.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from soep_preparation.config import BLD
+from soep_preparation.utilities import data_manipulator
+
+MISSING_CODE_LABELS = [
+    "[-1] keine Angabe",
+    "[-2] trifft nicht zu",
+    "[-3] nicht valide",
+    "[-4] Unzulaessige Mehrfachantwort",
+    "[-5] In Fragebogenversion nicht enthalten",
+    "[-6] Fragebogenversion mit geaenderter Filterfuehrung",
+    "[-8] Frage in diesem Jahr nicht Teil des Frageprogramms",
+]
+YES_NO_LABELS = ["[1] Ja", "[2] Nein"]
+STATUS_LABELS = [
+    f"[{code}] {label}"
+    for code, label in enumerate(
+        [
+            "Voll erwerbstätig",
+            "Teilzeitbeschäftigung",
+            "Ausbildung, Lehre",
+            "Unregelmässig, geringfügig erwerbstät.",
+            "Nicht erwerbstätig",
+            "Werkstatt für behinderte Menschen (seit 1998)",
+        ]
+        + [f"Beamte, Stufe {level}" for level in range(1, 10)]
+        + [f"NE: Status {number}" for number in range(1, 40)],
+        start=1,
+    )
+]
+
+DEFAULT_ROWS = [100_000, 1_000_000]
+DEFAULT_REPEATS = 5
+DEFAULT_OUTPUT_DIR = BLD / "benchmarks"
+
+
+def _with_missing_codes(
+    values: np.ndarray,
+    rng: np.random.Generator,
+    missing_share: float,
+) -> pd.Series:
+    """Replace a share of the values by labelled and numerical missing-data codes."""
+    out = values.astype(object)
+    is_missing = rng.random(len(out)) < missing_share
+    n_missing = int(is_missing.sum())
+    labelled = rng.random(n_missing) < 0.5  # noqa: PLR2004
+    codes = rng.choice(MISSING_CODE_LABELS, size=n_missing).astype(object)
+    codes[~labelled] = -rng.integers(1, 9, size=int((~labelled).sum())).astype(float)
+    out[is_missing] = codes
+    return pd.Series(out, dtype=object)
+
+
+def make_columns(n_rows: int, seed: int = 0) -> dict[str, pd.Series]:
+    """Create synthetic columns shaped like raw and cleaned SOEP variables.
+
+    Args:
+        n_rows: The number of rows of each column.
+        seed: The seed of the random number generator.
+
+    Returns:
+        Map of column kind to synthetic column.
+    """
+    rng = np.random.default_rng(seed)
+    # Incomes: many distinct values, a third of the observations missing.
+    income = _with_missing_codes(
+        np.round(rng.lognormal(mean=7.5, sigma=1.0, size=n_rows), 0),
+        rng=rng,
+        missing_share=0.3,
+    )
+    # Counts like the number of children: few distinct integral floats.
+    count = _with_missing_codes(
+        rng.integers(0, 8, size=n_rows).astype(float), rng=rng, missing_share=0.1
+    )
+    yes_no = _with_missing_codes(
+        rng.choice(YES_NO_LABELS, size=n_rows), rng=rng, missing_share=0.1
+    )
+    status = _with_missing_codes(
+        rng.choice(STATUS_LABELS, size=n_rows), rng=rng, missing_share=0.05
+    )
+    status_categorical = data_manipulator.object_to_str_categorical(status)
+    other_status_categorical = data_manipulator.object_to_str_categorical(
+        _with_missing_codes(
+            rng.choice(STATUS_LABELS, size=n_rows), rng=rng, missing_share=0.5
+        )
+    )
+    height = pd.Series(rng.normal(172, 10, size=n_rows), dtype="double[pyarrow]")
+    return {
+        "income": income,
+        "count": count,
+        "yes_no": yes_no,
+        "status": status,
+        "status_categorical": status_categorical,
+        "other_status_categorical": other_status_categorical,
+        "height": height,
+        "float_count": pd.Series(rng.integers(-3, 8, size=n_rows).astype(float)),
+        "int_count": pd.Series(rng.integers(0, 120, size=n_rows)),
+        "status_string": status_categorical.astype(pd.ArrowDtype(pa.string())),
+    }
+
+
+def get_cases() -> dict[str, Callable[[dict[str, pd.Series]], object]]:
+    """Get one benchmark case per public function of `data_manipulator`.
+
+    Returns:
+        Map of function name to a callable running it on the synthetic columns.
+    """
+    dm = data_manipulator
+    return {
+        "replace_not_applicable_answer": lambda c: dm.replace_not_applicable_answer(
+            series=c["income"], value=0
+        ),
+        "replace_missing_codes_with_na": lambda c: dm.replace_missing_codes_with_na(
+            c["income"]
+        ),
+        "apply_smallest_float_dtype": lambda c: dm.apply_smallest_float_dtype(
+            c["height"]
+        ),
+        "apply_smallest_int_dtype": lambda c: dm.apply_smallest_int_dtype(
+            c["int_count"]
+        ),
+        "convert_to_categorical": lambda c: dm.convert_to_categorical(
+            series=c["status_string"], ordered=False
+        ),
+        "create_dummy": lambda c: dm.create_dummy(
+            series=c["status_categorical"], value_for_comparison="Nicht erwerbstätig"
+        ),
+        "create_dummies": lambda c: dm.create_dummies(
+            series=c["status_categorical"],
+            conditions={
+                "nicht_erwerbstätig": ("Nicht erwerbstätig", "equal"),
+                "erwerbstätig": ("Nicht erwerbstätig", "neq"),
+                "voll_erwerbstätig": ("Voll erwerbstätig", "equal"),
+                "teilzeit": ("Teilzeitbeschäftigung", "equal"),
+                "beamter": ("Beamte", "startswith"),
+                "in_ausbildung": (["Ausbildung, Lehre", "NE: Status 3"], "isin"),
+            },
+        ),
+        "float_to_int": lambda c: dm.float_to_int(
+            series=c["float_count"], code_negative_values_as_na=True
+        ),
+        "object_to_float": lambda c: dm.object_to_float(c["income"]),
+        "object_to_int": lambda c: dm.object_to_int(c["count"]),
+        "object_to_bool_categorical": lambda c: dm.object_to_bool_categorical(
+            series=c["yes_no"], renaming={"[1] Ja": True, "[2] Nein": False}
+        ),
+        "object_to_int_categorical": lambda c: dm.object_to_int_categorical(c["count"]),
+        "object_to_str_categorical": lambda c: dm.object_to_str_categorical(
+            c["status"]
+        ),
+        "combine_first_and_make_categorical": lambda c: (
+            dm.combine_first_and_make_categorical(
+                series_1=c["other_status_categorical"],
+                series_2=c["status_categorical"],
+                ordered=False,
+            )
+        ),
+        "coalesce_suffixed": lambda c: dm.coalesce_suffixed(
+            data=pd.DataFrame(
+                {
+                    "height_1": c["height"],
+                    "height_2": c["height"].iloc[::-1].set_axis(c["height"].index),
+                    "status_1": c["other_status_categorical"],
+                    "status_2": c["status_categorical"],
+                }
+            ),
+            names=["height", "status"],
+            precedence=["1", "2"],
+        ),
+    }
+
+
+def run(
+    rows: list[int],
+    repeats: int = DEFAULT_REPEATS,
+    seed: int = 0,
+    functions: list[str] | None = None,
+) -> dict:
+    """Time the benchmark cases for each number of rows.
+
+    Args:
+        rows: The numbers of rows of the synthetic columns.
+        repeats: How often each case is timed.
+        seed: The seed of the random number generator.
+        functions: Names of the functions to benchmark. Defaults to all.
+
+    Returns:
+        The environment information and timings (in seconds) of each case.
+    """
+    cases = get_cases()
+    if functions is not None:
+        cases = {name: case for name, case in cases.items() if name in functions}
+    results = []
+    for n_rows in rows:
+        columns = make_columns(n_rows=n_rows, seed=seed)
+        for name, case in cases.items():
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                case(columns)
+                timings.append(time.perf_counter() - start)
+            results.append(
+                {
+                    "function": name,
+                    "n_rows": n_rows,
+                    "min": min(timings),
+                    "median": statistics.median(timings),
+                    "repeats": repeats,
+                }
+            )
+    return {
+        "created": datetime.now(tz=UTC).isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "pyarrow": pa.__version__,
+        },
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare(new: dict, old: dict) -> pd.DataFrame:
+    """Compare the minimal timings of two benchmark runs.
+
+    Args:
+        new: The result of the new run.
+        old: The result of the old run.
+
+    Returns:
+        The minimal timings of both runs and their ratio by function and rows.
+    """
+    index = ["function", "n_rows"]
+    new_timings = pd.DataFrame(new["results"]).set_index(index)["min"]
+    old_timings = pd.DataFrame(old["results"]).set_index(index)["min"]
+    out = pd.concat({"old": old_timings, "new": new_timings}, axis=1, join="inner")
+    out["ratio"] = out["new"] / out["old"]
+    return out
+
+
+def main() -> None:
+    """Run the benchmarks from the command line and store the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--functions", nargs="+", default=None)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    args = parser.parse_args()
+
+    result = run(
+        rows=args.rows,
+        repeats=args.repeats,
+        seed=args.seed,
+        functions=args.functions,
+    )
+    output = args.output
+    if output is None:
+        timestamp = datetime.now(tz=UTC).strftime("%Y%m%dT%H%M%S")
+        output = DEFAULT_OUTPUT_DIR / f"data_manipulator_{timestamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+    timings = pd.DataFrame(result["results"]).set_index(["function", "n_rows"])
+    print(timings[["min", "median"]].to_string())  # noqa: T201
+    if args.compare is not None:
+        old = json.loads(args.compare.read_text(encoding="utf-8"))
+        print(compare(new=result, old=old).to_string())  # noqa: T201
+    print(f"\nResults written to {output}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,581 @@
+"""Generate synthetic SOEP `.dta` files for end-to-end pipeline benchmarks.
+
+The raw SOEP data is restricted, so the pipeline cannot be built in CI or on a
+fresh machine. This script writes one synthetic `.dta` file per cleaning script
+in `clean_modules`, containing exactly the columns the script reads (see
+`get_relevant_column_names`). Values follow what each column is cleaned with:
+
+- labelled answers carry the labels of the `renaming` passed to the cleaning
+  function or, without one, the categories recorded in the metadata mapping,
+- numerical columns carry numbers which are cleaned to the dtype recorded in the
+  metadata mapping,
+- all columns but the keys carry SOEP missing-data codes (`[-1] keine Angabe`, ...).
+
+Labels are stored as Stata value labels, such that the conversion task sees the
+same mix of numbers and `[N] label` strings as with the real data. All modules
+share one synthetic population, so `pid`, `hid`, `cid` and `syear` are consistent
+across modules.
+
+Run from the project root, e.g.
+
+    $ pixi run python benchmarks/synthetic_soep_data.py --persons 10000
+    $ pixi run pytask
+
+The files are written to `data/<SOEP_VERSION>` unless `--data-root` is given.
+A directory which contains files already, e.g. the raw SOEP data, is only written
+into with `--overwrite`.
+"""
+
+import argparse
+import ast
+import inspect
+import re
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Literal, TypedDict
+
+import numpy as np
+import pandas as pd
+
+from soep_preparation.config import (
+    DATA_ROOT,
+    SOEP_VERSION,
+    SRC,
+    SURVEY_YEARS,
+    get_metadata,
+)
+from soep_preparation.utilities import data_manipulator
+from soep_preparation.utilities.general import (
+    get_relevant_column_names,
+    get_script_names,
+    load_script,
+)
+
+KEY_COLUMNS = ["pid", "hid", "cid", "syear"]
+MISSING_CODES = {
+    -1: "[-1] keine Angabe",
+    -2: "[-2] trifft nicht zu",
+    -3: "[-3] nicht valide",
+    -5: "[-5] In Fragebogenversion nicht enthalten",
+    -8: "[-8] Frage in diesem Jahr nicht Teil des Frageprogramms",
+}
+MISSING_SHARE = 0.1
+N_DEFAULT_CATEGORIES = 5
+INTEGER_FUNCTIONS = {
+    "apply_smallest_int_dtype",
+    "float_to_int",
+    "object_to_int",
+    "object_to_int_categorical",
+}
+STORAGE_OF_FUNCTION = {
+    "apply_smallest_int_dtype": "int",
+    "apply_smallest_float_dtype": "float",
+    "float_to_int": "float",
+}
+LABELLED_FUNCTIONS = {
+    "object_to_bool_categorical",
+    "object_to_int_categorical",
+    "object_to_str_categorical",
+}
+# Numbers of the integer dtypes exceed the bounds of the next smaller dtype, such
+# that cleaning infers the recorded dtype.
+INTEGER_RANGES = {
+    "int8[pyarrow]": (0, 100),
+    "int16[pyarrow]": (1_000, 10_000),
+    "int32[pyarrow]": (100_000, 1_000_000),
+}
+# Cleaning downcasts floats to single precision unless a value has no exact
+# single-precision representation.
+DOUBLE_ONLY_VALUE = 16_777_217.5
+_MAX_HELPER_DEPTH = 5
+_LABEL_CODE = re.compile(r"^\[(-?\d+)\]\s")
+_TEMPORARY_WIDE_COLUMN = re.compile(r"^tmp_|_\d+$")
+
+
+class ColumnSpec(TypedDict):
+    """Description of the values of one synthetic raw column.
+
+    - "answers" maps to the answers of the column, `[N] label` strings or
+      unlabelled numbers, empty for numbers
+    - "integer" maps to whether numbers are integral
+    - "storage" maps to the Stata storage of the column: "labelled" numbers,
+      which are read as objects mixing numbers and labels, or plain "int" or
+      "float" numbers
+    - "dtype" maps to the dtype recorded in the metadata mapping for the variable
+      the column is cleaned to, None if it is not recorded
+
+    """
+
+    answers: list[str | int]
+    integer: bool
+    storage: Literal["labelled", "int", "float"]
+    dtype: str | None
+
+
+def _function_name(call: ast.Call) -> str | None:
+    if isinstance(call.func, ast.Name):
+        return call.func.id
+    if isinstance(call.func, ast.Attribute):
+        return call.func.attr
+    return None
+
+
+def _is_source(node: ast.AST, source: str, parents: dict) -> bool:
+    """Whether the node is the source column or a method chain on it."""
+    if isinstance(node, ast.Subscript):
+        return (
+            isinstance(node.value, ast.Name)
+            and node.value.id == "raw_data"
+            and isinstance(node.slice, ast.Constant)
+            and node.slice.value == source
+        )
+    if isinstance(node, ast.Name):
+        return node.id == source and not isinstance(parents.get(node), ast.Attribute)
+    return False
+
+
+def _climb_to_argument(node: ast.AST, parents: dict) -> tuple[ast.AST, ast.Call | None]:
+    """Climb method chains and `replace_not_applicable_answer` to the consuming call.
+
+    Returns:
+        The argument node and the call consuming it, if any.
+    """
+    while True:
+        parent = parents.get(node)
+        if isinstance(parent, ast.Attribute):
+            call = parents.get(parent)
+            if isinstance(call, ast.Call) and call.func is parent:
+                node = call
+                continue
+            return node, None
+        if isinstance(parent, ast.keyword):
+            node, parent = parent, parents.get(parent)
+        if isinstance(parent, ast.Call):
+            if _function_name(parent) == "replace_not_applicable_answer":
+                node = parent
+                continue
+            return node, parent
+        return node, None
+
+
+def _evaluate(node: ast.AST, bindings: dict, namespace: ModuleType) -> Any:  # noqa: ANN401
+    if isinstance(node, ast.Name) and node.id in bindings:
+        bound_node, outer_bindings = bindings[node.id]
+        return _evaluate(bound_node, outer_bindings, namespace)
+    if isinstance(node, ast.Name | ast.Attribute):
+        names = []
+        while isinstance(node, ast.Attribute):
+            names.insert(0, node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name):
+            return None
+        value = getattr(namespace, node.id, None)
+        for name in names:
+            value = getattr(value, name, None)
+        return value
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        return None
+
+
+def _target_variable(call: ast.Call, parents: dict) -> str | None:
+    """Name of the output variable the statement containing the call assigns to."""
+    node: ast.AST | None = call
+    while node is not None and not isinstance(node, ast.Assign):
+        node = parents.get(node)
+    if node is None:
+        return None
+    target = node.targets[0]
+    if isinstance(target, ast.Subscript) and isinstance(target.slice, ast.Constant):
+        return target.slice.value
+    return None
+
+
+def _categories_of(variable: str | None) -> list:
+    if variable is None or variable not in get_metadata():
+        return []
+    dtype = get_metadata()[variable]["dtype"]
+    if isinstance(dtype, dict) and "categorical" in dtype:
+        return dtype["categorical"]["categories"]
+    return []
+
+
+def _dtype_of(variable: str | None) -> str | None:
+    if variable is None:
+        return None
+    # Temporary wide columns, e.g. `tmp_p_id_child_1`, are recorded by their long
+    # name.
+    for name in (variable, _TEMPORARY_WIDE_COLUMN.sub("", variable)):
+        if name in get_metadata():
+            dtype = get_metadata()[name]["dtype"]
+            return dtype if isinstance(dtype, str) else None
+    return None
+
+
+def _spec_from_call(  # noqa: PLR0913
+    *,
+    call: ast.Call,
+    argument: ast.AST,
+    bindings: dict,
+    context: dict,
+    target: str | None,
+    depth: int,
+) -> ColumnSpec | None:
+    name = _function_name(call)
+    if name in context["functions"] and depth < _MAX_HELPER_DEPTH:
+        function = context["functions"][name]
+        parameters = [arg.arg for arg in function.args.args]
+        if isinstance(argument, ast.keyword):
+            parameter = argument.arg
+        else:
+            parameter = parameters[call.args.index(argument)]
+        inner_bindings = {
+            parameters[i]: (arg, bindings) for i, arg in enumerate(call.args)
+        } | {kw.arg: (kw.value, bindings) for kw in call.keywords if kw.arg}
+        return _spec_from_usages(
+            tree=function,
+            source=parameter,
+            bindings=inner_bindings,
+            context=context,
+            target=target,
+            depth=depth + 1,
+        )
+    if name not in context["manipulator_functions"]:
+        return None
+
+    keywords = {kw.arg: kw.value for kw in call.keywords}
+    signature = list(inspect.signature(getattr(data_manipulator, name)).parameters)
+    for position, arg in enumerate(call.args):
+        keywords.setdefault(signature[position], arg)
+    numbers: ColumnSpec = {
+        "answers": [],
+        "integer": name in INTEGER_FUNCTIONS,
+        "storage": STORAGE_OF_FUNCTION.get(name, "labelled"),
+        "dtype": _dtype_of(target),
+    }
+    if name not in LABELLED_FUNCTIONS:
+        return numbers
+
+    renaming = None
+    if "renaming" in keywords:
+        renaming = _evaluate(keywords["renaming"], bindings, context["script"])
+    if renaming:
+        return numbers | {
+            "answers": [
+                answer if isinstance(answer, int | float) else str(answer)
+                for answer in renaming
+            ]
+        }
+    if name == "object_to_int_categorical":
+        return numbers
+    categories = _categories_of(target) or [
+        f"Kategorie {i}" for i in range(1, N_DEFAULT_CATEGORIES + 1)
+    ]
+    nr_identifiers = 1
+    if "nr_identifiers" in keywords:
+        nr_identifiers = _evaluate(keywords["nr_identifiers"], bindings, None)
+    identifiers = " ".join(f"id{i}" for i in range(1, nr_identifiers))
+    return numbers | {
+        "answers": [
+            " ".join(filter(None, [f"[{code}]", identifiers, str(category)]))
+            for code, category in enumerate(categories, start=1)
+        ]
+    }
+
+
+def _spec_from_usages(  # noqa: PLR0913
+    *,
+    tree: ast.AST,
+    source: str,
+    bindings: dict,
+    context: dict,
+    target: str | None,
+    depth: int,
+) -> ColumnSpec | None:
+    parents = {
+        child: node for node in ast.walk(tree) for child in ast.iter_child_nodes(node)
+    }
+    specs = []
+    for node in ast.walk(tree):
+        if not _is_source(node, source, parents):
+            continue
+        argument, call = _climb_to_argument(node, parents)
+        if call is None:
+            continue
+        spec = _spec_from_call(
+            call=call,
+            argument=argument,
+            bindings=bindings,
+            context=context,
+            target=target or _target_variable(call, parents),
+            depth=depth,
+        )
+        if spec is not None:
+            specs.append(spec)
+    # Answers are the most restrictive, numbers work for everything else.
+    answered = [spec for spec in specs if spec["answers"]]
+    return (answered or specs or [None])[0]
+
+
+def get_column_specs(script_path: Path) -> dict[str, ColumnSpec]:
+    """Describe the values of each raw column a cleaning script reads.
+
+    Args:
+        script_path: The path to the cleaning script.
+
+    Returns:
+        Map of raw column name to the description of its values.
+    """
+    script = load_script(script_path, expected_function="clean")
+    tree = ast.parse(script_path.read_text(encoding="utf-8"))
+    context = {
+        "script": script,
+        "functions": {
+            node.name: node for node in tree.body if isinstance(node, ast.FunctionDef)
+        },
+        "manipulator_functions": {
+            name
+            for name, function in inspect.getmembers(
+                data_manipulator, inspect.isfunction
+            )
+            if not name.startswith("_")
+            and function.__module__ == data_manipulator.__name__
+        },
+    }
+    clean_function = context["functions"]["clean"]
+    return {
+        column: _spec_from_usages(
+            tree=clean_function,
+            source=column,
+            bindings={},
+            context=context,
+            target=None,
+            depth=0,
+        )
+        or {"answers": [], "integer": True, "storage": "int", "dtype": None}
+        for column in get_relevant_column_names(script_path)
+    }
+
+
+def make_population(
+    n_persons: int,
+    survey_years: list[int],
+    seed: int = 0,
+) -> pd.DataFrame:
+    """Create a synthetic person-year panel of the SOEP keys.
+
+    Persons live in households of one to four members, which do not split, such
+    that `cid` equals `hid`. Each person is observed in a contiguous span of
+    survey years.
+
+    Args:
+        n_persons: The number of persons.
+        survey_years: The survey years persons may be observed in.
+        seed: The seed of the random number generator.
+
+    Returns:
+        The person-year panel with columns `pid`, `hid`, `cid`, and `syear`.
+    """
+    rng = np.random.default_rng(seed)
+    household_sizes = rng.integers(1, 5, size=n_persons)
+    hid = np.repeat(np.arange(1, n_persons + 1), household_sizes)[:n_persons]
+    member_number = pd.Series(hid).groupby(hid).cumcount().to_numpy() + 1
+    pid = hid * 100 + member_number
+    n_years = len(survey_years)
+    first = rng.integers(0, n_years, size=n_persons)
+    duration = np.minimum(rng.geometric(p=0.1, size=n_persons), n_years - first)
+    person = np.repeat(np.arange(n_persons), duration)
+    offset = np.arange(len(person)) - np.repeat(
+        np.cumsum(duration) - duration, duration
+    )
+    return pd.DataFrame(
+        {
+            "pid": pid[person],
+            "hid": hid[person],
+            "cid": hid[person],
+            "syear": np.asarray(survey_years)[first[person] + offset],
+        }
+    ).astype("int32")
+
+
+def _rows_of_module(keys: list[str], population: pd.DataFrame) -> pd.DataFrame:
+    if "pid" in keys and "syear" in keys:
+        return population
+    if "pid" in keys:
+        return population.drop_duplicates(subset="pid")
+    if "syear" in keys:
+        return population.drop_duplicates(subset=["hid", "syear"])
+    return population.drop_duplicates(subset="hid")
+
+
+def _answer_codes(answers: list[str | int]) -> dict[int, str | None]:
+    """Map the answers to their codes, and labels to their `[N]` codes if possible.
+
+    Returns:
+        Map of code to label, None for unlabelled numbers.
+    """
+    numbers = {int(answer) for answer in answers if not isinstance(answer, str)}
+    labels = [answer for answer in answers if isinstance(answer, str)]
+    matches = [_LABEL_CODE.match(label) for label in labels]
+    codes = [int(match.group(1)) for match in matches if match]
+    if len(codes) != len(labels) or len(set(codes) | numbers) != len(answers):
+        unused = (code for code in range(1, len(answers) + 1) if code not in numbers)
+        codes = [next(unused) for _ in labels]
+    return dict(zip(codes, labels, strict=True)) | dict.fromkeys(numbers)
+
+
+def _make_numbers(
+    spec: ColumnSpec, n_rows: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Draw numbers which are cleaned to the recorded dtype of the column."""
+    if spec["dtype"] == "float[pyarrow]":
+        # Multiples of 1200 stay exact in single precision also after cleaning
+        # converts cents to Euros or yearly to monthly amounts.
+        return 1_200.0 * rng.integers(0, 1_000, size=n_rows)
+    if spec["dtype"] == "double[pyarrow]":
+        return np.round(rng.lognormal(mean=5, sigma=1.5, size=n_rows), 2)
+    if spec["integer"] or spec["dtype"] in INTEGER_RANGES:
+        low, high = INTEGER_RANGES.get(spec["dtype"], INTEGER_RANGES["int8[pyarrow]"])
+        return rng.integers(low, high, size=n_rows)
+    values = rng.lognormal(mean=5, sigma=1.5, size=n_rows)
+    return np.round(values, 2 if spec["storage"] == "float" else 0)
+
+
+def _make_column(
+    spec: ColumnSpec, n_rows: int, rng: np.random.Generator
+) -> tuple[np.ndarray, dict[int, str] | None]:
+    answers = _answer_codes(spec["answers"])
+    if answers:
+        valid_codes = [code for code in answers if code not in MISSING_CODES]
+        values = rng.choice(valid_codes, size=n_rows)
+    else:
+        values = _make_numbers(spec, n_rows=n_rows, rng=rng)
+    is_missing = rng.random(n_rows) < MISSING_SHARE
+    if spec["storage"] == "labelled":
+        # Ensure a label, such that the column is read as object.
+        is_missing[:1] = True
+    is_integral = np.array_equal(values, np.round(values))
+    values = values.astype(
+        "int32" if spec["storage"] != "float" and is_integral else "float64"
+    )
+    values[is_missing] = rng.choice(list(MISSING_CODES), size=is_missing.sum())
+    if spec["dtype"] == "double[pyarrow]":
+        values[-1] = DOUBLE_ONLY_VALUE
+    if spec["storage"] != "labelled":
+        # Plain numbers carry the missing-data codes unlabelled.
+        return values, None
+    labels = {code: label for code, label in answers.items() if label is not None}
+    return values, labels | MISSING_CODES
+
+
+def make_module(
+    column_specs: dict[str, ColumnSpec],
+    population: pd.DataFrame,
+    seed: int = 0,
+) -> tuple[pd.DataFrame, dict[str, dict[int, str]]]:
+    """Create the synthetic raw data of one module.
+
+    Args:
+        column_specs: Map of raw column name to the description of its values.
+        population: The synthetic person-year panel of the SOEP keys.
+        seed: The seed of the random number generator.
+
+    Returns:
+        The synthetic raw data and the value labels of its labelled columns.
+    """
+    rng = np.random.default_rng(seed)
+    keys = [column for column in column_specs if column in KEY_COLUMNS]
+    rows = _rows_of_module(keys=keys, population=population)
+    n_rows = len(rows)
+    data = {key: rows[key].to_numpy(copy=True) for key in keys}
+    value_labels = {}
+    for column, spec in column_specs.items():
+        if column in KEY_COLUMNS:
+            if spec["storage"] == "labelled":
+                # Keys cleaned like answers are read as objects only if they
+                # contain a labelled missing-data code.
+                data[column][:1] = -1
+                value_labels[column] = MISSING_CODES
+            continue
+        data[column], labels = _make_column(spec, n_rows=n_rows, rng=rng)
+        if labels is not None:
+            value_labels[column] = labels
+    return pd.DataFrame(data), value_labels
+
+
+def generate(  # noqa: PLR0913
+    n_persons: int,
+    *,
+    data_root: Path = DATA_ROOT,
+    soep_version: str = SOEP_VERSION,
+    survey_years: list[int] = SURVEY_YEARS,
+    seed: int = 0,
+    overwrite: bool = False,
+    clean_modules_directory: Path = SRC / "clean_modules",
+) -> list[Path]:
+    """Write one synthetic `.dta` file per cleaning script.
+
+    Args:
+        n_persons: The number of persons of the synthetic population.
+        data_root: The root directory where data files are stored.
+        soep_version: The version of the SOEP data.
+        survey_years: The survey years persons may be observed in.
+        seed: The seed of the random number generator.
+        overwrite: Whether to write into a data directory containing files.
+        clean_modules_directory: The directory containing the cleaning scripts.
+
+    Returns:
+        The paths of the written data files.
+
+    Raises:
+        FileExistsError: If the data directory contains files and `overwrite` is
+            False.
+    """
+    out_directory = data_root / soep_version
+    existing = sorted(path for path in out_directory.glob("*") if path.is_file())
+    if existing and not overwrite:
+        msg = (
+            f"The data directory {out_directory} contains files already: "
+            f"{[path.name for path in existing]}. Pass `overwrite=True` "
+            "(`--overwrite`) to write into it."
+        )
+        raise FileExistsError(msg)
+
+    script_names = sorted(get_script_names(clean_modules_directory))
+    paths = [out_directory / f"{name}.dta" for name in script_names]
+
+    out_directory.mkdir(parents=True, exist_ok=True)
+    population = make_population(
+        n_persons=n_persons, survey_years=survey_years, seed=seed
+    )
+    for module_seed, (script_name, path) in enumerate(
+        zip(script_names, paths, strict=True), start=seed + 1
+    ):
+        column_specs = get_column_specs(clean_modules_directory / f"{script_name}.py")
+        data, value_labels = make_module(
+            column_specs=column_specs, population=population, seed=module_seed
+        )
+        data.to_stata(path, write_index=False, version=118, value_labels=value_labels)
+    return paths
+
+
+def main() -> None:
+    """Generate the synthetic data files from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--persons", type=int, default=10_000)
+    parser.add_argument("--data-root", type=Path, default=DATA_ROOT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--overwrite", action="store_true")
+    args = parser.parse_args()
+    paths = generate(
+        n_persons=args.persons,
+        data_root=args.data_root,
+        seed=args.seed,
+        overwrite=args.overwrite,
+    )
+    print(f"Wrote {len(paths)} synthetic data files to {paths[0].parent}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
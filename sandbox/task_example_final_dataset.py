@@ -28,7 +28,10 @@ SURVEY_YEARS_TO_MERGE = [*range(1984, 2023 + 1)]
 
 @task(after="create_metadata")
 def task_create_final_dataset_catch_all(
-    modules: Annotated[dict[str, pd.DataFrame], MODULES._entries],
+    modules: Annotated[
+        dict[str, Path],
+        {name: module.path for name, module in MODULES._entries.items()},
+    ],
     variables: Annotated[list[str], VARIABLES_TO_MERGE],
     survey_years: Annotated[list[int], SURVEY_YEARS_TO_MERGE],
     out_path: Annotated[Path, Product] = BLD
@@ -37,8 +40,11 @@ def task_create_final_dataset_catch_all(
 ) -> None:
     """Example task merging variables to dataset.
 
+    The task depends on all modules but receives the paths to their pickle files,
+    so only the modules containing the variables are loaded.
+
     Args:
-        modules: The modules required to create the final dataset.
+        modules: The paths to all modules.
         variables: Variable names the dataset should contain.
         survey_years: Survey years the dataset should contain.
         out_path: The output path to save the dataset to.
@@ -2,6 +2,7 @@
 
 import pandas as pd
 
+from soep_preparation.config import get_metadata_dtype
 from soep_preparation.utilities.data_manipulator import (
     apply_smallest_int_dtype,
     float_to_int,
@@ -24,18 +25,22 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:
     out["p_id_father_1"] = float_to_int(
         series=raw_data["fnr1"],
         code_negative_values_as_na=True,
+        dtype=get_metadata_dtype("p_id_father_1"),
     )
     out["p_id_father_2"] = float_to_int(
         series=raw_data["fnr2"],
         code_negative_values_as_na=True,
+        dtype=get_metadata_dtype("p_id_father_2"),
     )
 
     out["p_id_mother_1"] = float_to_int(
         series=raw_data["mnr1"],
         code_negative_values_as_na=True,
+        dtype=get_metadata_dtype("p_id_mother_1"),
     )
     out["p_id_mother_2"] = float_to_int(
         series=raw_data["mnr2"],
         code_negative_values_as_na=True,
+        dtype=get_metadata_dtype("p_id_mother_2"),
     )
     return out
@@ -7,6 +7,7 @@ teaching sample**: random groups 11 through 20 of ``rgroup20``.
 
 import pandas as pd
 
+from soep_preparation.config import get_metadata_dtype
 from soep_preparation.utilities.data_manipulator import apply_smallest_int_dtype
 
 
@@ -21,6 +22,8 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:
     """
     out = pd.DataFrame()
     out["hh_id_original"] = apply_smallest_int_dtype(raw_data["cid"])
-    out["rgroup20"] = apply_smallest_int_dtype(raw_data["rgroup20"])
+    out["rgroup20"] = apply_smallest_int_dtype(
+        raw_data["rgroup20"], dtype=get_metadata_dtype("rgroup20")
+    )
     out["teaching_sample"] = (out["rgroup20"].between(11, 20)).astype("bool[pyarrow]")
     return out
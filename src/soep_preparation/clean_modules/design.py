@@ -2,6 +2,7 @@
 
 import pandas as pd
 
+from soep_preparation.config import get_metadata_dtype
 from soep_preparation.utilities.data_manipulator import (
     apply_smallest_int_dtype,
     object_to_str_categorical,
@@ -20,8 +21,12 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:
     out = pd.DataFrame()
     out["hh_id"] = apply_smallest_int_dtype(raw_data["cid"])
 
-    out["hh_random_group"] = apply_smallest_int_dtype(raw_data["rgroup"])
-    out["hh_strat"] = apply_smallest_int_dtype(raw_data["strat"])
+    out["hh_random_group"] = apply_smallest_int_dtype(
+        raw_data["rgroup"], dtype=get_metadata_dtype("hh_random_group")
+    )
+    out["hh_strat"] = apply_smallest_int_dtype(
+        raw_data["strat"], dtype=get_metadata_dtype("hh_strat")
+    )
     out["hh_soep_sample_design"] = object_to_str_categorical(
         series=raw_data["hsample"],
         nr_identifiers=2,
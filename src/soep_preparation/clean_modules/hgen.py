@@ -2,6 +2,7 @@
 
 import pandas as pd
 
+from soep_preparation.config import get_metadata_dtype
 from soep_preparation.utilities.data_manipulator import (
     apply_smallest_int_dtype,
     float_to_int,
@@ -37,12 +38,18 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:
         code_negative_values_as_na=False,
     )
 
-    out["building_year_hh_max"] = object_to_int(raw_data["hgcnstyrmax"])
-    out["building_year_hh_min"] = object_to_int(raw_data["hgcnstyrmin"])
+    out["building_year_hh_max"] = object_to_int(
+        raw_data["hgcnstyrmax"], dtype=get_metadata_dtype("building_year_hh_max")
+    )
+    out["building_year_hh_min"] = object_to_int(
+        raw_data["hgcnstyrmin"], dtype=get_metadata_dtype("building_year_hh_min")
+    )
     out["heating_costs_m_hh"] = object_to_float(
         replace_not_applicable_answer(series=raw_data["hgheat"], value=0)
     )
-    out["year_moved_in"] = object_to_int(raw_data["hgmoveyr"])
+    out["year_moved_in"] = object_to_int(
+        raw_data["hgmoveyr"], dtype=get_metadata_dtype("year_moved_in")
+    )
     out["rented_or_owned"] = object_to_str_categorical(
         series=raw_data["hgowner"],
         renaming={
@@ -2,6 +2,7 @@
 
 import pandas as pd
 
+from soep_preparation.config import get_metadata_dtype
 from soep_preparation.utilities.data_manipulator import (
     apply_smallest_int_dtype,
     object_to_bool_categorical,
@@ -80,7 +81,10 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:
         renaming={"[2] Nein": False, "[1] Ja": True},
         ordered=True,
     )
-    out["arbeitslosengeld_2_anzahl_monate_hh"] = object_to_int(raw_data["hlc0053"])
+    out["arbeitslosengeld_2_anzahl_monate_hh"] = object_to_int(
+        raw_data["hlc0053"],
+        dtype=get_metadata_dtype("arbeitslosengeld_2_anzahl_monate_hh"),
+    )
     out["arbeitslosengeld_2_m_hh_hl"] = object_to_float(
         replace_not_applicable_answer(series=raw_data["hlc0054"], value=0)
     )
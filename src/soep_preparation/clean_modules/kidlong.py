@@ -2,6 +2,7 @@
 
 import pandas as pd
 
+from soep_preparation.config import get_metadata_dtype
 from soep_preparation.utilities.data_manipulator import (
     apply_smallest_int_dtype,
     object_to_float,
@@ -24,7 +25,9 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:
     out["p_id"] = apply_smallest_int_dtype(raw_data["pid"])
     out["survey_year"] = apply_smallest_int_dtype(raw_data["syear"])
 
-    out["pointer_mother"] = object_to_int(raw_data["k_pmum"])
+    out["pointer_mother"] = object_to_int(
+        raw_data["k_pmum"], dtype=get_metadata_dtype("pointer_mother")
+    )
     out["children_care_facility_costs_m_current"] = object_to_float(
         replace_not_applicable_answer(series=raw_data["kc_caco"], value=0)
     )
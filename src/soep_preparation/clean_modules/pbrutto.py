@@ -2,6 +2,7 @@
 
 import pandas as pd
 
+from soep_preparation.config import get_metadata_dtype
 from soep_preparation.utilities.data_manipulator import (
     apply_smallest_int_dtype,
     object_to_int,
@@ -25,7 +26,9 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:
     out["hh_id"] = apply_smallest_int_dtype(raw_data["hid"])
     out["survey_year"] = apply_smallest_int_dtype(raw_data["syear"])
 
-    out["birth_year"] = object_to_int(raw_data["geburt_v2"])
+    out["birth_year"] = object_to_int(
+        raw_data["geburt_v2"], dtype=get_metadata_dtype("birth_year")
+    )
     out["relationship_to_head_of_hh"] = object_to_str_categorical(
         series=raw_data["stell_h"],
         renaming={
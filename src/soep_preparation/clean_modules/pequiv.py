@@ -2,6 +2,7 @@
 
 import pandas as pd
 
+from soep_preparation.config import get_metadata_dtype
 from soep_preparation.utilities.data_manipulator import (
     apply_smallest_float_dtype,
     apply_smallest_int_dtype,
@@ -40,9 +41,11 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:
     out["cpi"] = apply_smallest_float_dtype(object_to_float(raw_data["y11101"]))
 
     # hh characteristics
-    out["number_of_persons_hh"] = apply_smallest_int_dtype(raw_data["d11106"])
+    out["number_of_persons_hh"] = apply_smallest_int_dtype(
+        raw_data["d11106"], dtype=get_metadata_dtype("number_of_persons_hh")
+    )
     out["number_of_children_living_in_hh"] = apply_smallest_int_dtype(
-        raw_data["d11107"]
+        raw_data["d11107"], dtype=get_metadata_dtype("number_of_children_living_in_hh")
     )
     # hh income
     out["einkommen_vor_steuern_y_hh"] = object_to_float(
@@ -64,7 +67,7 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:
         ordered=False,
         renaming={"[1] Male": "Male", "[2] Female": "Female"},
     )
-    out["age"] = object_to_int(raw_data["d11101"])
+    out["age"] = object_to_int(raw_data["d11101"], dtype=get_metadata_dtype("age"))
     out["federal_state_of_residence"] = object_to_str_categorical(
         series=raw_data["l11101"], ordered=False
     )
@@ -4,9 +4,11 @@ import re
 
 import pandas as pd
 
+from soep_preparation.config import get_metadata_dtype
 from soep_preparation.utilities import month_mapping
 from soep_preparation.utilities.data_manipulator import (
     apply_smallest_int_dtype,
+    create_dummies,
     create_dummy,
     object_to_bool_categorical,
     object_to_float,
@@ -130,14 +132,16 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:
     )
     out["education_isced"] = object_to_str_categorical(raw_data["pgisced11"])
     out["education_isced_cat"] = apply_smallest_int_dtype(
-        out["education_isced"].cat.codes
+        out["education_isced"].cat.codes,
+        dtype=get_metadata_dtype("education_isced_cat"),
     )
     out["education_casmin"] = object_to_str_categorical(
         series=raw_data["pgcasmin"],
         nr_identifiers=2,
     )
     out["education_casmin_cat"] = apply_smallest_int_dtype(
-        out["education_casmin"].cat.codes
+        out["education_casmin"].cat.codes,
+        dtype=get_metadata_dtype("education_casmin_cat"),
     )
     out["highest_education"] = _education(
         casmin=out["education_casmin"],
@@ -160,58 +164,61 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:
     out["total_part_time_working_experience"] = object_to_float(raw_data["pgexppt"])
     out["total_unemployment_experience"] = object_to_float(raw_data["pgexpue"])
     out["tenure"] = object_to_float(raw_data["pgerwzeit"])
-    out["retired"] = create_dummy(
-        series=out["occupation_status"], value_for_comparison="NE: Rentner/Rentnerin"
+    occupation_status_dummies = create_dummies(
+        series=out["occupation_status"],
+        conditions={
+            "retired": ("NE: Rentner/Rentnerin", "equal"),
+            "self_employed": (
+                _self_employed_occupations(out["occupation_status"]),
+                "isin",
+            ),
+            "military": ("NE: Wehr- und Zivildienst", "equal"),
+            "arbeitslos_gemeldet": ("NE: arbeitslos gemeldet", "equal"),
+            "beamter": ("Beamte", "startswith"),
+        },
+    )
+    employment_status_dummies = create_dummies(
+        series=out["employment_status"],
+        conditions={
+            "erwerbstätig": ("Nicht erwerbstätig", "neq"),
+            "nicht_erwerbstätig": ("Nicht erwerbstätig", "equal"),
+            "voll_erwerbstätig": ("Voll erwerbstätig", "equal"),
+            "in_teilzeit_erwerbstätig": ("Teilzeitbeschäftigung", "equal"),
+            "unregelmäßig_oder_geringfügig_erwerbstätig": (
+                "Unregelmässig, geringfügig erwerbstät.",
+                "equal",
+            ),
+            "werkstatt_für_behinderte_menschen": (
+                "Werkstatt für behinderte Menschen (seit 1998)",
+                "equal",
+            ),
+        },
     )
+    out["retired"] = occupation_status_dummies["retired"]
     out["in_education"] = _in_education(
         employment=out["employment_status"],
         occupation=out["occupation_status"],
     )
-    out["self_employed"] = create_dummy(
-        series=out["occupation_status"],
-        value_for_comparison=_self_employed_occupations(out["occupation_status"]),
-        comparison_type="isin",
-    )
-    out["military"] = create_dummy(
-        series=out["occupation_status"],
-        value_for_comparison="NE: Wehr- und Zivildienst",
-    )
-
-    out["erwerbstätig"] = (
-        create_dummy(
-            series=out["employment_status"],
-            value_for_comparison="Nicht erwerbstätig",
-            comparison_type="neq",
-        )
-    ) & (~out["in_education"])
+    out["self_employed"] = occupation_status_dummies["self_employed"]
+    out["military"] = occupation_status_dummies["military"]
 
-    out["nicht_erwerbstätig"] = create_dummy(
-        series=out["employment_status"],
-        value_for_comparison="Nicht erwerbstätig",
-    )
-    out["arbeitslos_gemeldet"] = create_dummy(
-        series=out["occupation_status"],
-        value_for_comparison="NE: arbeitslos gemeldet",
-    )
-    out["voll_erwerbstätig"] = create_dummy(
-        series=out["employment_status"], value_for_comparison="Voll erwerbstätig"
-    )
-    out["in_teilzeit_erwerbstätig"] = create_dummy(
-        series=out["employment_status"], value_for_comparison="Teilzeitbeschäftigung"
-    )
-    out["unregelmäßig_oder_geringfügig_erwerbstätig"] = create_dummy(
-        series=out["employment_status"],
-        value_for_comparison="Unregelmässig, geringfügig erwerbstät.",
-    )
-    out["werkstatt_für_behinderte_menschen"] = create_dummy(
-        series=out["employment_status"],
-        value_for_comparison="Werkstatt für behinderte Menschen (seit 1998)",
-    )
-    out["beamter"] = create_dummy(
-        series=out["occupation_status"],
-        value_for_comparison="Beamte",
-        comparison_type="startswith",
+    out["erwerbstätig"] = employment_status_dummies["erwerbstätig"] & (
+        ~out["in_education"]
     )
+
+    out["nicht_erwerbstätig"] = employment_status_dummies["nicht_erwerbstätig"]
+    out["arbeitslos_gemeldet"] = occupation_status_dummies["arbeitslos_gemeldet"]
+    out["voll_erwerbstätig"] = employment_status_dummies["voll_erwerbstätig"]
+    out["in_teilzeit_erwerbstätig"] = employment_status_dummies[
+        "in_teilzeit_erwerbstätig"
+    ]
+    out["unregelmäßig_oder_geringfügig_erwerbstätig"] = employment_status_dummies[
+        "unregelmäßig_oder_geringfügig_erwerbstätig"
+    ]
+    out["werkstatt_für_behinderte_menschen"] = employment_status_dummies[
+        "werkstatt_für_behinderte_menschen"
+    ]
+    out["beamter"] = occupation_status_dummies["beamter"]
     out["mutterschutz_elternzeit"] = create_dummy(
         series=out["labor_force_status"],
         value_for_comparison="NE: Mutterschutz/Elternzeit (seit 1991)",
@@ -3,6 +3,7 @@
 import numpy as np
 import pandas as pd
 
+from soep_preparation.config import get_metadata_dtype
 from soep_preparation.utilities.data_manipulator import (
     apply_smallest_int_dtype,
     combine_first_and_make_categorical,
@@ -109,10 +110,12 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:
 
     # individual status previous calendar year
     out["unemployed_anzahl_monate"] = object_to_int(
-        replace_not_applicable_answer(series=raw_data["kal1d02"], value=0)
+        replace_not_applicable_answer(series=raw_data["kal1d02"], value=0),
+        dtype=get_metadata_dtype("unemployed_anzahl_monate"),
     )
     out["early_retirement_number_months_last_year"] = object_to_int(
-        replace_not_applicable_answer(series=raw_data["kal1e02"], value=0)
+        replace_not_applicable_answer(series=raw_data["kal1e02"], value=0),
+        dtype=get_metadata_dtype("early_retirement_number_months_last_year"),
     )
     out["unemployment_benefits_number_months"] = object_to_int(
         replace_not_applicable_answer(series=raw_data["kal2f02"], value=0)
@@ -523,7 +526,8 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:
         .fillna(value=False)
     )
     out["number_of_months_in_retirement_last_year"] = apply_smallest_int_dtype(
-        in_retirement_months.sum(axis=1)
+        in_retirement_months.sum(axis=1),
+        dtype=get_metadata_dtype("number_of_months_in_retirement_last_year"),
     )
     out["in_retirement_in_at_least_one_month_last_year"] = (
         out["number_of_months_in_retirement_last_year"] > 0
@@ -2,6 +2,7 @@
 
 import pandas as pd
 
+from soep_preparation.config import get_metadata_dtype
 from soep_preparation.utilities.data_manipulator import (
     apply_smallest_float_dtype,
     apply_smallest_int_dtype,
@@ -66,8 +67,12 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:  # noqa: PLR0915
     out["hh_id"] = apply_smallest_int_dtype(raw_data["hid"])
     out["survey_year"] = apply_smallest_int_dtype(raw_data["syear"])
 
-    out["person_number_surveyed"] = object_to_int(raw_data["pnr"])
-    out["years_worked_last_job"] = object_to_int(raw_data["plb0301"])
+    out["person_number_surveyed"] = object_to_int(
+        raw_data["pnr"], dtype=get_metadata_dtype("person_number_surveyed")
+    )
+    out["years_worked_last_job"] = object_to_int(
+        raw_data["plb0301"], dtype=get_metadata_dtype("years_worked_last_job")
+    )
     out["months_worked_last_job"] = object_to_float(raw_data["plb0302"])
     out["hourly_wage_current"] = object_to_float(raw_data["plh0354_h"])
 
@@ -135,7 +140,10 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:  # noqa: PLR0915
         renaming={"[2] Nein": False, "[1] Ja": True},
         ordered=True,
     )
-    out["in_private_rente_eingezahlte_monate"] = object_to_int(raw_data["plc0438"])
+    out["in_private_rente_eingezahlte_monate"] = object_to_int(
+        raw_data["plc0438"],
+        dtype=get_metadata_dtype("in_private_rente_eingezahlte_monate"),
+    )
     out["private_rente_beitrag_m_2013"] = _private_rente_beitrag_m_ein_umfragejahr(
         private_rente_beitrag_jahr=raw_data["plc0439_v1"],
         eingezahlte_monate=out["in_private_rente_eingezahlte_monate"],
@@ -190,7 +198,8 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:  # noqa: PLR0915
         value_for_comparison=1,
     )
     out["disability_degree"] = object_to_int(
-        replace_not_applicable_answer(series=raw_data["ple0041_h"], value=0)
+        replace_not_applicable_answer(series=raw_data["ple0041_h"], value=0),
+        dtype=get_metadata_dtype("disability_degree"),
     )
     # Officially recognized reduced earning capacity OR severe disability (yes/no),
     # SOEP `ple0040` (Q128). It bundles Erwerbsminderung and Schwerbehinderung; the
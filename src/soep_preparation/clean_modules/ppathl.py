@@ -2,6 +2,7 @@
 
 import pandas as pd
 
+from soep_preparation.config import get_metadata_dtype
 from soep_preparation.utilities import month_mapping
 from soep_preparation.utilities.data_manipulator import (
     apply_smallest_float_dtype,
@@ -61,6 +62,7 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:
                 -2: "[-2] Trifft nicht zu",
             },
         ),
+        dtype=get_metadata_dtype("year_of_immigration"),
     )
     out["sexual_orientation"] = object_to_str_categorical(raw_data["sexor"])
     out["partnership_status"] = object_to_str_categorical(raw_data["partner"])
@@ -71,6 +73,7 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:
                 -2: "[-2] Trifft nicht zu",
             },
         ),
+        dtype=get_metadata_dtype("pointer_partner"),
     )
 
     # individual staying probabilities and weighting factors
@@ -88,5 +91,5 @@ def clean(raw_data: pd.DataFrame) -> pd.DataFrame:
     # SOEP-RV record-linkage identifier (`ID SUF Rentenversicherung`): the bridge
     # to the FDZ-RV pension records, populated for respondents who consented to
     # the linkage and missing otherwise.
-    out["rv_id"] = object_to_int(raw_data["rv_id"])
+    out["rv_id"] = object_to_int(raw_data["rv_id"], dtype=get_metadata_dtype("rv_id"))
     return out
@@ -13,6 +13,7 @@ from soep_preparation.config import (
     get_raw_data_file_names,
     load_script,
 )
+from soep_preparation.utilities.merging import sort_by_key_columns
 
 for data_file_name in get_raw_data_file_names():
     _raw_data_entry = RAW_DATA_FILES[data_file_name]
@@ -29,7 +30,8 @@ for data_file_name in get_raw_data_file_names():
         Cleaning scripts contain function `clean` taking the raw pandas DataFrame
         as input and assigning variables with adequate data types and values to
         meaningful variable names. The cleaned DataFrame is returned.
-        The result is stored in the corresponding DataCatalog for further processing.
+        The result is sorted by its key columns (see `get_key_columns`) and stored
+        in the corresponding DataCatalog for further processing.
 
         Parameters:
             raw_data: The raw pandas DataFrame to be cleaned.
@@ -46,4 +48,4 @@ for data_file_name in get_raw_data_file_names():
             contain expected function.
         """
         script = load_script(script_path, expected_function="clean")
-        return script.clean(raw_data=raw_data)
+        return sort_by_key_columns(script.clean(raw_data=raw_data))
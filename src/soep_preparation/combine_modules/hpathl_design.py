@@ -5,6 +5,7 @@ import pandas as pd
 from soep_preparation.utilities.data_manipulator import (
     combine_first_and_make_categorical,
 )
+from soep_preparation.utilities.merging import merge_modules
 
 
 def combine(hpathl: pd.DataFrame, design: pd.DataFrame) -> pd.DataFrame:
@@ -18,7 +19,7 @@ def combine(hpathl: pd.DataFrame, design: pd.DataFrame) -> pd.DataFrame:
         Combined hpathl and design modules. If contents conflict with each other,
              the one from hpathl takes precedence.
     """
-    merged = pd.merge(left=hpathl, right=design, on=["hh_id"], how="outer")
+    merged = merge_modules({"hpathl": hpathl, "design": design})
     out = pd.DataFrame(index=merged.index)
     out["hh_id"] = merged["hh_id"]
     out["hh_soep_sample"] = combine_first_and_make_categorical(
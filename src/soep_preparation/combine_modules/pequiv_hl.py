@@ -2,6 +2,9 @@
 
 import pandas as pd
 
+from soep_preparation.utilities.data_manipulator import coalesce_suffixed
+from soep_preparation.utilities.merging import merge_modules
+
 
 def combine(pequiv: pd.DataFrame, hl: pd.DataFrame) -> pd.DataFrame:
     """Combine variables from the cleaned pequiv and hl modules.
@@ -14,23 +17,20 @@ def combine(pequiv: pd.DataFrame, hl: pd.DataFrame) -> pd.DataFrame:
         Combined pequiv and hl modules. If contents conflict with each other,
              the one from pequiv takes precedence.
     """
-    merged = pd.merge(left=pequiv, right=hl, on=["hh_id", "survey_year"], how="outer")
+    merged = merge_modules({"pequiv": pequiv, "hl": hl})
     out = pd.DataFrame(index=merged.index)
     out["p_id"] = merged["p_id"]
     out["hh_id"] = merged["hh_id"]
     out["survey_year"] = merged["survey_year"]
 
-    out["arbeitslosengeld_2_m_hh"] = merged[
-        "arbeitslosengeld_2_m_hh_pequiv"
-    ].combine_first(merged["arbeitslosengeld_2_m_hh_hl"])
-    out["kindergeld_m_hh"] = merged["kindergeld_m_hh_pequiv"].combine_first(
-        merged["kindergeld_m_hh_hl"]
-    )
-    out["kinderzuschlag_m_hh"] = merged["kinderzuschlag_m_hh_pequiv"].combine_first(
-        merged["kinderzuschlag_m_hh_hl"]
+    coalesced = coalesce_suffixed(
+        data=merged,
+        names=[
+            "arbeitslosengeld_2_m_hh",
+            "kindergeld_m_hh",
+            "kinderzuschlag_m_hh",
+            "wohngeld_m_hh",
+        ],
+        precedence=["pequiv", "hl"],
     )
-    out["wohngeld_m_hh"] = merged["wohngeld_m_hh_pequiv"].combine_first(
-        merged["wohngeld_m_hh_hl"]
-    )
-
-    return out
+    return out.join(coalesced)
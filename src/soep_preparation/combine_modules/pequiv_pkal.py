@@ -8,6 +8,7 @@ two modules they join), this produces exactly one derived variable:
 import pandas as pd
 
 from soep_preparation.utilities.data_manipulator import apply_smallest_int_dtype
+from soep_preparation.utilities.merging import outer_merge
 
 
 def combine(pequiv: pd.DataFrame, pkal: pd.DataFrame) -> pd.DataFrame:
@@ -25,11 +26,10 @@ def combine(pequiv: pd.DataFrame, pkal: pd.DataFrame) -> pd.DataFrame:
     Returns:
         Person-year frame carrying the (time-invariant) first pension-receipt year.
     """
-    merged = pd.merge(
-        pequiv[["p_id", "survey_year", "gesetzliche_rente_y"]],
-        pkal[["p_id", "survey_year", "number_of_months_in_retirement_last_year"]],
+    merged = outer_merge(
+        left=pequiv[["p_id", "survey_year", "gesetzliche_rente_y"]],
+        right=pkal[["p_id", "survey_year", "number_of_months_in_retirement_last_year"]],
         on=["p_id", "survey_year"],
-        how="outer",
     )
     receives_pension = (merged["gesetzliche_rente_y"].fillna(value=0) > 0) | (
         merged["number_of_months_in_retirement_last_year"].fillna(value=0) > 0
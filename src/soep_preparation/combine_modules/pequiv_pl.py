@@ -3,10 +3,12 @@
 import pandas as pd
 
 from soep_preparation.utilities.data_manipulator import (
+    coalesce_suffixed,
     combine_first_and_make_categorical,
     convert_to_categorical,
     create_dummy,
 )
+from soep_preparation.utilities.merging import merge_modules
 
 
 def combine(pequiv: pd.DataFrame, pl: pd.DataFrame) -> pd.DataFrame:
@@ -20,12 +22,7 @@ def combine(pequiv: pd.DataFrame, pl: pd.DataFrame) -> pd.DataFrame:
         Combined pequiv and pl modules. If contents conflict with each other,
              the one from pequiv takes precedence.
     """
-    merged = pd.merge(
-        left=pequiv,
-        right=pl,
-        on=["p_id", "hh_id", "survey_year"],
-        how="outer",
-    )
+    merged = merge_modules({"pequiv": pequiv, "pl": pl})
     out = pd.DataFrame(index=merged.index)
     out["p_id"] = merged["p_id"]
     out["hh_id"] = merged["hh_id"]
@@ -47,51 +44,30 @@ def combine(pequiv: pd.DataFrame, pl: pd.DataFrame) -> pd.DataFrame:
         series_2=pl_treppen_dummy,
         ordered=True,
     )
-    out["med_bluthochdruck"] = combine_first_and_make_categorical(
-        series_1=merged["med_bluthochdruck_pequiv"],
-        series_2=merged["med_bluthochdruck_pl"],
-        ordered=True,
-    )
-    out["med_diabetes"] = combine_first_and_make_categorical(
-        series_1=merged["med_diabetes_pequiv"],
-        series_2=merged["med_diabetes_pl"],
-        ordered=True,
-    )
-    out["med_krebs"] = combine_first_and_make_categorical(
-        series_1=merged["med_krebs_pequiv"],
-        series_2=merged["med_krebs_pl"],
-        ordered=True,
-    )
-    out["med_herzkrankheit"] = combine_first_and_make_categorical(
-        series_1=merged["med_herzkrankheit_pequiv"],
-        series_2=merged["med_herzkrankheit_pl"],
+    medical_conditions = coalesce_suffixed(
+        data=merged,
+        names=[
+            "med_bluthochdruck",
+            "med_diabetes",
+            "med_krebs",
+            "med_herzkrankheit",
+            "med_schlaganfall",
+            "med_gelenk",
+            "med_subjective_status",
+        ],
+        precedence=["pequiv", "pl"],
         ordered=True,
     )
-    out["med_schlaganfall"] = combine_first_and_make_categorical(
-        series_1=merged["med_schlaganfall_pequiv"],
-        series_2=merged["med_schlaganfall_pl"],
-        ordered=True,
+    body_measures_and_transfers = coalesce_suffixed(
+        data=merged,
+        names=[
+            "med_gewicht",
+            "med_größe",
+            "bmi",
+            "obese",
+            "frailty",
+            "kindesunterhalt_erhalten_m",
+        ],
+        precedence=["pequiv", "pl"],
     )
-    out["med_gelenk"] = combine_first_and_make_categorical(
-        series_1=merged["med_gelenk_pequiv"],
-        series_2=merged["med_gelenk_pl"],
-        ordered=True,
-    )
-    out["med_gewicht"] = merged["med_gewicht_pequiv"].combine_first(
-        merged["med_gewicht_pl"]
-    )
-    out["med_größe"] = merged["med_größe_pequiv"].combine_first(merged["med_größe_pl"])
-    out["bmi"] = merged["bmi_pequiv"].combine_first(merged["bmi_pl"])
-    out["obese"] = merged["obese_pequiv"].combine_first(merged["obese_pl"])
-    out["med_subjective_status"] = combine_first_and_make_categorical(
-        series_1=merged["med_subjective_status_pequiv"],
-        series_2=merged["med_subjective_status_pl"],
-        ordered=True,
-    )
-    out["frailty"] = merged["frailty_pequiv"].combine_first(merged["frailty_pl"])
-
-    out["kindesunterhalt_erhalten_m"] = merged[
-        "kindesunterhalt_erhalten_m_pequiv"
-    ].combine_first(merged["kindesunterhalt_erhalten_m_pl"])
-
-    return out
+    return out.join([medical_conditions, body_measures_and_transfers])
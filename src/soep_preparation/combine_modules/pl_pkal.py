@@ -5,6 +5,7 @@ import pandas as pd
 from soep_preparation.utilities.data_manipulator import (
     combine_first_and_make_categorical,
 )
+from soep_preparation.utilities.merging import merge_modules
 
 
 def combine(pl: pd.DataFrame, pkal: pd.DataFrame) -> pd.DataFrame:
@@ -18,9 +19,7 @@ def combine(pl: pd.DataFrame, pkal: pd.DataFrame) -> pd.DataFrame:
         Combined pl and pkal modules. If contents conflict with each other,
              the one from pl takes precedence.
     """
-    merged = pd.merge(
-        left=pl, right=pkal, on=["p_id", "hh_id", "survey_year"], how="outer"
-    )
+    merged = merge_modules({"pl": pl, "pkal": pkal})
     out = pd.DataFrame(index=merged.index)
     out["p_id"] = merged["p_id"]
     out["hh_id"] = merged["hh_id"]
@@ -5,6 +5,7 @@ import pandas as pd
 from soep_preparation.utilities.data_manipulator import (
     combine_first_and_make_categorical,
 )
+from soep_preparation.utilities.merging import merge_modules
 
 
 def combine(ppathl: pd.DataFrame, bioedu: pd.DataFrame) -> pd.DataFrame:
@@ -18,7 +19,7 @@ def combine(ppathl: pd.DataFrame, bioedu: pd.DataFrame) -> pd.DataFrame:
         Combined ppathl and bioedu modules. If contents conflict with each other,
              the one from ppathl takes precedence.
     """
-    merged = pd.merge(left=ppathl, right=bioedu, on="p_id", how="outer")
+    merged = merge_modules({"ppathl": ppathl, "bioedu": bioedu})
     out = pd.DataFrame(index=merged.index)
     out["p_id"] = merged["p_id"]
 
@@ -6,8 +6,17 @@ from typing import Annotated
 import pandas as pd
 from pytask import task
 
-from soep_preparation.config import MODULES, SRC, get_combine_module_names
-from soep_preparation.utilities.general import load_script
+from soep_preparation.config import (
+    MODULES,
+    POTENTIAL_INDEX_VARIABLES,
+    SRC,
+    get_combine_module_names,
+)
+from soep_preparation.utilities.general import (
+    get_relevant_combine_column_names,
+    load_script,
+)
+from soep_preparation.utilities.merging import sort_by_key_columns
 
 for script_name in get_combine_module_names():
     _modules_to_combine = {module: MODULES[module] for module in script_name.split("_")}
@@ -27,7 +36,36 @@ for script_name in get_combine_module_names():
             script_path: The path to the script that contains the combine function.
 
         Returns:
-            The combined variables from the input modules.
+            The combined variables from the input modules, sorted by their key
+            columns.
         """
         script = load_script(script_path, expected_function="combine")
-        return script.combine(**modules_to_combine)
+        relevant_columns = get_relevant_combine_column_names(script_path)
+        projected_modules = {
+            name: _select_relevant_columns(module, relevant_columns=relevant_columns)
+            for name, module in modules_to_combine.items()
+        }
+        return sort_by_key_columns(script.combine(**projected_modules))
+
+
+def _select_relevant_columns(
+    module: pd.DataFrame, relevant_columns: list[str] | None
+) -> pd.DataFrame:
+    """Select the key columns and the columns the combine script reads.
+
+    Args:
+        module: The module to combine.
+        relevant_columns: The columns read by the combine script, None for all.
+
+    Returns:
+        The module restricted to the key and relevant columns.
+    """
+    if relevant_columns is None:
+        return module
+    return module[
+        [
+            column
+            for column in module.columns
+            if column in POTENTIAL_INDEX_VARIABLES or column in relevant_columns
+        ]
+    ]
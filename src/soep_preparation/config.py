@@ -4,7 +4,11 @@ SOEP_VERSION = "V41"
 SURVEY_YEARS = [*range(1984, 2024 + 1)]
 
 
+import contextlib
 import functools
+import hashlib
+import pickle
+import tempfile
 from pathlib import Path
 from typing import Any, Literal
 
@@ -36,27 +40,94 @@ MODULES = DataCatalog(name="modules")
 
 _METADATA_DTYPE = dict[
     str,
-    dict[Literal["module", "dtype", "survey_years"], dict[str, Any] | list[int] | str],
+    dict[
+        Literal["module", "dtype", "survey_years"],
+        dict[str, Any] | list[list[int]] | str,
+    ],
 ]
-METADATA: _METADATA_DTYPE = yaml.safe_load(
-    (SRC / "create_metadata" / "variable_to_metadata_mapping.yaml").open(
-        "r", encoding="utf-8"
-    )
-)
+METADATA_PATH = SRC / "create_metadata" / "variable_to_metadata_mapping.yaml"
+_METADATA_CACHE_PATH = BLD / "cache" / "variable_to_metadata_mapping.pkl"
+VARIABLE_STATISTICS_PATH = BLD / "variable_statistics.pkl"
+FINAL_DATASET_CACHE_PATH = BLD / "cache" / "final_datasets"
+FINAL_DATASET_CACHE_MAX_BYTES = 4 * 1024**3
+
+
+@functools.cache
+def get_metadata() -> _METADATA_DTYPE:
+    """Get the mapping of variables to their metadata.
+
+    The mapping is loaded on first use. Parsing the YAML file takes seconds, so the
+    parsed mapping is cached in a pickle file keyed by the SHA-256 digest of the
+    YAML file and only parsed again, with the libyaml loader if available, once the
+    file changes.
+
+    Returns:
+        The mapping of variable name to module, dtype, and survey years.
+    """
+    content = METADATA_PATH.read_bytes()
+    digest = hashlib.sha256(content).hexdigest()
+    with contextlib.suppress(OSError, pickle.UnpicklingError, EOFError, ValueError):
+        cached_digest, metadata = pickle.loads(_METADATA_CACHE_PATH.read_bytes())  # noqa: S301
+        if cached_digest == digest:
+            return metadata
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    metadata = yaml.load(content, Loader=loader)  # noqa: S506
+    with contextlib.suppress(OSError):
+        _METADATA_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so parallel workers never read a
+        # partially written cache.
+        with tempfile.NamedTemporaryFile(
+            dir=_METADATA_CACHE_PATH.parent, delete=False
+        ) as file:
+            pickle.dump((digest, metadata), file)
+        Path(file.name).replace(_METADATA_CACHE_PATH)
+    return metadata
+
+
+def __getattr__(name: str) -> _METADATA_DTYPE:
+    # Load `METADATA` only when it is accessed.
+    if name == "METADATA":
+        return get_metadata()
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
 
 POTENTIAL_INDEX_VARIABLES = ["hh_id", "hh_id_original", "p_id", "survey_year"]
 
 
+def get_metadata_dtype(variable: str) -> str | None:
+    """Get the dtype recorded for a non-categorical variable in the metadata mapping.
+
+    Pass the result as `dtype` to the integer helpers in `data_manipulator` to
+    cast to the recorded dtype directly instead of inferring the smallest one.
+
+    Args:
+        variable: The name of the variable.
+
+    Returns:
+        The recorded dtype, or None for variables not (yet) in the mapping and for
+        categorical variables, whose dtype is then inferred.
+    """
+    dtype = get_metadata().get(variable, {}).get("dtype")
+    return dtype if isinstance(dtype, str) else None
+
+
 __all__ = [
     "BLD",
     "DATA_ROOT",
+    "FINAL_DATASET_CACHE_MAX_BYTES",
+    "FINAL_DATASET_CACHE_PATH",
+    "METADATA_PATH",
     "MODULES",
     "RAW_DATA_FILES",
     "ROOT",
     "SOEP_VERSION",
     "SRC",
     "SURVEY_YEARS",
+    "VARIABLE_STATISTICS_PATH",
     "get_combine_module_names",
+    "get_metadata",
+    "get_metadata_dtype",
     "get_raw_data_file_names",
     "load_script",
 ]
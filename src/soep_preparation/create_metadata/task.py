@@ -1,28 +1,36 @@
 """Tasks to create metadata."""
 
+import contextlib
 import hashlib
 from collections.abc import Iterable
 from pathlib import Path
 from typing import Annotated, Any
 
+import numpy as np
 import pandas as pd
 import yaml
-from deepdiff import DeepHash
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
 from pytask import DataCatalog, Product, PythonNode, task
 
 from soep_preparation.config import (
     BLD,
     METADATA,
+    METADATA_PATH,
     MODULES,
     POTENTIAL_INDEX_VARIABLES,
     SRC,
+    VARIABLE_STATISTICS_PATH,
 )
+from soep_preparation.utilities.merging import get_key_columns, is_sorted_by
+from soep_preparation.utilities.survey_years import subtract_intervals, to_intervals
 
 _METADATA_CATALOG = DataCatalog(name="metadata")
 
 
-def _calculate_hash(x: Any) -> int | str:
-    return DeepHash(x)[x]
+def _calculate_hash(_metadata: dict[str, Any]) -> str:
+    # The mapping is loaded from the YAML file, so hashing the file's bytes is
+    # equivalent to hashing the nested mapping, and much faster.
+    return hashlib.sha256(METADATA_PATH.read_bytes()).hexdigest()
 
 
 for module_name in MODULES._entries:  # noqa: SLF001
@@ -39,15 +47,20 @@ for module_name in MODULES._entries:  # noqa: SLF001
             module: The data module to create metadata for.
 
         Returns:
-            Metadata information for index and variables contained in the module.
+            Metadata information for index and variables contained in the module,
+            the statistics of the variables per survey year, and the key columns
+            the module is sorted by.
 
         Raises:
             TypeError: If input data is not of expected type.
         """
         index_variables_metadata = _get_index_variables_metadata(module)
-        variable_metadata = _get_variable_metadata(module)
+        statistics = _get_statistics(module)
+        variable_metadata = _get_variable_metadata(module, statistics=statistics)
         return {
             "index_variables": index_variables_metadata,
+            "sorted_by": _get_sorted_by(module),
+            "statistics": statistics,
             "variable_metadata": variable_metadata,
         }
 
@@ -59,13 +72,17 @@ def task_create_variable_to_metadata_mapping_yaml(
         dict[str, Any], PythonNode(value=METADATA, hash=_calculate_hash)
     ],
     out_path: Annotated[Path, Product] = BLD / "variable_to_metadata_mapping.yaml",
+    statistics_path: Annotated[Path, Product] = VARIABLE_STATISTICS_PATH,
 ) -> None:
     """Create a mapping of variables to metadata and store as YAML file.
 
+    The statistics of the variables per survey year are stored next to it.
+
     Args:
         modules_metadata: Map of module to metadata information.
         current_metadata: The current metadata to compare the output against.
         out_path: The path to the YAML file to write.
+        statistics_path: The path to the pickle file of the variable statistics.
 
     Raises:
         TypeError: If input data or data name is not of expected type.
@@ -73,10 +90,36 @@ def task_create_variable_to_metadata_mapping_yaml(
     """
     _fail_if_stale_module_entries(modules_metadata)
     new_metadata = _create_variable_metadata(modules_metadata)
+    _write_mapping_if_changed(mapping=new_metadata, out_path=out_path)
+    _create_variable_statistics(modules_metadata).to_pickle(statistics_path)
+    if new_metadata != current_metadata:
+        _fail_if_mapping_changed(
+            new_mapping=new_metadata,
+            existing_mapping=current_metadata,
+            new_mapping_path=out_path,
+        )
+
 
+def _write_mapping_if_changed(mapping: dict[str, Any], out_path: Path) -> None:
+    """Write the mapping as YAML file unless the file already holds the mapping.
+
+    Dumping the mapping to YAML takes longer than parsing it, so the existing file
+    is parsed, with the libyaml loader if available, and the dump is skipped if it
+    holds the mapping. This keeps a single-module edit from rewriting the whole
+    file.
+
+    Args:
+        mapping: The mapping of variables to metadata to write.
+        out_path: The path to the YAML file to write.
+    """
+    if out_path.exists():
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with contextlib.suppress(yaml.YAMLError):
+            if yaml.load(out_path.read_bytes(), Loader=loader) == mapping:  # noqa: S506
+                return
     with out_path.open("w", encoding="utf-8") as file:
         yaml.dump(
-            data=new_metadata,
+            data=mapping,
             stream=file,
             width=60,  # Big differences how Python / yamllint count, leave buffer.
             default_flow_style=False,
@@ -84,12 +127,6 @@ def task_create_variable_to_metadata_mapping_yaml(
             allow_unicode=True,
             explicit_start=True,
         )
-    if new_metadata != current_metadata:
-        _fail_if_mapping_changed(
-            new_mapping=new_metadata,
-            existing_mapping=current_metadata,
-            new_mapping_path=out_path,
-        )
 
 
 def _get_index_variables_metadata(
@@ -110,6 +147,21 @@ def _get_index_variables_metadata(
     }
 
 
+def _get_sorted_by(module: pd.DataFrame) -> list[str]:
+    """Get the key columns the module is sorted by.
+
+    Args:
+        module: The data containing the index variables.
+
+    Returns:
+        The key columns of the module if it is sorted by them, else an empty list.
+    """
+    keys = get_key_columns(module)
+    if keys and is_sorted_by(data=module, keys=keys):
+        return keys
+    return []
+
+
 def _serialize_categorical_dtype(variable_dtype: pd.CategoricalDtype) -> dict:
     """Serialize a pandas CategoricalDtype to a dictionary.
 
@@ -126,20 +178,95 @@ def _serialize_categorical_dtype(variable_dtype: pd.CategoricalDtype) -> dict:
     }
 
 
+def _get_statistics(module: pd.DataFrame) -> pd.DataFrame:
+    """Get row counts, missing counts, and value ranges of variables per survey year.
+
+    Args:
+        module: The data containing the variables.
+
+    Returns:
+        One row per variable and survey year with the number of rows, the number of
+        missing values, and the minimum and maximum of numerical variables. The
+        survey year is missing for modules without `survey_year` column.
+    """
+    variables = [col for col in module.columns if col not in POTENTIAL_INDEX_VARIABLES]
+    if "survey_year" in module.columns:
+        keys = module["survey_year"]
+    else:
+        keys = pd.Series(pd.NA, index=module.index, dtype="int16[pyarrow]")
+    # One pass over all variables instead of one pass per variable.
+    n_non_missing = module[variables].notna().groupby(keys, dropna=False).sum()
+    n_rows = keys.value_counts(dropna=False).reindex(n_non_missing.index).to_numpy()
+    numerical = [
+        variable
+        for variable in variables
+        if is_numeric_dtype(module[variable].dtype)
+        and not is_bool_dtype(module[variable].dtype)
+    ]
+    grouped = module[numerical].groupby(keys, dropna=False)
+    minimum = grouped.min().reindex(index=n_non_missing.index, columns=variables)
+    maximum = grouped.max().reindex(index=n_non_missing.index, columns=variables)
+
+    n_years = len(n_non_missing)
+    n_variables = len(variables)
+    return pd.DataFrame(
+        {
+            "variable": np.repeat(variables, n_years),
+            "survey_year": pd.array(
+                np.tile(n_non_missing.index.to_numpy(), n_variables), dtype=keys.dtype
+            ),
+            "n_rows": np.tile(n_rows, n_variables),
+            "n_missing": (n_rows[:, None] - n_non_missing.to_numpy()).T.ravel(),
+            "min": minimum.to_numpy(dtype="float64", na_value=np.nan).T.ravel(),
+            "max": maximum.to_numpy(dtype="float64", na_value=np.nan).T.ravel(),
+        }
+    )
+
+
+def _get_survey_years(
+    statistics: pd.DataFrame, variables: list[str]
+) -> dict[str, list[list[int]]]:
+    """Get the survey years in which each variable has non-missing values.
+
+    Args:
+        statistics: The statistics of the variables per survey year.
+        variables: The variables to get the survey years for.
+
+    Returns:
+        The survey years for each variable as intervals of consecutive years.
+    """
+    is_available = (statistics["n_missing"] < statistics["n_rows"]) & statistics[
+        "survey_year"
+    ].notna()
+    available_years = (
+        statistics.loc[is_available].groupby("variable")["survey_year"].agg(list)
+    )
+    return {
+        variable: to_intervals(available_years.get(variable, []))
+        for variable in variables
+    }
+
+
 def _get_variable_metadata(
     module: pd.DataFrame,
+    statistics: pd.DataFrame | None = None,
 ) -> dict:
     """Get metadata for variables in the module.
 
     Args:
         module: The data containing the variables.
+        statistics: The statistics of the variables per survey year. Computed from
+            the module if not given.
 
     Returns:
         Metadata for each variable, including dtype and survey year availability.
     """
-    columns = module.columns.tolist()
-    survey_year_in_columns = "survey_year" in columns
-    variables = [col for col in columns if col not in POTENTIAL_INDEX_VARIABLES]
+    variables = [col for col in module.columns if col not in POTENTIAL_INDEX_VARIABLES]
+    survey_years = {}
+    if "survey_year" in module.columns:
+        if statistics is None:
+            statistics = _get_statistics(module)
+        survey_years = _get_survey_years(statistics=statistics, variables=variables)
 
     metadata = {}
     # for each variable/column in data
@@ -154,16 +281,9 @@ def _get_variable_metadata(
         else:
             serialized_variable_dtype = variable_dtype.name
 
-        # determine survey year availability of variable
-        variable_survey_years = None
-        if survey_year_in_columns:
-            variable_survey_years = sorted(
-                set(module[["survey_year", variable]].dropna()["survey_year"])
-            )
-
         metadata[variable] = {
             "dtype": serialized_variable_dtype,
-            "survey_years": variable_survey_years,
+            "survey_years": survey_years.get(variable),
         }
 
     return metadata
@@ -211,6 +331,28 @@ def _create_variable_metadata(
     return mapping
 
 
+def _create_variable_statistics(
+    map_modules_to_variables_and_their_metadata: dict,
+) -> pd.DataFrame:
+    """Return the statistics of all variables per survey year.
+
+    Args:
+        map_modules_to_variables_and_their_metadata: Map of module to variables
+             and their metadata information.
+
+    Returns:
+        The statistics of each module with the name of the module, without rows if
+        there are no modules.
+    """
+    statistics = [
+        metadata["statistics"].assign(module=module_name)
+        for module_name, metadata in map_modules_to_variables_and_their_metadata.items()
+    ]
+    if not statistics:
+        return _get_statistics(pd.DataFrame()).assign(module=pd.Series(dtype="str"))
+    return pd.concat(statistics, ignore_index=True)
+
+
 def _fail_if_stale_module_entries(module_names: Iterable[str]) -> None:
     """Abort if a persisted module entry has no cleaning/combining source file.
 
@@ -290,10 +432,10 @@ def _fail_if_mapping_changed(  # noqa: C901
                 )
 
             if metadata["survey_years"] != existing_metadata["survey_years"]:
-                old_years = set(existing_metadata["survey_years"] or [])
-                new_years = set(metadata["survey_years"] or [])
-                added_years = sorted(new_years - old_years)
-                removed_years = sorted(old_years - new_years)
+                old_years = existing_metadata["survey_years"] or []
+                new_years = metadata["survey_years"] or []
+                added_years = subtract_intervals(new_years, old_years)
+                removed_years = subtract_intervals(old_years, new_years)
                 if added_years:
                     error_messages.append(f"  - new survey years: {added_years}")
                 if removed_years:
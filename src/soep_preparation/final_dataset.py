@@ -1,13 +1,39 @@
 """Helper function to create final dataset."""
 
+import functools
+import hashlib
+import operator
+import shutil
+from collections.abc import Iterable, Mapping
 from difflib import get_close_matches
-from typing import TypedDict
+from pathlib import Path
+from typing import Any, Literal, NotRequired, TypedDict
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pytask import DataCatalog, PNode
 
-from soep_preparation.config import METADATA, POTENTIAL_INDEX_VARIABLES
+from soep_preparation.config import (
+    POTENTIAL_INDEX_VARIABLES,
+    VARIABLE_STATISTICS_PATH,
+    get_metadata,
+)
+from soep_preparation.utilities.dataset_cache import cache_dataset, load_cached_dataset
 from soep_preparation.utilities.error_handling import (
     fail_if_empty,
+    fail_if_input_has_invalid_type,
+)
+from soep_preparation.utilities.merging import (
+    get_key_columns,
+    is_sorted_by,
+    outer_merge,
+)
+from soep_preparation.utilities.survey_years import (
+    from_intervals,
+    is_in_intervals,
+    to_intervals,
 )
 
 
@@ -24,10 +50,30 @@ class DatasetMergingInfo(TypedDict):
     index_variables: list[str]
 
 
-def create_final_dataset(
-    modules: dict[str, pd.DataFrame],
+class DatasetRequest(TypedDict):
+    """A request for a dataset in `create_final_datasets`.
+
+    The keys are the arguments of the same name of `create_final_dataset`;
+    "survey_years" and "filters" are optional.
+    """
+
+    variables: list[str]
+    survey_years: NotRequired[list[int] | None]
+    filters: NotRequired[list[tuple[str, str, Any]] | None]
+
+
+ModuleSource = pd.DataFrame | Path | PNode
+"""A loaded module, the path to its pickle file, or its catalog entry."""
+
+
+def create_final_dataset(  # noqa: PLR0913
+    modules: Mapping[str, ModuleSource] | DataCatalog,
     variables: list[str],
     survey_years: list[int] | None = None,
+    *,
+    filters: list[tuple[str, str, Any]] | None = None,
+    cache_dir: Path | None = None,
+    backend: Literal["pandas", "pyarrow"] = "pandas",
 ) -> pd.DataFrame:
     """Merge variables for specified survey years into final dataset.
 
@@ -35,9 +81,20 @@ def create_final_dataset(
     Variables are results of the pipeline of cleaning and combining variables.
 
     Args:
-        modules: All modules required to create the final dataset.
+        modules: All modules required to create the final dataset. Either loaded
+            modules, paths to their pickle files, catalog entries, or the catalog of
+            modules itself.
         variables: A list of variable names for the merged dataset to contain.
         survey_years: Survey years to be included in the dataset.
+        filters: Row filters `(variable, operator, value)` the rows of the dataset
+            must all satisfy, with operators "==", "!=", "<", "<=", ">", ">=",
+            "in", and "not in", e.g. `[("age", ">=", 18)]`. Rows with a missing
+            value of a filtered variable are removed. The variables need not be
+            requested. Defaults to no filters.
+        cache_dir: The directory to cache datasets in, e.g.
+            `FINAL_DATASET_CACHE_PATH`. Defaults to no caching.
+        backend: The library to merge the modules with. "pyarrow" joins the
+            modules as Arrow tables with multi-threaded hash joins.
 
     Returns:
         The dataset with specified variables and survey years.
@@ -51,71 +108,597 @@ def create_final_dataset(
 
     Notes:
         `modules` contains the cleaned and combined modules with the
-         variables of interest.
+         variables of interest. Modules that are not loaded yet are only loaded
+         if the metadata lists them as the module of a requested variable, so
+         passing all modules (e.g. `MODULES`) is as cheap as passing the
+         required ones.
         `variables` contains the variables
         created, renamed, and derived from the raw SOEP data files
         that will be part of the merged dataset.
         `survey_years` are those years the final dataset will contain variables for.
         To receive data for just one year (e.g. `2025`) specify `survey_years=[2025]`.
+        `filters` are evaluated in the modules containing the filtered variables
+        before merging, and the modules sharing index variables with them are
+        restricted to the remaining observations.
+        With a `cache_dir`, a dataset of the same variables, survey years,
+        filters, and backend created from unchanged modules is loaded from the
+        cache, see
+        `soep_preparation.utilities.dataset_cache`.
 
     Examples:
         For an example see `task_example.py`.
     """
-    _error_handling(
-        modules=modules,
-        variables=variables,
-        survey_years=survey_years,
-    )
+    _fail_if_invalid_backend(backend)
+    filters = filters or []
+    _fail_if_invalid_filters(filters)
     harmonized_variables = _harmonize_variables(variables)
+    # Filtered variables that were not requested are merged and removed afterwards.
+    filter_variables = list(
+        dict.fromkeys(
+            column
+            for column, _, _ in filters
+            if column not in harmonized_variables
+            and column not in POTENTIAL_INDEX_VARIABLES
+        )
+    )
+    _error_handling(variables=variables + filter_variables, survey_years=survey_years)
+    modules = _select_required_modules(
+        modules=modules, variables=variables + filter_variables
+    )
+    if cache_dir is not None:
+        fingerprints = _get_module_fingerprints(
+            modules=modules, variables=harmonized_variables + filter_variables
+        )
+        cached_dataset = load_cached_dataset(
+            cache_dir=cache_dir,
+            variables=harmonized_variables,
+            survey_years=survey_years,
+            fingerprints=fingerprints,
+            filters=filters,
+            backend=backend,
+        )
+        if cached_dataset is not None:
+            return cached_dataset
+
+    modules = _load_modules(modules=modules, variables=variables + filter_variables)
 
-    dataset_merging_information = _get_sorted_dataset_merging_information(
-        modules=modules,
-        variables=harmonized_variables,
-        survey_years=survey_years,
+    dataset_merging_information = _push_down_filters(
+        _get_sorted_dataset_merging_information(
+            modules=modules,
+            variables=harmonized_variables + filter_variables,
+            survey_years=survey_years,
+        ),
+        filters=filters,
     )
 
-    return _merge_data(
+    merge_data = _merge_data_with_pyarrow if backend == "pyarrow" else _merge_data
+    # Filters matching no observation give an empty dataset, as filtering the
+    # merged dataset would.
+    dataset = merge_data(
         merging_information=dataset_merging_information,
+        allow_empty=bool(filters),
+    )
+    if filters:
+        _fail_if_filtered_variable_not_in_dataset(dataset, filters=filters)
+        dataset = (
+            dataset.loc[_evaluate_filters(dataset, filters=filters)]
+            .drop(columns=filter_variables)
+            .reset_index(drop=True)
+        )
+    if cache_dir is not None:
+        cache_dataset(
+            dataset=dataset,
+            cache_dir=cache_dir,
+            variables=harmonized_variables,
+            survey_years=survey_years,
+            fingerprints=fingerprints,
+            filters=filters,
+            backend=backend,
+        )
+    return dataset
+
+
+def create_final_datasets(
+    modules: Mapping[str, ModuleSource] | DataCatalog,
+    requests: dict[str, DatasetRequest],
+    backend: Literal["pandas", "pyarrow"] = "pandas",
+) -> dict[str, pd.DataFrame]:
+    """Create multiple final datasets, sharing loaded modules and merges.
+
+    Each module is loaded once for all requests. Requests for the same survey years
+    and filters whose variables come from the same modules share one merge: the
+    dataset of all their variables is created once and each request's dataset is
+    selected from it. Only requests of the same modules share work; requests whose
+    modules overlap are merged separately, also the modules they share, since
+    merging further modules can add or repeat rows.
+
+    Args:
+        modules: All modules required to create the final datasets, as for
+            `create_final_dataset`.
+        requests: Map of dataset name to the variables, survey years, and filters
+            of the dataset.
+        backend: The library to merge the modules with, as for
+            `create_final_dataset`.
+
+    Returns:
+        Map of dataset name to the dataset, equal to the dataset
+        `create_final_dataset` creates for the request.
+
+    Raises:
+        ValueError: As `create_final_dataset`.
+    """
+    fail_if_empty(requests, name="requests")
+    for request in requests.values():
+        _error_handling(
+            variables=[
+                *request["variables"],
+                *(column for column, _, _ in request.get("filters") or []),
+            ],
+            survey_years=request.get("survey_years"),
+        )
+    all_variables = list(
+        dict.fromkeys(
+            variable
+            for request in requests.values()
+            for variable in [
+                *request["variables"],
+                *(column for column, _, _ in request.get("filters") or []),
+            ]
+        )
+    )
+    modules = _load_modules(
+        modules=_select_required_modules(modules=modules, variables=all_variables),
+        variables=all_variables,
+    )
+
+    groups: dict[tuple, list[str]] = {}
+    for name, request in requests.items():
+        filters = request.get("filters") or []
+        variables = _harmonize_variables(
+            [*request["variables"], *(column for column, _, _ in filters)]
+        )
+        module_names = tuple(
+            module_name
+            for module_name, data in modules.items()
+            if any(variable in data.columns for variable in variables)
+        )
+        survey_years = request.get("survey_years")
+        key = (
+            module_names,
+            None if survey_years is None else tuple(sorted(set(survey_years))),
+            repr(filters),
+        )
+        groups.setdefault(key, []).append(name)
+
+    datasets = {}
+    for names in groups.values():
+        first = requests[names[0]]
+        filters = first.get("filters") or []
+        # The filtered variables are requested, so each request's rows can be
+        # selected as if they had been merged for the request alone.
+        group_variables = list(
+            dict.fromkeys(
+                variable
+                for name in names
+                for variable in [
+                    *requests[name]["variables"],
+                    *(column for column, _, _ in filters),
+                ]
+            )
+        )
+        dataset = create_final_dataset(
+            modules=modules,
+            variables=group_variables,
+            survey_years=first.get("survey_years"),
+            filters=filters,
+            backend=backend,
+        )
+        for name in names:
+            datasets[name] = _select_requested_dataset(
+                dataset,
+                modules=modules,
+                variables=requests[name]["variables"],
+                filters=filters,
+            )
+    return {name: datasets[name] for name in requests}
+
+
+def export_final_dataset(
+    modules: Mapping[str, ModuleSource] | DataCatalog,
+    variables: list[str],
+    survey_years: list[int],
+    out_dir: Path,
+) -> pd.DataFrame:
+    """Write the final dataset as a Parquet dataset partitioned by survey year.
+
+    The dataset is created and written one survey year at a time into
+    `out_dir/survey_year=<year>/part-0.parquet`, so at most one survey year of the
+    merged dataset is held in memory. The modules are pickled data frames, which
+    cannot be read one survey year at a time, so they are loaded once before and
+    held in memory for all survey years, projected to their index variables and
+    the requested variables. Read the dataset with `pd.read_parquet(out_dir)`,
+    optionally with `filters=[("survey_year", "in", years)]`. Parquet stores
+    categoricals with numerical categories as their values, so these are read as
+    numbers.
+
+    Args:
+        modules: All modules required to create the final dataset, as for
+            `create_final_dataset`.
+        variables: A list of variable names for the merged dataset to contain.
+        survey_years: Survey years to be included in the dataset.
+        out_dir: The directory to write the dataset to. Partitions of a previous
+            export are removed.
+
+    Returns:
+        The rows without a survey year, i.e. of entities only observed in modules
+        without a survey year, which belong to no partition.
+
+    Raises:
+        ValueError: As `create_final_dataset`, or if no module containing the
+        variables has a survey year.
+    """
+    fail_if_empty(survey_years, name="survey_years")
+    _error_handling(variables=variables, survey_years=survey_years)
+    modules = _load_modules(
+        modules=_select_required_modules(modules=modules, variables=variables),
+        variables=variables,
+    )
+    harmonized_variables = _harmonize_variables(variables)
+    for partition_dir in out_dir.glob("survey_year=*"):
+        shutil.rmtree(partition_dir)
+
+    without_survey_year = None
+    for survey_year in sorted(set(survey_years)):
+        partition = _merge_data(
+            merging_information=_get_sorted_dataset_merging_information(
+                modules=modules,
+                variables=harmonized_variables,
+                survey_years=[survey_year],
+            ),
+            allow_empty=True,
+        )
+        _fail_if_no_survey_year(partition)
+        has_survey_year = partition["survey_year"].notna()
+        _write_partition(
+            partition.loc[has_survey_year].drop(columns="survey_year"),
+            path=out_dir / f"survey_year={survey_year}" / "part-0.parquet",
+        )
+        # Rows without a survey year are those of entities not observed in the
+        # survey year, so the dataset contains those not observed in any year.
+        rows = partition.loc[~has_survey_year]
+        if without_survey_year is not None:
+            entity = [
+                v for v in POTENTIAL_INDEX_VARIABLES if v in rows and v != "survey_year"
+            ]
+            rows = without_survey_year.loc[
+                pd.MultiIndex.from_frame(without_survey_year[entity]).isin(
+                    pd.MultiIndex.from_frame(rows[entity])
+                )
+            ]
+        without_survey_year = rows
+    return without_survey_year.reset_index(drop=True)
+
+
+def describe_variables(
+    variables: list[str],
+    survey_years: list[int] | None = None,
+    statistics_path: Path = VARIABLE_STATISTICS_PATH,
+) -> pd.DataFrame:
+    """Describe variables from the statistics stored with the metadata.
+
+    The statistics are created alongside the metadata mapping, so no module is
+    loaded. A dataset of the variables has at least as many rows as the largest
+    number of non-missing values of a variable and at most as many rows as the
+    modules of the variables have in total.
+
+    Args:
+        variables: A list of variable names to describe.
+        survey_years: Survey years to describe the variables for. Defaults to all.
+        statistics_path: The path to the pickle file of the variable statistics.
+
+    Returns:
+        One row per variable with its module, its number of rows and non-missing
+        values, and the minimum and maximum of numerical variables.
+
+    Raises:
+        ValueError: If variables are empty or contain faulty variables.
+        FileNotFoundError: If the statistics were not created yet.
+    """
+    fail_if_empty(variables, name="variables")
+    _fail_if_invalid_variable(variables=variables)
+    if not statistics_path.exists():
+        msg = (
+            f"The variable statistics at {statistics_path} do not exist. Run pytask"
+            " to create the metadata and its statistics."
+        )
+        raise FileNotFoundError(msg)
+    harmonized_variables = _harmonize_variables(variables)
+    statistics = pd.read_pickle(statistics_path)  # noqa: S301
+    statistics = statistics.loc[statistics["variable"].isin(harmonized_variables)]
+    if survey_years is not None:
+        statistics = statistics.loc[
+            statistics["survey_year"].isin(survey_years)
+            | statistics["survey_year"].isna()
+        ]
+    grouped = statistics.groupby("variable")
+    n_rows = grouped["n_rows"].sum().reindex(harmonized_variables, fill_value=0)
+    n_missing = grouped["n_missing"].sum().reindex(harmonized_variables, fill_value=0)
+    metadata = get_metadata()
+    return pd.DataFrame(
+        {
+            "module": [
+                metadata[variable]["module"] for variable in harmonized_variables
+            ],
+            "n_rows": n_rows,
+            "n_non_missing": n_rows - n_missing,
+            "min": grouped["min"].min().reindex(harmonized_variables),
+            "max": grouped["max"].max().reindex(harmonized_variables),
+        },
+        index=pd.Index(harmonized_variables, name="variable"),
     )
 
 
+def _select_required_modules(
+    modules: Mapping[str, ModuleSource] | DataCatalog,
+    variables: list[str],
+) -> dict[str, ModuleSource]:
+    """Select the loaded modules and the modules containing a requested variable.
+
+    Returns:
+        The selected modules, in the order they were provided.
+    """
+    if isinstance(modules, DataCatalog):
+        modules = modules._entries  # noqa: SLF001
+    metadata = get_metadata()
+    required_modules = {
+        metadata[variable]["module"] for variable in variables if variable in metadata
+    }
+    return {
+        module_name: module
+        for module_name, module in modules.items()
+        if isinstance(module, pd.DataFrame) or module_name in required_modules
+    }
+
+
+def _load_modules(
+    modules: dict[str, ModuleSource],
+    variables: list[str],
+) -> dict[str, pd.DataFrame]:
+    """Load the modules that are not loaded yet.
+
+    Loaded modules are projected to their index and requested variables right
+    away, so only one full module is held in memory at a time.
+
+    Returns:
+        The loaded modules, in the order they were provided.
+    """
+    loaded_modules = {}
+    for module_name, module in modules.items():
+        if isinstance(module, pd.DataFrame):
+            loaded_modules[module_name] = module
+            continue
+        data = _load_module(module)
+        loaded_modules[module_name] = data[
+            [
+                column
+                for column in data.columns
+                if column in POTENTIAL_INDEX_VARIABLES or column in variables
+            ]
+        ]
+    return loaded_modules
+
+
+def _load_module(module: Path | PNode) -> pd.DataFrame:
+    fail_if_input_has_invalid_type(input_=module, expected_dtypes=["Path", "Node"])
+    if isinstance(module, Path):
+        return pd.read_pickle(module)  # noqa: S301
+    return module.load()
+
+
+def _get_module_fingerprints(
+    modules: dict[str, ModuleSource],
+    variables: list[str],
+) -> dict[str, str]:
+    """Fingerprint the modules a dataset of the variables is created from.
+
+    Modules not loaded yet are fingerprinted by the state of their file, loaded
+    modules by the content of their index and requested variables.
+
+    Returns:
+        Map of module name to fingerprint, for modules containing a variable.
+    """
+    fingerprints = {}
+    for module_name, module in modules.items():
+        if isinstance(module, Path):
+            stat = module.stat()
+            fingerprints[module_name] = f"{stat.st_size}-{stat.st_mtime_ns}"
+        elif isinstance(module, PNode):
+            fingerprints[module_name] = str(module.state())
+        elif any(variable in module.columns for variable in variables):
+            data = module[
+                [
+                    column
+                    for column in module.columns
+                    if column in POTENTIAL_INDEX_VARIABLES or column in variables
+                ]
+            ]
+            digest = hashlib.sha256(str(data.dtypes.to_dict()).encode())
+            digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy())
+            fingerprints[module_name] = digest.hexdigest()
+    return fingerprints
+
+
+def _write_partition(partition: pd.DataFrame, path: Path) -> None:
+    # Cast to the dtypes a column gets when it has missing values, so all
+    # partitions share one schema.
+    dtypes = partition.iloc[:0].reindex([-1]).dtypes
+    upcast_dtypes = dtypes[dtypes != partition.dtypes].to_dict()
+    if upcast_dtypes:
+        partition = partition.astype(upcast_dtypes)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partition.to_parquet(path, index=False)
+
+
+def _fail_if_no_survey_year(partition: pd.DataFrame) -> None:
+    if "survey_year" not in partition.columns:
+        msg = (
+            "Expected a module containing the variables to have a survey year to"
+            " partition the dataset by."
+        )
+        raise ValueError(msg)
+
+
+_FILTER_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _fail_if_invalid_filters(filters: list[tuple[str, str, Any]]) -> None:
+    for filter_ in filters:
+        if len(filter_) != 3:  # noqa: PLR2004
+            msg = f"Expected filters to be (variable, operator, value), got {filter_}."
+            raise ValueError(msg)
+        column, op, _ = filter_
+        if op not in {*_FILTER_OPERATORS, "in", "not in"}:
+            msg = (
+                f"Expected the operator of filter {filter_} to be one of"
+                f" {[*_FILTER_OPERATORS, 'in', 'not in']}, got {op!r}."
+            )
+            raise ValueError(msg)
+        _fail_if_invalid_variable(variables=[column])
+
+
+def _fail_if_filtered_variable_not_in_dataset(
+    dataset: pd.DataFrame, filters: list[tuple[str, str, Any]]
+) -> None:
+    missing = [column for column, _, _ in filters if column not in dataset.columns]
+    if missing:
+        msg = (
+            f"The filtered variables {missing} are not present in the modules you"
+            " provided."
+        )
+        raise ValueError(msg)
+
+
+def _evaluate_filters(
+    data: pd.DataFrame, filters: list[tuple[str, str, Any]]
+) -> np.ndarray:
+    """Evaluate the filters on the variables of the data.
+
+    Returns:
+        Whether each row satisfies all filters on variables the data contains, with
+        missing values never satisfying a filter.
+    """
+    mask = np.ones(len(data), dtype=bool)
+    for column, op, value in filters:
+        if column not in data.columns:
+            continue
+        series = data[column]
+        if op == "in":
+            satisfied = series.isin(value)
+        elif op == "not in":
+            satisfied = ~series.isin(value)
+        else:
+            satisfied = _FILTER_OPERATORS[op](series, value)
+        mask &= (satisfied & series.notna()).fillna(value=False).to_numpy(dtype=bool)
+    return mask
+
+
+def _push_down_filters(
+    merging_information: dict[str, DatasetMergingInfo],
+    filters: list[tuple[str, str, Any]],
+) -> dict[str, DatasetMergingInfo]:
+    """Filter the modules before merging them.
+
+    Each module is filtered on the variables it contains. The observations left in
+    a module filtered on a variable other than an index variable are the only ones
+    rows of the dataset can come from, so the other modules are restricted to the
+    observations sharing their index variables with them.
+
+    Returns:
+        The merging information with filtered data.
+    """
+    if not filters:
+        return merging_information
+    filtered = {}
+    remaining_observations = []
+    for module_name, info in merging_information.items():
+        data = info["data"]
+        satisfied = _evaluate_filters(data, filters=filters)
+        if not satisfied.all():
+            data = data.loc[satisfied]
+        if any(
+            column in data.columns and column not in POTENTIAL_INDEX_VARIABLES
+            for column, _, _ in filters
+        ):
+            remaining_observations.append((module_name, data[info["index_variables"]]))
+        filtered[module_name] = {**info, "data": data}
+    for module_name, info in filtered.items():
+        data = info["data"]
+        for other_module_name, observations in remaining_observations:
+            shared = [v for v in info["index_variables"] if v in observations]
+            if other_module_name == module_name or not shared:
+                continue
+            remaining = pd.MultiIndex.from_frame(data[shared]).isin(
+                pd.MultiIndex.from_frame(observations[shared])
+            )
+            if not remaining.all():
+                data = data.loc[remaining]
+        info["data"] = data
+    return filtered
+
+
+def _fail_if_invalid_backend(backend: str) -> None:
+    if backend not in {"pandas", "pyarrow"}:
+        msg = f"Expected backend to be 'pandas' or 'pyarrow', got {backend!r}."
+        raise ValueError(msg)
+
+
 def _error_handling(
-    modules: dict[str, pd.DataFrame],
     variables: list[str],
     survey_years: list[int] | None,
 ) -> None:
+    # The request is validated against the metadata only, before any module is
+    # loaded, so validation does not depend on the size of the modules.
     fail_if_empty(variables, name="variables")
     _fail_if_invalid_variable(variables=variables)
 
     if survey_years is None:
         _fail_if_variable_varying_by_survey_year_provided(variables=variables)
     else:
-        modules_containing_survey_year_information = [
-            module for module, df in modules.items() if "survey_year" in df.columns
-        ]
-        if len(modules_containing_survey_year_information) > 0:
-            valid_survey_years = (
-                modules[modules_containing_survey_year_information[0]]["survey_year"]
-                .unique()
-                .tolist()
-            )
-            _fail_if_survey_years_not_valid(
-                survey_years=survey_years,
-                valid_survey_years=valid_survey_years,
-            )
+        _fail_if_survey_years_not_valid(
+            survey_years=survey_years,
+            valid_survey_years=_get_valid_survey_years(),
+        )
+
+
+@functools.cache
+def _get_valid_survey_years() -> list[list[int]]:
+    """Get the survey years of any variable in the metadata, as intervals."""
+    return to_intervals(
+        year
+        for metadata in get_metadata().values()
+        for year in from_intervals(metadata["survey_years"] or [])
+    )
 
 
 def _fail_if_invalid_variable(variables: list[str]) -> None:
+    metadata = get_metadata()
     for variable in variables:
-        if variable not in METADATA and variable not in POTENTIAL_INDEX_VARIABLES:
+        if variable not in metadata and variable not in POTENTIAL_INDEX_VARIABLES:
             closest_matches = get_close_matches(
                 variable,
-                METADATA.keys(),
+                metadata.keys(),
                 n=3,
                 cutoff=0.6,
             )
             matches = "    \n".join(
-                f"{m}: {METADATA[m]['module']}" for m in closest_matches
+                f"{m}: {metadata[m]['module']}" for m in closest_matches
             )
             msg = (
                 "Variable {variable} is not present in the modules you provided.\n"
@@ -127,17 +710,19 @@ def _fail_if_invalid_variable(variables: list[str]) -> None:
 
 def _fail_if_survey_years_not_valid(
     survey_years: list[int],
-    valid_survey_years: list[int],
+    valid_survey_years: list[list[int]],
 ) -> None:
-    if not all(year in valid_survey_years for year in survey_years):
-        msg = f"""Expected survey years to be in {valid_survey_years},
+    if not all(is_in_intervals(year, valid_survey_years) for year in survey_years):
+        valid = ", ".join(f"{first}-{last}" for first, last in valid_survey_years)
+        msg = f"""Expected survey years to be in {valid},
         got {survey_years} instead."""
         raise ValueError(msg)
 
 
 def _fail_if_variable_varying_by_survey_year_provided(variables: list[str]) -> None:
+    metadata = get_metadata()
     survey_year_dependent_variables = [
-        var for var in variables if var in METADATA and METADATA[var]["survey_years"]
+        var for var in variables if var in metadata and metadata[var]["survey_years"]
     ]
     if survey_year_dependent_variables:
         msg = f"""Did not provide any survey years.
@@ -161,12 +746,104 @@ def _sort_dataset_merging_information(
     )
 
 
+def _get_merge_order(merging_information: dict[str, DatasetMergingInfo]) -> list[int]:
+    """Get the positions of the modules in the order they are merged in.
+
+    The modules of the same index level are merged next to each other, so they are
+    aligned on identical keys. The columns of the dataset keep the order of the
+    modules.
+
+    Returns:
+        The positions of the modules in `merging_information`, grouped by index
+        level in the order of the first module of each level.
+    """
+    levels = [tuple(info["index_variables"]) for info in merging_information.values()]
+    return sorted(range(len(levels)), key=lambda i: levels.index(levels[i]))
+
+
+def _get_dataset_columns(
+    modules: dict[str, pd.DataFrame], variables: list[str]
+) -> list[str]:
+    """Get the columns of the dataset of the variables, in the order of merging.
+
+    Returns:
+        The index variables and variables of the modules containing the variables.
+    """
+    module_columns = {}
+    merging_information: dict[str, DatasetMergingInfo] = {}
+    for module_name, data in modules.items():
+        idx_vars = [v for v in POTENTIAL_INDEX_VARIABLES if v in data.columns]
+        mod_vars = [v for v in variables if v in data.columns and v not in idx_vars]
+        if mod_vars:
+            module_columns[module_name] = idx_vars + mod_vars
+            merging_information[module_name] = {
+                "data": data,
+                "index_variables": idx_vars,
+            }
+    return list(
+        dict.fromkeys(
+            column
+            for module_name in _sort_dataset_merging_information(merging_information)
+            for column in module_columns[module_name]
+        )
+    )
+
+
+def _select_requested_dataset(
+    dataset: pd.DataFrame,
+    modules: dict[str, pd.DataFrame],
+    variables: list[str],
+    filters: list[tuple[str, str, Any]],
+) -> pd.DataFrame:
+    """Select the dataset of requested variables from a dataset of more variables.
+
+    Both datasets need to be merged from the same modules, survey years, and
+    filters, so the rows of the requested dataset are those with a value of a
+    requested or filtered variable.
+
+    Returns:
+        The dataset `create_final_dataset` creates for the variables.
+    """
+    harmonized_variables = _harmonize_variables(variables)
+    filter_variables = [
+        column
+        for column, _, _ in filters
+        if column not in harmonized_variables
+        and column not in POTENTIAL_INDEX_VARIABLES
+    ]
+    columns = _get_dataset_columns(
+        modules=modules, variables=harmonized_variables + filter_variables
+    )
+    has_value = (
+        dataset[[v for v in columns if v not in POTENTIAL_INDEX_VARIABLES]]
+        .notna()
+        .any(axis="columns")
+    )
+    if not has_value.any():
+        msg = "The merged dataset contains no observations with non-missing values."
+        raise ValueError(msg)
+    return dataset.loc[
+        has_value, [v for v in columns if v not in filter_variables]
+    ].reset_index(drop=True)
+
+
 def _harmonize_variables(
     variables: list[str],
 ) -> list[str]:
     return [v for v in variables if v not in POTENTIAL_INDEX_VARIABLES]
 
 
+def _select_survey_years(
+    data: pd.DataFrame, survey_years: list[int] | None
+) -> slice | np.ndarray:
+    # The rows are selected together with the columns, so only the rows of the
+    # survey years are copied.
+    if "survey_year" not in data.columns or survey_years is None:
+        return slice(None)
+    in_survey_years = data["survey_year"].isin(survey_years).to_numpy()
+    return slice(None) if in_survey_years.all() else in_survey_years
+
+
 def _get_sorted_dataset_merging_information(
     modules: dict[str, pd.DataFrame],
     variables: list[str],
@@ -181,9 +858,10 @@ def _get_sorted_dataset_merging_information(
         # No need to keep module around if we do not have any variables to merge
         if not mod_vars:
             continue
-        data = full_data[idx_vars + mod_vars]
-        if "survey_year" in idx_vars and survey_years is not None:
-            data = data.query(f"survey_year in {survey_years}")
+        data = full_data.loc[
+            _select_survey_years(full_data, survey_years=survey_years),
+            idx_vars + mod_vars,
+        ]
         dataset_merging_information[module_name] = {
             "data": data,
             "index_variables": idx_vars,
@@ -191,18 +869,362 @@ def _get_sorted_dataset_merging_information(
     return _sort_dataset_merging_information(dataset_merging_information)
 
 
+def _get_merge_keys(left_columns: Iterable[str], right: pd.DataFrame) -> list[str]:
+    common_columns = [column for column in right.columns if column in left_columns]
+    keys = [key for key in get_key_columns(right) if key in common_columns]
+    return keys + [column for column in common_columns if column not in keys]
+
+
+def _fail_if_no_merge_keys(
+    on: list[str], merged_modules: list[str], module_name: str
+) -> None:
+    if not on:
+        msg = (
+            f"The module {module_name} shares no index variables with the modules "
+            f"{merged_modules}. Request variables of modules that share at least "
+            f"one of the index variables {POTENTIAL_INDEX_VARIABLES}."
+        )
+        raise ValueError(msg)
+
+
+def _merge_keys_and_positions(
+    merging_information: dict[str, DatasetMergingInfo],
+) -> tuple[pd.DataFrame, list[np.ndarray]]:
+    """Outer merge the index variables of the modules, keeping their row positions.
+
+    Returns:
+        The merged index variables and, for each module, the position of each
+        merged row in the module, -1 for rows not in the module.
+    """
+    module_names = list(merging_information)
+    merge_order = _get_merge_order(merging_information)
+    out = None
+    for n_merged, i in enumerate(merge_order):
+        module_name = module_names[i]
+        info = merging_information[module_name]
+        position_column = f"__position_{i}"
+        # The modules keep their index after selecting survey years, so the keys
+        # get a RangeIndex whose labels are the positions of the merged rows.
+        keys = (
+            info["data"][info["index_variables"]]
+            .reset_index(drop=True)
+            .assign(**{position_column: np.arange(len(info["data"]))})
+        )
+        if out is None:
+            out = keys
+            continue
+        on = _get_merge_keys(out.columns, keys)
+        _fail_if_no_merge_keys(
+            on=on,
+            merged_modules=[module_names[j] for j in merge_order[:n_merged]],
+            module_name=module_name,
+        )
+        # Modules are sorted by their keys, so modules of the same index level are
+        # aligned, and coarser levels broadcast, with a linear merge-join.
+        out = outer_merge(left=out, right=keys, on=on)
+    positions = [
+        out.pop(f"__position_{i}").to_numpy(dtype="float64", na_value=np.nan)
+        for i in range(len(module_names))
+    ]
+    return out, [np.nan_to_num(p, nan=-1).astype(np.int64) for p in positions]
+
+
+def _take(data: pd.DataFrame, positions: np.ndarray, upcast: bool) -> pd.DataFrame:
+    """Take rows by position, -1 for missing rows.
+
+    The dtypes are upcast to hold missing values if `upcast`, as they are when
+    taking a missing row.
+    """
+    out = data.set_axis(pd.RangeIndex(len(data))).reindex(positions)
+    if upcast and (positions >= 0).all():
+        dtypes = data.iloc[:0].reindex([-1]).dtypes
+        upcast_dtypes = dtypes[dtypes != data.dtypes].to_dict()
+        if upcast_dtypes:
+            out = out.astype(upcast_dtypes)
+    return out.set_axis(pd.RangeIndex(len(positions)))
+
+
+def _get_dataset_order(
+    keys: pd.DataFrame, has_value: np.ndarray, by: list[str]
+) -> np.ndarray:
+    """Get the positions of the rows of the dataset in the merged keys, sorted.
+
+    Modules are stored sorted by their keys (see `sort_by_key_columns`) and merged
+    with order-preserving merge-joins, so the merged keys are often already in the
+    order of the dataset, e.g. for datasets of persons only. Then the sort is
+    skipped.
+
+    Returns:
+        The positions of the rows with a value, sorted by the index variables.
+    """
+    rows = np.flatnonzero(has_value)
+    keys_no_nan = keys.iloc[rows].reset_index(drop=True)
+    if not by or (
+        not keys_no_nan[by].isna().any(axis=None)
+        and is_sorted_by(data=keys_no_nan, keys=by)
+    ):
+        return rows
+    # The RangeIndex makes the labels of the sorted keys their positions in `rows`.
+    return rows[keys_no_nan.sort_values(by=by, kind="stable").index.to_numpy()]
+
+
 def _merge_data(
     merging_information: dict[str, DatasetMergingInfo],
+    *,
+    allow_empty: bool = False,
 ) -> pd.DataFrame:
-    items = iter(merging_information.values())
-    out = next(items)["data"]
-    for m in items:
-        out = out.merge(m["data"], how="outer")
-    idx_vars_in_out = [v for v in POTENTIAL_INDEX_VARIABLES if v in out.columns]
-    mod_vars_in_out = [v for v in out.columns if v not in idx_vars_in_out]
-    out_no_nan = out.dropna(axis="index", subset=mod_vars_in_out, how="all")
-    if out_no_nan.empty:
+    # The rows of the dataset are found by merging only the index variables. Each
+    # module's variables are then taken once for the remaining rows instead of
+    # copying the growing dataset in every merge.
+    keys, positions = _merge_keys_and_positions(merging_information)
+    columns = list(
+        dict.fromkeys(
+            column for info in merging_information.values() for column in info["data"]
+        )
+    )
+    idx_vars_in_out = [v for v in POTENTIAL_INDEX_VARIABLES if v in columns]
+    mod_vars_in_out = [v for v in columns if v not in idx_vars_in_out]
+
+    key_variables = [v for v in keys.columns if v in mod_vars_in_out]
+    has_value = keys[key_variables].notna().any(axis="columns").to_numpy(copy=True)
+    module_variables = []
+    for info, module_positions in zip(
+        merging_information.values(), positions, strict=True
+    ):
+        variables = [
+            v for v in info["data"].columns if v in mod_vars_in_out and v not in keys
+        ]
+        module_variables.append(variables)
+        row_has_value = info["data"][variables].notna().any(axis="columns").to_numpy()
+        # The appended False is taken for the position -1 of rows not in the
+        # module, which also works for modules without rows.
+        has_value |= np.append(row_has_value, False)[module_positions]
+    if not has_value.any() and not allow_empty:
         msg = "The merged dataset contains no observations with non-missing values."
         raise ValueError(msg)
-    out_sorted = out_no_nan.sort_values(by=idx_vars_in_out)
-    return out_sorted.reset_index(drop=True)
+
+    order = _get_dataset_order(keys=keys, has_value=has_value, by=idx_vars_in_out)
+    out = [keys.iloc[order].reset_index(drop=True)]
+    for info, variables, module_positions in zip(
+        merging_information.values(), module_variables, positions, strict=True
+    ):
+        out.append(
+            _take(
+                data=info["data"][variables],
+                positions=module_positions[order],
+                upcast=bool((module_positions < 0).any()),
+            )
+        )
+    return pd.concat(out, axis="columns")[columns]
+
+
+def _merge_data_with_pyarrow(
+    merging_information: dict[str, DatasetMergingInfo],
+    *,
+    allow_empty: bool = False,
+) -> pd.DataFrame:
+    """Merge the modules as Arrow tables, equivalent to `_merge_data`.
+
+    As in `_merge_data`, only the index variables and row positions are joined, and
+    each module's variables are taken once for the remaining rows, sorted.
+
+    Returns:
+        The merged dataset.
+    """
+    keys, positions = _join_keys_with_pyarrow(merging_information)
+    columns = list(
+        dict.fromkeys(
+            column for info in merging_information.values() for column in info["data"]
+        )
+    )
+    idx_vars_in_out = [v for v in POTENTIAL_INDEX_VARIABLES if v in columns]
+    mod_vars_in_out = [v for v in columns if v not in idx_vars_in_out]
+
+    tables = []
+    has_value = pa.array(np.zeros(len(keys), dtype=bool))
+    for name in keys.column_names:
+        if name in mod_vars_in_out:
+            has_value = pc.or_(has_value, pc.is_valid(keys.column(name)))
+    for info, module_positions in zip(
+        merging_information.values(), positions, strict=True
+    ):
+        variables = [v for v in info["data"].columns if v not in keys.column_names]
+        table = pa.Table.from_pandas(info["data"][variables], preserve_index=False)
+        tables.append(table)
+        row_has_value = pa.array(np.zeros(len(table), dtype=bool))
+        for name in variables:
+            row_has_value = pc.or_(row_has_value, pc.is_valid(table.column(name)))
+        has_value = pc.or_(
+            has_value,
+            pc.fill_null(row_has_value.take(module_positions), fill_value=False),
+        )
+    if not pc.any(has_value).as_py() and not allow_empty:
+        msg = "The merged dataset contains no observations with non-missing values."
+        raise ValueError(msg)
+
+    # Arrow joins rows in no particular order, so the rows are sorted by all keys
+    # and, for duplicated keys, by their positions in the modules in the order of
+    # merging, which gives the order of `_merge_data`.
+    # Arrow's indices_nonzero crashes on a chunked array without chunks, which an
+    # empty join gives, so the rows with a value are found with numpy.
+    order = pa.array(np.flatnonzero(has_value.to_numpy(zero_copy_only=False)))
+    sort_keys = idx_vars_in_out + [
+        v for v in keys.column_names if v not in idx_vars_in_out
+    ]
+    merge_order = _get_merge_order(merging_information)
+    position_columns = [f"__position_{i}" for i in merge_order]
+    sort_table = keys.select(sort_keys)
+    for name, i in zip(position_columns, merge_order, strict=True):
+        sort_table = sort_table.append_column(name, positions[i])
+    order = order.take(
+        pc.sort_indices(
+            sort_table.take(order),
+            sort_keys=[(v, "ascending") for v in sort_keys + position_columns],
+        )
+    )
+    merged = dict(zip(keys.column_names, keys.take(order).columns, strict=True))
+    for table, module_positions in zip(tables, positions, strict=True):
+        merged.update(
+            zip(
+                table.column_names,
+                table.take(module_positions.take(order)).columns,
+                strict=True,
+            )
+        )
+    dataset = pa.table({name: merged[name] for name in columns}).to_pandas(
+        types_mapper=_get_pandas_dtype
+    )
+    return _cast_to_module_dtypes(
+        dataset,
+        merging_information=merging_information,
+        upcast=[
+            name
+            for table, module_positions in zip(tables, positions, strict=True)
+            if module_positions.null_count
+            for name in table.column_names
+        ]
+        + [name for name in keys.column_names if keys.column(name).null_count],
+    )
+
+
+def _join_keys_with_pyarrow(
+    merging_information: dict[str, DatasetMergingInfo],
+) -> tuple[pa.Table, list[pa.ChunkedArray]]:
+    """Outer join the index variables of the modules, keeping their row positions.
+
+    Arrow does not match missing keys, unlike pandas, so missing keys are replaced
+    by the smallest value of their type while joining.
+
+    Returns:
+        The joined index variables and, for each module, the position of each
+        joined row in the module, missing for rows not in the module.
+    """
+    module_names = list(merging_information)
+    merge_order = _get_merge_order(merging_information)
+    position_columns = [f"__position_{i}" for i in range(len(module_names))]
+    out = None
+    for n_merged, i in enumerate(merge_order):
+        module_name = module_names[i]
+        info = merging_information[module_name]
+        position_column = position_columns[i]
+        keys = pa.Table.from_pandas(
+            info["data"][info["index_variables"]], preserve_index=False
+        ).replace_schema_metadata(None)
+        for key in info["index_variables"]:
+            keys = _fill_null_key(keys, key=key)
+        keys = keys.append_column(
+            position_column, pa.array(np.arange(len(info["data"])))
+        )
+        if out is None:
+            out = keys
+            continue
+        on = _get_merge_keys(out.column_names, info["data"][info["index_variables"]])
+        _fail_if_no_merge_keys(
+            on=on,
+            merged_modules=[module_names[j] for j in merge_order[:n_merged]],
+            module_name=module_name,
+        )
+        keys = keys.cast(
+            pa.schema(
+                out.schema.field(name) if name in on else keys.schema.field(name)
+                for name in keys.column_names
+            )
+        )
+        out = out.join(keys, keys=on, join_type="full outer", coalesce_keys=True)
+    positions = [out.column(name) for name in position_columns]
+    keys = pa.table(
+        {
+            name: _restore_null_key(out.column(name))
+            for name in out.column_names
+            if name not in position_columns
+        }
+    )
+    return keys, positions
+
+
+def _cast_to_module_dtypes(
+    dataset: pd.DataFrame,
+    merging_information: dict[str, DatasetMergingInfo],
+    upcast: list[str],
+) -> pd.DataFrame:
+    """Cast the columns to their dtypes in the modules.
+
+    The columns in `upcast` are cast to the dtypes holding missing values, as
+    `_merge_data` does for columns with missing values introduced by the merge.
+
+    Returns:
+        The dataset with the dtypes of the modules.
+    """
+    dtypes = {}
+    for info in merging_information.values():
+        data = info["data"]
+        upcast_dtypes = data.iloc[:0].reindex([-1]).dtypes
+        for name in data.columns:
+            if name not in dtypes:
+                dtypes[name] = (
+                    upcast_dtypes[name] if name in upcast else data[name].dtype
+                )
+    columns = {}
+    for name, dtype in dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            columns[name] = _recode_categorical(dataset[name], dtype=dtype)
+        elif dataset[name].dtype != dtype:
+            columns[name] = dataset[name].astype(dtype)
+    if columns:
+        dataset = dataset.assign(**columns)
+    return dataset
+
+
+def _get_pandas_dtype(arrow_type: pa.DataType) -> pd.ArrowDtype | None:
+    # Keep Arrow data in Arrow memory, dictionaries become categoricals.
+    return None if pa.types.is_dictionary(arrow_type) else pd.ArrowDtype(arrow_type)
+
+
+def _recode_categorical(series: pd.Series, dtype: pd.CategoricalDtype) -> pd.Series:
+    # Equal categories of another dtype compare equal, so `astype` would keep them.
+    codes = series.cat.codes.to_numpy()
+    if not series.cat.categories.equals(dtype.categories):
+        mapping = dtype.categories.get_indexer(series.cat.categories)
+        codes = np.where(codes >= 0, mapping[codes], -1)
+    return pd.Series(
+        pd.Categorical.from_codes(codes, dtype=dtype),
+        index=series.index,
+        name=series.name,
+    )
+
+
+def _fill_null_key(table: pa.Table, key: str) -> pa.Table:
+    column = table.column(key)
+    if not column.null_count or not pa.types.is_integer(column.type):
+        return table
+    sentinel = pa.scalar(np.iinfo(column.type.to_pandas_dtype()).min, column.type)
+    return table.set_column(
+        table.column_names.index(key), key, pc.fill_null(column, sentinel)
+    )
+
+
+def _restore_null_key(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    if not pa.types.is_integer(column.type):
+        return column
+    sentinel = pa.scalar(np.iinfo(column.type.to_pandas_dtype()).min, column.type)
+    return pc.if_else(pc.equal(column, sentinel), pa.scalar(None, column.type), column)
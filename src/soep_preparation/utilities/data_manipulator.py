@@ -1,14 +1,21 @@
 """Utilities for manipulating data."""
 
 import re
+from collections.abc import Hashable
 
+import numpy as np
 import pandas as pd
-from pandas.api.types import CategoricalDtype
+import pyarrow as pa
+import pyarrow.compute as pc
+from pandas.api.types import CategoricalDtype, is_bool_dtype, is_string_dtype
 
 from soep_preparation.utilities.error_handling import (
+    fail_if_column_name_not_in_dataframe,
+    fail_if_empty,
     fail_if_input_equals,
     fail_if_input_has_invalid_type,
     fail_if_series_cannot_be_transformed,
+    fail_if_series_exceeds_dtype_bounds,
     fail_if_series_is_empty,
 )
 
@@ -101,6 +108,12 @@ def replace_missing_codes_with_na(series: pd.Series) -> pd.Series:
     return series.replace(values_to_remove, pd.NA)
 
 
+def _cast_to_recorded_dtype(series: pd.Series, dtype: str) -> pd.Series:
+    numerical = pd.to_numeric(series, dtype_backend="pyarrow")
+    fail_if_series_exceeds_dtype_bounds(series=numerical, dtype=dtype)
+    return numerical.astype(dtype)
+
+
 def apply_smallest_float_dtype(series: pd.Series) -> pd.Series:
     """Apply the smallest bit-size float dtype to a series.
 
@@ -115,15 +128,24 @@ def apply_smallest_float_dtype(series: pd.Series) -> pd.Series:
 
 def apply_smallest_int_dtype(
     series: pd.Series,
+    dtype: str | None = None,
 ) -> pd.Series:
     """Apply the smallest bit-size integer dtype to a series.
 
     Args:
         series: The series to convert.
+        dtype: The integer dtype recorded for the variable in the metadata mapping.
+         If given, the series is cast to it after a bounds check instead of
+         inferring the smallest dtype from its values. Defaults to None.
 
     Returns:
         The series with the smallest integer dtype applied.
+
+    Raises:
+        ValueError: If values of the series exceed the bounds of `dtype`.
     """
+    if dtype is not None:
+        return _cast_to_recorded_dtype(series=series, dtype=dtype)
     return pd.to_numeric(series, downcast="integer", dtype_backend="pyarrow")
 
 
@@ -159,6 +181,87 @@ def convert_to_categorical(
     return series.astype(raw_cat_dtype)
 
 
+def _fail_if_invalid_dummy_specification(
+    value_for_comparison: bool | str | list | float,
+    comparison_type: str,
+) -> None:
+    if type(value_for_comparison) is not str:
+        fail_if_input_equals(input_=comparison_type, failing_value="startswith")
+    fail_if_input_has_invalid_type(
+        input_=value_for_comparison,
+        expected_dtypes=("bool", "str", "list", "float", "int"),
+    )
+    fail_if_input_has_invalid_type(comparison_type, expected_dtypes=["str"])
+
+
+def _evaluate_dummy_condition(
+    series: pd.Series,
+    value_for_comparison: bool | str | list | float,
+    comparison_type: str,
+) -> pd.Series:
+    if comparison_type == "equal":
+        return series == value_for_comparison
+    if comparison_type == "neq":
+        return series != value_for_comparison
+    if comparison_type == "isin":
+        return series.isin(value_for_comparison)
+    if comparison_type == "geq":
+        return series.ge(value_for_comparison)
+    if comparison_type == "leq":
+        return series.le(value_for_comparison)
+    if comparison_type == "startswith":
+        return series.str.startswith(value_for_comparison)
+    msg = f"Unknown comparison type '{comparison_type}' of dummy creation"
+    raise ValueError(msg)
+
+
+def _to_bool_arrow_series(
+    values: np.ndarray,
+    missing: np.ndarray,
+    index: pd.Index,
+    name: Hashable | None,
+) -> pd.Series:
+    # Building the Arrow array from values and validity mask directly avoids the
+    # intermediate `.mask(...)` and `.astype("bool[pyarrow]")` copies.
+    return pd.Series(
+        pd.arrays.ArrowExtensionArray(pa.array(values, mask=missing, type=pa.bool_())),
+        index=index,
+        name=name,
+    )
+
+
+def _factorize_for_dummies(series: pd.Series) -> tuple[np.ndarray, pd.Series]:
+    """Split a series into integer codes (-1 for missing) and its unique values.
+
+    Categorical series already carry both, so only non-categorical series are
+    hashed. Unique values of a categorical keep its dtype, such that comparisons
+    on them follow the same (ordered or unordered) semantics as on the series.
+    """
+    if isinstance(series.dtype, CategoricalDtype):
+        uniques = pd.Series(
+            pd.Categorical.from_codes(
+                np.arange(len(series.cat.categories)), dtype=series.dtype
+            )
+        )
+        return series.cat.codes.to_numpy(), uniques
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    return codes, pd.Series(uniques)
+
+
+def _gather_dummy_from_uniques(
+    condition_on_uniques: pd.Series,
+    codes: np.ndarray,
+    index: pd.Index,
+    name: Hashable | None,
+) -> pd.Series:
+    # The appended entry is picked up by the missing-value code -1.
+    values = np.append(condition_on_uniques.to_numpy(dtype=bool, na_value=False), False)
+    missing = np.append(condition_on_uniques.isna().to_numpy(), True)
+    return _to_bool_arrow_series(
+        values=values[codes], missing=missing[codes], index=index, name=name
+    )
+
+
 def create_dummy(
     series: pd.Series,
     value_for_comparison: bool | str | list | float,
@@ -166,6 +269,9 @@ def create_dummy(
 ) -> pd.Series:
     """Create a dummy variable based on a condition.
 
+    Missing values in the series remain missing in the dummy. For categorical
+    series the condition is evaluated on the categories only and gathered by code.
+
     Args:
         series: The input series to be transformed.
         value_for_comparison: The value to be compared against.
@@ -176,64 +282,81 @@ def create_dummy(
         A boolean series indicating the condition.
     """
     fail_if_input_has_invalid_type(input_=series, expected_dtypes=["pandas.Series"])
-    if type(value_for_comparison) is not str:
-        fail_if_input_equals(input_=comparison_type, failing_value="startswith")
-    fail_if_input_has_invalid_type(
-        input_=value_for_comparison,
-        expected_dtypes=("bool", "str", "list", "float", "int"),
+    _fail_if_invalid_dummy_specification(
+        value_for_comparison=value_for_comparison, comparison_type=comparison_type
     )
-    fail_if_input_has_invalid_type(comparison_type, expected_dtypes=["str"])
-    if comparison_type == "equal":
-        return (
-            (series == value_for_comparison)
-            .mask(series.isna(), pd.NA)
-            .astype("bool[pyarrow]")
-        )
-    if comparison_type == "neq":
-        return (
-            (series != value_for_comparison)
-            .mask(series.isna(), pd.NA)
-            .astype("bool[pyarrow]")
-        )
-    if comparison_type == "isin":
-        return (
-            series.isin(value_for_comparison)
-            .mask(series.isna(), pd.NA)
-            .astype("bool[pyarrow]")
-        )
-    if comparison_type == "geq":
-        return (
-            series.ge(value_for_comparison)
-            .mask(series.isna(), pd.NA)
-            .astype("bool[pyarrow]")
+    if isinstance(series.dtype, CategoricalDtype):
+        codes, uniques = _factorize_for_dummies(series)
+        return _gather_dummy_from_uniques(
+            condition_on_uniques=_evaluate_dummy_condition(
+                uniques, value_for_comparison, comparison_type
+            ),
+            codes=codes,
+            index=series.index,
+            name=series.name,
         )
-    if comparison_type == "leq":
-        return (
-            series.le(value_for_comparison)
-            .mask(series.isna(), pd.NA)
-            .astype("bool[pyarrow]")
+    condition = _evaluate_dummy_condition(series, value_for_comparison, comparison_type)
+    return _to_bool_arrow_series(
+        values=condition.to_numpy(dtype=bool, na_value=False),
+        missing=series.isna().to_numpy() | condition.isna().to_numpy(),
+        index=series.index,
+        name=series.name,
+    )
+
+
+def create_dummies(
+    series: pd.Series,
+    conditions: dict[str, tuple[bool | str | list | float, str]],
+) -> pd.DataFrame:
+    """Create several dummy variables from conditions on the same series.
+
+    The series is split into codes and unique values once. Each condition is then
+    evaluated on the unique values only and gathered by code, which is much cheaper
+    than one full-length comparison per dummy on low-cardinality series.
+
+    Args:
+        series: The input series to be transformed.
+        conditions: Map of dummy name to a tuple of the value to be compared
+        against and the comparison type (see `create_dummy`).
+
+    Returns:
+        A DataFrame with one boolean column per condition.
+    """
+    fail_if_input_has_invalid_type(input_=series, expected_dtypes=["pandas.Series"])
+    fail_if_input_has_invalid_type(input_=conditions, expected_dtypes=["dict"])
+    for value_for_comparison, comparison_type in conditions.values():
+        _fail_if_invalid_dummy_specification(
+            value_for_comparison=value_for_comparison, comparison_type=comparison_type
         )
-    if comparison_type == "startswith":
-        return (
-            series.str.startswith(value_for_comparison)
-            .mask(series.isna(), pd.NA)
-            .astype(
-                "bool[pyarrow]",
+    codes, uniques = _factorize_for_dummies(series)
+    return pd.DataFrame(
+        {
+            name: _gather_dummy_from_uniques(
+                condition_on_uniques=_evaluate_dummy_condition(
+                    uniques, value_for_comparison, comparison_type
+                ),
+                codes=codes,
+                index=series.index,
+                name=name,
             )
-        )
-    msg = f"Unknown comparison type '{comparison_type}' of dummy creation"
-    raise ValueError(msg)
+            for name, (value_for_comparison, comparison_type) in conditions.items()
+        },
+        index=series.index,
+    )
 
 
 def float_to_int(
     series: pd.Series,
     code_negative_values_as_na: bool,
+    dtype: str | None = None,
 ) -> pd.Series:
     """Transform a float Series to an integer Series.
 
     Parameters:
         series: The input series to be transformed.
         code_negative_values_as_na: Code negative values as NA if True.
+        dtype: The integer dtype recorded in the metadata mapping; inferred
+         if None. Defaults to None.
 
     Returns:
         The series with cleaned entries.
@@ -241,8 +364,8 @@ def float_to_int(
     if code_negative_values_as_na:
         sr_int = series.astype("int")
         sr_no_missing = sr_int.where(sr_int >= 0, -1).replace({-1: pd.NA})
-        return apply_smallest_int_dtype(sr_no_missing)
-    return apply_smallest_int_dtype(series=series)
+        return apply_smallest_int_dtype(sr_no_missing, dtype=dtype)
+    return apply_smallest_int_dtype(series=series, dtype=dtype)
 
 
 def object_to_float(series: pd.Series) -> pd.Series:
@@ -264,11 +387,13 @@ def object_to_float(series: pd.Series) -> pd.Series:
     return apply_smallest_float_dtype(sr_relevant_values_only)
 
 
-def object_to_int(series: pd.Series) -> pd.Series:
+def object_to_int(series: pd.Series, dtype: str | None = None) -> pd.Series:
     """Transform a mixed object Series to an integer Series.
 
     Parameters:
         series: The input series to be cleaned.
+        dtype: The integer dtype recorded in the metadata mapping; inferred
+         if None. Defaults to None.
 
     Returns:
         The series with cleaned entries and transformed dtype.
@@ -280,7 +405,7 @@ def object_to_int(series: pd.Series) -> pd.Series:
         entries_expected_types=[series.unique(), ("float", "int", "str")],
     )
     sr_relevant_values_only = replace_missing_codes_with_na(series)
-    return apply_smallest_int_dtype(sr_relevant_values_only)
+    return apply_smallest_int_dtype(sr_relevant_values_only, dtype=dtype)
 
 
 def object_to_bool_categorical(
@@ -418,6 +543,55 @@ def object_to_str_categorical(
     return sr_str.astype(raw_cat_dtype)
 
 
+def _coalesce_categoricals(
+    series_1: pd.Series,
+    series_2: pd.Series,
+    ordered: bool,
+) -> pd.Series:
+    """Coalesce two categorical series on their codes.
+
+    The categories of both series are unioned and the codes of `series_2` are
+    remapped into the union, such that no value is materialized as an object.
+    Only the categories observed in the result are kept, sorted by value.
+    """
+    categories_1 = series_1.cat.categories
+    categories_2 = series_2.cat.categories
+    union = categories_1.append(categories_2[~categories_2.isin(categories_1)])
+    # The appended entry is picked up by the missing-value code -1.
+    codes_2_in_union = np.append(union.get_indexer(categories_2), -1)
+    codes_1 = series_1.cat.codes.to_numpy()
+    codes = np.where(
+        codes_1 != -1, codes_1, codes_2_in_union[series_2.cat.codes.to_numpy()]
+    )
+    observed = np.flatnonzero(np.bincount(codes[codes != -1], minlength=len(union)))
+    observed_values = union[observed].tolist()
+    position_by_value = {value: i for i, value in enumerate(sorted(observed_values))}
+    union_to_sorted = np.full(len(union) + 1, -1)
+    union_to_sorted[observed] = [position_by_value[v] for v in observed_values]
+    cat_dtype = CategoricalDtype(
+        categories=pd.Series(sorted(observed_values)), ordered=ordered
+    )
+    # Mirror `astype` being a no-op if both series already have the target dtype.
+    if series_1.dtype == series_2.dtype == cat_dtype:
+        return pd.Series(
+            pd.Categorical.from_codes(codes, dtype=series_1.dtype),
+            index=series_1.index,
+            name=series_1.name,
+        )
+    return pd.Series(
+        pd.Categorical.from_codes(union_to_sorted[codes], dtype=cat_dtype),
+        index=series_1.index,
+        name=series_1.name,
+    )
+
+
+def _has_str_or_bool_categories(series: pd.Series) -> bool:
+    if not isinstance(series.dtype, CategoricalDtype):
+        return False
+    categories_dtype = series.cat.categories.dtype
+    return is_string_dtype(categories_dtype) or is_bool_dtype(categories_dtype)
+
+
 def combine_first_and_make_categorical(
     series_1: pd.Series,
     series_2: pd.Series,
@@ -425,6 +599,11 @@ def combine_first_and_make_categorical(
 ) -> pd.Series:
     """Combine two series and convert to categorical.
 
+    If both series are categorical with string or boolean categories and share
+    their index, they are coalesced on their category codes instead of
+    re-deriving the categories from all values. Numerical categories take the
+    general path, since `combine_first` upcasts them.
+
     Args:
         series_1: The first series.
         series_2: The second series.
@@ -435,5 +614,113 @@ def combine_first_and_make_categorical(
     """
     fail_if_series_is_empty(series_1)
     fail_if_series_is_empty(series_2)
+    if (
+        _has_str_or_bool_categories(series_1)
+        and _has_str_or_bool_categories(series_2)
+        and series_1.index.equals(series_2.index)
+        and (series_1.notna().any() or series_2.notna().any())
+    ):
+        return _coalesce_categoricals(
+            series_1=series_1, series_2=series_2, ordered=ordered
+        )
     combined = series_1.combine_first(series_2)
     return convert_to_categorical(combined, ordered=ordered)
+
+
+def _coalesce(series: list[pd.Series], ordered: bool | None) -> pd.Series:
+    """Take the first non-missing value of the series, in the order given."""
+    dtypes = {sr.dtype for sr in series}
+    if all(isinstance(dtype, CategoricalDtype) for dtype in dtypes):
+        out = series[0]
+        for sr in series[1:]:
+            out = combine_first_and_make_categorical(
+                series_1=out,
+                series_2=sr,
+                ordered=series[0].dtype.ordered if ordered is None else ordered,
+            )
+        return out
+    out = series[0]
+    for sr in series[1:]:
+        out = out.combine_first(sr)
+    return out
+
+
+def _coalesce_arrow_block(
+    data: pd.DataFrame, columns: dict[str, list[str]], dtype: pd.ArrowDtype
+) -> dict[str, pd.Series]:
+    """Coalesce variables whose suffixed columns all have the same Arrow dtype.
+
+    The columns of each suffix are chained as chunks of one array, so all
+    variables are coalesced in one pass and split into zero-copy slices.
+
+    Returns:
+        Map of variable name to its coalesced values.
+    """
+    n_rows = len(data)
+    n_suffixes = len(next(iter(columns.values())))
+    stacked = [
+        pa.chunked_array(
+            [pa.array(data[suffixed[i]]) for suffixed in columns.values()],
+            type=dtype.pyarrow_dtype,
+        )
+        for i in range(n_suffixes)
+    ]
+    coalesced = pc.coalesce(*stacked)
+    return {
+        name: pd.Series(
+            pd.arrays.ArrowExtensionArray(coalesced.slice(i * n_rows, n_rows)),
+            index=data.index,
+        )
+        for i, name in enumerate(columns)
+    }
+
+
+def coalesce_suffixed(
+    data: pd.DataFrame,
+    names: list[str],
+    precedence: list[str],
+    ordered: bool | None = None,
+) -> pd.DataFrame:
+    """Coalesce variables that are recorded in multiple modules.
+
+    After merging modules, a variable `name` recorded in several of them is found in
+    the columns `f"{name}_{suffix}"`, one per module. For each name, the values of
+    the first column in order of `precedence` are taken and missing values are
+    filled from the following columns. The variables whose columns all have the
+    same Arrow dtype are coalesced together in one pass per dtype; categorical
+    columns are combined with `combine_first_and_make_categorical`.
+
+    Args:
+        data: The merged modules.
+        names: The names of the variables without suffix.
+        precedence: The suffixes in order of precedence.
+        ordered: Whether combined categoricals are ordered. Defaults to the ordering
+            of the column with the highest precedence.
+
+    Returns:
+        The coalesced variables with columns `names`.
+    """
+    fail_if_input_has_invalid_type(input_=data, expected_dtypes=["DataFrame"])
+    fail_if_empty(names, name="names")
+    fail_if_empty(precedence, name="precedence")
+    columns = {name: [f"{name}_{suffix}" for suffix in precedence] for name in names}
+    for column in [column for suffixed in columns.values() for column in suffixed]:
+        fail_if_column_name_not_in_dataframe(dataframe=data, column_name=column)
+    blocks: dict[pd.ArrowDtype, dict[str, list[str]]] = {}
+    for name, suffixed in columns.items():
+        dtypes = {data[column].dtype for column in suffixed}
+        dtype = next(iter(dtypes))
+        if len(dtypes) == 1 and isinstance(dtype, pd.ArrowDtype):
+            blocks.setdefault(dtype, {})[name] = suffixed
+    coalesced = {}
+    for dtype, block in blocks.items():
+        coalesced |= _coalesce_arrow_block(data=data, columns=block, dtype=dtype)
+    return pd.DataFrame(
+        {
+            name: coalesced[name]
+            if name in coalesced
+            else _coalesce([data[column] for column in suffixed], ordered=ordered)
+            for name, suffixed in columns.items()
+        },
+        index=data.index,
+    )
@@ -0,0 +1,265 @@
+"""Functions to cache final datasets on disk with least-recently-used eviction.
+
+A cached dataset is a pickle file next to a JSON file describing its request: the
+variables, the survey years, and the fingerprints of the modules it was created
+from. Entries are keyed by the variables and survey years. A request whose modules
+changed since it was cached therefore misses and replaces its entry.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from soep_preparation.config import FINAL_DATASET_CACHE_MAX_BYTES
+
+
+def get_request_key(
+    variables: list[str],
+    survey_years: list[int] | None,
+    filters: list[tuple[str, str, Any]] | None = None,
+    backend: str = "pandas",
+) -> str:
+    """Get the key of a dataset request.
+
+    The variables determine the order of the columns of the dataset, so the key
+    depends on their order. It does not depend on the order of the survey years
+    and filters. Filter values of different types, e.g. "18" and 18, give
+    different keys.
+
+    Args:
+        variables: The variables of the dataset.
+        survey_years: The survey years of the dataset, None for all.
+        filters: The row filters of the dataset, None for none.
+        backend: The backend the dataset is merged with.
+
+    Returns:
+        The SHA-256 digest of the variables, the sorted survey years, the sorted
+        filters, and the backend.
+    """
+    request = _get_request(
+        variables=variables, survey_years=survey_years, filters=filters, backend=backend
+    )
+    return hashlib.sha256(json.dumps(request).encode()).hexdigest()
+
+
+def load_cached_dataset(  # noqa: PLR0913
+    cache_dir: Path,
+    variables: list[str],
+    survey_years: list[int] | None,
+    fingerprints: dict[str, str],
+    *,
+    filters: list[tuple[str, str, Any]] | None = None,
+    backend: str = "pandas",
+) -> pd.DataFrame | None:
+    """Load a cached dataset and mark it as most recently used.
+
+    An entry created from modules with other fingerprints is stale and removed.
+
+    Args:
+        cache_dir: The directory of the cache.
+        variables: The variables of the dataset.
+        survey_years: The survey years of the dataset, None for all.
+        fingerprints: Map of module name to the fingerprint of the module.
+        filters: The row filters of the dataset, None for none.
+        backend: The backend the dataset is merged with.
+
+    Returns:
+        The cached dataset, or None if the request is not cached.
+    """
+    key = get_request_key(
+        variables=variables, survey_years=survey_years, filters=filters, backend=backend
+    )
+    data_path, info_path = _get_entry_paths(cache_dir=cache_dir, key=key)
+    info = _read_info(info_path)
+    if info is None:
+        return None
+    if info.get("fingerprints") != fingerprints:
+        _remove_entry(cache_dir=cache_dir, key=key)
+        return None
+    with contextlib.suppress(OSError, EOFError, pickle.UnpicklingError):
+        dataset = pd.read_pickle(data_path)  # noqa: S301
+        os.utime(data_path)
+        return dataset
+    return None
+
+
+def cache_dataset(  # noqa: PLR0913
+    dataset: pd.DataFrame,
+    *,
+    cache_dir: Path,
+    variables: list[str],
+    survey_years: list[int] | None,
+    fingerprints: dict[str, str],
+    filters: list[tuple[str, str, Any]] | None = None,
+    backend: str = "pandas",
+    max_bytes: int = FINAL_DATASET_CACHE_MAX_BYTES,
+) -> None:
+    """Cache a dataset and evict the least recently used entries beyond the size cap.
+
+    Args:
+        dataset: The dataset to cache.
+        cache_dir: The directory of the cache.
+        variables: The variables of the dataset.
+        survey_years: The survey years of the dataset, None for all.
+        fingerprints: Map of module name to the fingerprint of the module.
+        filters: The row filters of the dataset, None for none.
+        backend: The backend the dataset is merged with.
+        max_bytes: The maximum size of all entries of the cache.
+    """
+    key = get_request_key(
+        variables=variables, survey_years=survey_years, filters=filters, backend=backend
+    )
+    data_path, info_path = _get_entry_paths(cache_dir=cache_dir, key=key)
+    info = {
+        **_get_request(
+            variables=variables,
+            survey_years=survey_years,
+            filters=filters,
+            backend=backend,
+        ),
+        "fingerprints": fingerprints,
+    }
+    with contextlib.suppress(OSError):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to temporary files first so parallel workers never read a partially
+        # written entry, and write the data before the info that makes it valid.
+        _write_atomically(pickle.dumps(dataset), path=data_path)
+        _write_atomically(json.dumps(info).encode(), path=info_path)
+        _evict_least_recently_used(cache_dir=cache_dir, max_bytes=max_bytes)
+
+
+def list_cached_datasets(cache_dir: Path) -> pd.DataFrame:
+    """List the entries of the cache.
+
+    Args:
+        cache_dir: The directory of the cache.
+
+    Returns:
+        One row per entry, indexed by its key, with its variables, survey years,
+        filters, backend, modules, size in bytes, and the time it was last used,
+        most recently used first.
+    """
+    entries = []
+    for info_path in cache_dir.glob("*.json"):
+        data_path = info_path.with_suffix(".pkl")
+        info = _read_info(info_path)
+        with contextlib.suppress(OSError, KeyError, TypeError):
+            stat = data_path.stat()
+            entries.append(
+                {
+                    "key": info_path.stem,
+                    "variables": info["variables"],
+                    "survey_years": info["survey_years"],
+                    "filters": info.get("filters", []),
+                    "backend": info.get("backend", "pandas"),
+                    "modules": sorted(info["fingerprints"]),
+                    "n_bytes": stat.st_size,
+                    "last_used": pd.Timestamp(stat.st_mtime_ns, unit="ns"),
+                }
+            )
+    columns = [
+        "key",
+        "variables",
+        "survey_years",
+        "filters",
+        "backend",
+        "modules",
+        "n_bytes",
+        "last_used",
+    ]
+    return (
+        pd.DataFrame(entries, columns=columns)
+        .sort_values(by="last_used", ascending=False)
+        .set_index("key")
+    )
+
+
+def clear_cached_datasets(cache_dir: Path, keys: list[str] | None = None) -> None:
+    """Remove entries from the cache.
+
+    Args:
+        cache_dir: The directory of the cache.
+        keys: The keys of the entries to remove, as listed by
+            `list_cached_datasets`. Defaults to all entries.
+    """
+    if keys is None:
+        keys = [path.stem for path in cache_dir.glob("*.json")]
+    for key in keys:
+        _remove_entry(cache_dir=cache_dir, key=key)
+
+
+def _get_request(
+    variables: list[str],
+    survey_years: list[int] | None,
+    filters: list[tuple[str, str, Any]] | None,
+    backend: str,
+) -> dict[str, Any]:
+    return {
+        "variables": list(dict.fromkeys(variables)),
+        "survey_years": None if survey_years is None else sorted(set(survey_years)),
+        "filters": sorted(
+            (
+                [column, operator, _encode_filter_value(value)]
+                for column, operator, value in filters or []
+            ),
+            key=json.dumps,
+        ),
+        "backend": backend,
+    }
+
+
+def _encode_filter_value(value: Any) -> list:  # noqa: ANN401
+    # Values are stored with their type, so e.g. "18" and 18 are different filters.
+    # Values JSON does not support, e.g. numpy scalars, are stored as strings.
+    if isinstance(value, (list, tuple, set, frozenset)):
+        elements = [_encode_filter_value(element) for element in value]
+        return [
+            type(value).__name__,
+            sorted(elements, key=json.dumps)
+            if isinstance(value, (set, frozenset))
+            else elements,
+        ]
+    return [type(value).__name__, json.loads(json.dumps(value, default=str))]
+
+
+def _read_info(info_path: Path) -> dict | None:
+    with contextlib.suppress(OSError, ValueError):
+        return json.loads(info_path.read_text())
+    return None
+
+
+def _get_entry_paths(cache_dir: Path, key: str) -> tuple[Path, Path]:
+    return cache_dir / f"{key}.pkl", cache_dir / f"{key}.json"
+
+
+def _remove_entry(cache_dir: Path, key: str) -> None:
+    # Remove the info first, which invalidates the entry.
+    for path in reversed(_get_entry_paths(cache_dir=cache_dir, key=key)):
+        path.unlink(missing_ok=True)
+
+
+def _write_atomically(content: bytes, path: Path) -> None:
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as file:
+        file.write(content)
+    Path(file.name).replace(path)
+
+
+def _evict_least_recently_used(cache_dir: Path, max_bytes: int) -> None:
+    entries = sorted(
+        (path.stat().st_mtime_ns, path.stat().st_size, path.stem)
+        for path in cache_dir.glob("*.pkl")
+    )
+    n_bytes = sum(size for _, size, _ in entries)
+    # Keep the most recently used entry even if it exceeds the size cap alone.
+    for _, size, key in entries[:-1]:
+        if n_bytes <= max_bytes:
+            break
+        _remove_entry(cache_dir=cache_dir, key=key)
+        n_bytes -= size
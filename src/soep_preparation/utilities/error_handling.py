@@ -3,6 +3,7 @@
 from collections.abc import Iterable
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 
@@ -132,3 +133,23 @@ def fail_if_column_name_not_in_dataframe(
     if column_name not in dataframe.columns:
         msg = f"Expected column '{column_name}' to be in DataFrame, but it was not."
         raise ValueError(msg)
+
+
+def fail_if_series_exceeds_dtype_bounds(series: pd.Series, dtype: str) -> None:
+    """Fail if the values of a numerical series do not fit into an integer dtype.
+
+    Args:
+        series: The numerical series to check.
+        dtype: The integer dtype the series should be cast to.
+
+    Raises:
+        ValueError: If any value is out of the dtype's bounds.
+    """
+    bounds = np.iinfo(pd.api.types.pandas_dtype(dtype).numpy_dtype)
+    min_value, max_value = series.min(), series.max()
+    if pd.notna(min_value) and (min_value < bounds.min or max_value > bounds.max):
+        msg = (
+            f"Expected values of series {series.name} to be within the bounds of "
+            f"{dtype} [{bounds.min}, {bounds.max}], got [{min_value}, {max_value}]."
+        )
+        raise ValueError(msg)
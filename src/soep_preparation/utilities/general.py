@@ -127,6 +127,81 @@ def get_relevant_column_names(script_path: Path) -> list[str]:
     return list(dict.fromkeys(column for _, _, column in columns_in_source_order))
 
 
+def _get_coalesced_column_names(call: ast.Call) -> list[str] | None:
+    """Get the suffixed column names read by a `coalesce_suffixed` call.
+
+    Returns:
+        The column names, or None if names or suffixes are not literal lists.
+    """
+    arguments = dict(zip(["data", "names", "precedence"], call.args, strict=False))
+    arguments |= {keyword.arg: keyword.value for keyword in call.keywords}
+    try:
+        names = ast.literal_eval(arguments.get("names"))
+        suffixes = ast.literal_eval(arguments.get("precedence"))
+    except ValueError:
+        return None
+    return [f"{name}_{suffix}" for name in names for suffix in suffixes]
+
+
+def get_relevant_combine_column_names(script_path: Path) -> list[str] | None:
+    """Get the column names a combine script may read from its input modules.
+
+    Columns of the input modules are referenced by string literals in `combine`,
+    e.g. `merged["bmi_pequiv"]` or `pequiv[["p_id", "gesetzliche_rente_y"]]`, so
+    every string literal in the function is a candidate column name. Calls of
+    `coalesce_suffixed` read the names with each suffix appended. Key columns
+    are not included; they are always needed to merge the modules.
+
+    Args:
+        script_path: The path to the combine script.
+
+    Returns:
+        A list of candidate column names, or None if the script builds column names
+        dynamically (f-strings or `frame[key]` with a non-literal key), in which
+        case all columns are relevant.
+    """
+    script = load_script(script_path, expected_function="combine")
+    tree = ast.parse(textwrap.dedent(inspect.getsource(script.combine)))
+    function = tree.body[0]
+    docstring = ast.get_docstring(function, clean=False)
+    if docstring is not None:
+        function.body = function.body[1:]
+
+    def _is_literal_key(node: ast.AST) -> bool:
+        if isinstance(node, ast.List | ast.Tuple):
+            return all(_is_literal_key(element) for element in node.elts)
+        return isinstance(node, ast.Constant)
+
+    nodes = list(ast.walk(function))
+    if any(
+        isinstance(node, ast.JoinedStr)
+        or (
+            isinstance(node, ast.Subscript)
+            and isinstance(node.value, ast.Name)
+            and not _is_literal_key(node.slice)
+        )
+        for node in nodes
+    ):
+        return None
+    columns_in_source_order = sorted(
+        (node.lineno, node.col_offset, node.value)
+        for node in nodes
+        if isinstance(node, ast.Constant) and isinstance(node.value, str)
+    )
+    columns = [column for _, _, column in columns_in_source_order]
+    for node in nodes:
+        if (
+            isinstance(node, ast.Call)
+            and getattr(node.func, "id", getattr(node.func, "attr", None))
+            == "coalesce_suffixed"
+        ):
+            coalesced_columns = _get_coalesced_column_names(node)
+            if coalesced_columns is None:
+                return None
+            columns += coalesced_columns
+    return list(dict.fromkeys(columns))
+
+
 def load_script(script_path: Path, expected_function: str) -> ModuleType:
     """Load script from path and verify it contains the expected function.
 
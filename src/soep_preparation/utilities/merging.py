@@ -0,0 +1,289 @@
+"""Functions to sort modules by their keys and merge them on sorted keys."""
+
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_integer_dtype
+
+from soep_preparation.config import POTENTIAL_INDEX_VARIABLES
+from soep_preparation.utilities.error_handling import (
+    fail_if_column_name_not_in_dataframe,
+    fail_if_empty,
+    fail_if_input_has_invalid_type,
+)
+
+_ENTITY_VARIABLES = ["p_id", "hh_id", "hh_id_original"]
+
+
+def get_key_columns(data: pd.DataFrame) -> list[str]:
+    """Get the key columns of a module in the order the module is sorted by.
+
+    Modules are sorted by their entity (the person `p_id` or, for household modules,
+    the household `hh_id`), then by `survey_year`, then by the remaining keys. This
+    keeps the observations of an entity together, which is how the combine scripts
+    join modules.
+
+    Args:
+        data: The module.
+
+    Returns:
+        The key columns contained in the module.
+    """
+    return _order_key_columns(data.columns)
+
+
+def _order_key_columns(columns: Iterable[str]) -> list[str]:
+    keys = [key for key in POTENTIAL_INDEX_VARIABLES if key in columns]
+    entity = [key for key in _ENTITY_VARIABLES if key in keys][:1]
+    time = ["survey_year"] if "survey_year" in keys else []
+    return entity + time + [key for key in keys if key not in entity + time]
+
+
+def sort_by_key_columns(data: pd.DataFrame) -> pd.DataFrame:
+    """Sort a module by its key columns.
+
+    Args:
+        data: The module.
+
+    Returns:
+        The module sorted by `get_key_columns` with a fresh RangeIndex.
+    """
+    keys = get_key_columns(data)
+    if not keys or is_sorted_by(data=data, keys=keys):
+        return data.reset_index(drop=True)
+    return data.sort_values(by=keys, kind="stable", ignore_index=True)
+
+
+def is_sorted_by(data: pd.DataFrame, keys: list[str]) -> bool:
+    """Check whether the data is sorted lexicographically by the keys.
+
+    Args:
+        data: The data to check.
+        keys: The columns to check the order of.
+
+    Returns:
+        Whether the rows are in non-decreasing order of the keys.
+    """
+    if len(keys) == 1:
+        return data[keys[0]].is_monotonic_increasing
+    if any(not is_integer_dtype(data[key].dtype) or data[key].hasnans for key in keys):
+        return pd.MultiIndex.from_frame(data[keys]).is_monotonic_increasing
+    # Compare consecutive rows key by key: each pair of rows needs to be ordered by
+    # the first key they differ in.
+    undecided = np.ones(max(len(data) - 1, 0), dtype=bool)
+    for key in keys:
+        difference = np.diff(data[key].to_numpy(dtype=np.int64))
+        if (undecided & (difference < 0)).any():
+            return False
+        undecided &= difference == 0
+    return True
+
+
+def _pack_keys(
+    left: pd.DataFrame, right: pd.DataFrame, keys: list[str]
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """Pack integer keys into one int64 per row, preserving their lexicographic order.
+
+    Returns:
+        The packed keys of both frames, or None if a key is not an integer of the
+        same dtype in both frames, has missing values, or if the keys do not fit
+        into an int64.
+    """
+    packed_left = np.zeros(len(left), dtype=np.int64)
+    packed_right = np.zeros(len(right), dtype=np.int64)
+    capacity = 1
+    for key in keys:
+        if (
+            left[key].dtype != right[key].dtype
+            or not is_integer_dtype(left[key].dtype)
+            or left[key].hasnans
+            or right[key].hasnans
+        ):
+            return None
+        minimum = int(min(left[key].min(), right[key].min()))
+        n_values = int(max(left[key].max(), right[key].max())) - minimum + 1
+        capacity *= n_values
+        if capacity >= np.iinfo(np.int64).max:
+            return None
+        packed_left *= n_values
+        packed_left += left[key].to_numpy(dtype=np.int64) - minimum
+        packed_right *= n_values
+        packed_right += right[key].to_numpy(dtype=np.int64) - minimum
+    return packed_left, packed_right
+
+
+def _get_merge_join_positions(
+    left: pd.DataFrame, right: pd.DataFrame, on: list[str]
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """Get the row positions of an outer merge-join of frames sorted by the keys.
+
+    Returns:
+        The positions of the joined rows in both frames, -1 for rows missing in a
+        frame, or None if the frames cannot be merge-joined.
+    """
+    packed = _pack_keys(left=left, right=right, keys=on)
+    if packed is None:
+        return None
+    left_index, right_index = pd.Index(packed[0]), pd.Index(packed[1])
+    if (
+        not left_index.is_monotonic_increasing
+        or not right_index.is_monotonic_increasing
+        or not (left_index.is_unique or right_index.is_unique)  # many-to-many
+    ):
+        return None
+    # Both indexes are monotonic and one is unique, so pandas joins them with a
+    # linear merge-join.
+    join_index, left_indexer, right_indexer = left_index.join(
+        right_index, how="outer", return_indexers=True
+    )
+    n_rows = len(join_index)
+    return (
+        np.arange(n_rows) if left_indexer is None else left_indexer,
+        np.arange(n_rows) if right_indexer is None else right_indexer,
+    )
+
+
+def outer_merge(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    on: str | list[str],
+) -> pd.DataFrame:
+    """Outer merge two modules on their integer keys with a linear merge-join.
+
+    Equivalent to `pd.merge(left, right, on=on, how="outer")`, including the order
+    of rows, which is lexicographic in the keys in the order of `on`. If both frames
+    are sorted by those keys, the merge runs as a single pass over both frames
+    without building a hash table. Modules are sorted by `get_key_columns`, so pass
+    `on` in that order (e.g. `["p_id", "survey_year", "hh_id"]`).
+
+    Falls back to `pd.merge` if a frame is not sorted by the keys, if the keys are
+    not integers of the same dtype, contain missing values, or are duplicated in
+    both frames, or if the frames share non-key columns.
+
+    Args:
+        left: The left module.
+        right: The right module.
+        on: The key column(s) to merge on.
+
+    Returns:
+        The merged modules with a RangeIndex.
+    """
+    fail_if_input_has_invalid_type(input_=left, expected_dtypes=["DataFrame"])
+    fail_if_input_has_invalid_type(input_=right, expected_dtypes=["DataFrame"])
+    on = [on] if isinstance(on, str) else list(on)
+    for key in on:
+        fail_if_column_name_not_in_dataframe(dataframe=left, column_name=key)
+        fail_if_column_name_not_in_dataframe(dataframe=right, column_name=key)
+
+    right_columns = [column for column in right.columns if column not in on]
+    positions = None
+    if not left.columns.intersection(right_columns).size and len(left) and len(right):
+        positions = _get_merge_join_positions(left=left, right=right, on=on)
+    if positions is None:
+        return pd.merge(left=left, right=right, on=on, how="outer")
+
+    # Reindexing by position takes all columns of a dtype at once and marks
+    # positions of -1, which are not in the RangeIndex, as missing.
+    left_positions, right_positions = positions
+    index = pd.RangeIndex(len(left_positions))
+    left_part = left.set_axis(pd.RangeIndex(len(left))).reindex(left_positions)
+    left_part = left_part.set_axis(index)
+    right_part = right.set_axis(pd.RangeIndex(len(right))).reindex(right_positions)
+    right_part = right_part.set_axis(index)
+    for key in on:
+        left_part[key] = left_part[key].fillna(right_part[key]).astype(left[key].dtype)
+    return pd.concat([left_part, right_part[right_columns]], axis="columns")
+
+
+def plan_merge(modules: dict[str, pd.DataFrame]) -> list[tuple[str, list[str]]]:
+    """Plan the order in which to outer merge multiple modules.
+
+    The plan starts with the module with the most rows, which bounds the number of
+    rows of the merged modules from below. It then repeatedly merges the remaining
+    module sharing the most key columns with the modules merged so far, i.e. the
+    most selective merge, and among those the module with the fewest rows. Each
+    merge is on all key columns both sides share, in the order of
+    `get_key_columns`.
+
+    Args:
+        modules: Map of module name to module.
+
+    Returns:
+        Pairs of module name and the key columns to merge the module on, in the
+        order to merge them. The first module has no key columns.
+
+    Raises:
+        ValueError: If a module shares no key columns with the other modules.
+    """
+    fail_if_empty(modules, name="modules")
+    keys = {name: get_key_columns(module) for name, module in modules.items()}
+    first = max(modules, key=lambda name: (len(modules[name]), len(keys[name])))
+    plan = [(first, [])]
+    merged_keys = keys[first]
+    remaining = [name for name in modules if name != first]
+    while remaining:
+        name = max(
+            remaining,
+            key=lambda name: (
+                len(set(keys[name]) & set(merged_keys)),
+                -len(modules[name]),
+            ),
+        )
+        on = [key for key in merged_keys if key in keys[name]]
+        if not on:
+            _fail_if_no_shared_key_columns(
+                remaining=remaining, merged=[name for name, _ in plan]
+            )
+        plan.append((name, on))
+        merged_keys = _order_key_columns({*merged_keys, *keys[name]})
+        remaining.remove(name)
+    return plan
+
+
+def merge_modules(
+    modules: dict[str, pd.DataFrame],
+    columns: dict[str, list[str]] | None = None,
+) -> pd.DataFrame:
+    """Outer merge multiple modules on their shared key columns.
+
+    The modules are merged pairwise with `outer_merge` in the order of
+    `plan_merge`. Variables carry the name of their module as suffix, so the
+    modules share no other columns.
+
+    Args:
+        modules: Map of module name to module.
+        columns: Map of module name to the columns to keep besides the key columns.
+            Modules not in the map keep all columns. Defaults to all columns.
+
+    Returns:
+        The merged modules with a RangeIndex.
+    """
+    fail_if_empty(modules, name="modules")
+    for module in modules.values():
+        fail_if_input_has_invalid_type(input_=module, expected_dtypes=["DataFrame"])
+    columns = columns or {}
+    projected = {}
+    for name, module in modules.items():
+        if name not in columns:
+            projected[name] = module
+            continue
+        for column in columns[name]:
+            fail_if_column_name_not_in_dataframe(dataframe=module, column_name=column)
+        projected[name] = module[[*get_key_columns(module), *columns[name]]]
+
+    plan = plan_merge(projected)
+    first, _ = plan[0]
+    merged = projected[first]
+    for name, on in plan[1:]:
+        merged = outer_merge(left=merged, right=projected[name], on=on)
+    return merged.reset_index(drop=True)
+
+
+def _fail_if_no_shared_key_columns(remaining: list[str], merged: list[str]) -> None:
+    msg = (
+        f"The modules {remaining} share no key columns with the modules {merged}."
+        f" Modules can only be merged on the key columns"
+        f" {POTENTIAL_INDEX_VARIABLES}."
+    )
+    raise ValueError(msg)
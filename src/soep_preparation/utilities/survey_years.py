@@ -0,0 +1,78 @@
+"""Functions to encode survey years as intervals of consecutive years.
+
+Variables are mostly available in runs of consecutive survey years, so the metadata
+mapping stores the survey years of a variable as a sorted list of disjoint,
+non-adjacent, inclusive intervals, e.g. `[[1984, 2011], [2013, 2024]]`.
+"""
+
+from collections.abc import Iterable
+
+
+def to_intervals(years: Iterable[int]) -> list[list[int]]:
+    """Encode survey years as intervals of consecutive years.
+
+    Args:
+        years: The survey years, in any order and possibly duplicated.
+
+    Returns:
+        The sorted inclusive intervals `[first, last]` covering exactly the years.
+    """
+    intervals: list[list[int]] = []
+    for year in sorted(set(years)):
+        if intervals and year == intervals[-1][1] + 1:
+            intervals[-1][1] = year
+        else:
+            intervals.append([year, year])
+    return intervals
+
+
+def from_intervals(intervals: Iterable[list[int]]) -> list[int]:
+    """Decode intervals of consecutive years into the survey years.
+
+    Args:
+        intervals: The inclusive intervals `[first, last]`.
+
+    Returns:
+        The sorted survey years.
+    """
+    return [year for first, last in intervals for year in range(first, last + 1)]
+
+
+def is_in_intervals(year: int, intervals: Iterable[list[int]]) -> bool:
+    """Check whether a survey year is covered by the intervals.
+
+    Args:
+        year: The survey year.
+        intervals: The inclusive intervals `[first, last]`.
+
+    Returns:
+        Whether any interval contains the year.
+    """
+    return any(first <= year <= last for first, last in intervals)
+
+
+def subtract_intervals(
+    intervals: Iterable[list[int]], other: Iterable[list[int]]
+) -> list[list[int]]:
+    """Get the intervals of years covered by `intervals` but not by `other`.
+
+    Args:
+        intervals: The inclusive intervals to subtract from.
+        other: The inclusive intervals to subtract.
+
+    Returns:
+        The sorted inclusive intervals of the difference.
+    """
+    other = sorted(other)
+    out = []
+    for first, last in sorted(intervals):
+        start = first
+        for other_first, other_last in other:
+            if other_last < start or other_first > last:
+                continue
+            if other_first > start:
+                out.append([start, other_first - 1])
+            start = max(start, other_last + 1)
+        if start <= last:
+            out.append([start, last])
+    return out
@@ -0,0 +1,33 @@
+import inspect
+
+from soep_preparation.config import ROOT
+from soep_preparation.utilities import data_manipulator
+from soep_preparation.utilities.general import load_script
+
+benchmarks = load_script(
+    ROOT / "benchmarks" / "data_manipulator.py", expected_function="main"
+)
+
+
+def test_benchmark_cases_cover_public_functions():
+    public_functions = {
+        name
+        for name, function in inspect.getmembers(data_manipulator, inspect.isfunction)
+        if not name.startswith("_") and function.__module__ == data_manipulator.__name__
+    }
+    assert set(benchmarks.get_cases()) == public_functions
+
+
+def test_benchmark_run_assert_one_result_per_case_and_rows():
+    result = benchmarks.run(rows=[100, 1_000], repeats=1)
+    actual = {(r["function"], r["n_rows"]) for r in result["results"]}
+    expected = {
+        (name, n_rows) for name in benchmarks.get_cases() for n_rows in [100, 1_000]
+    }
+    assert actual == expected
+
+
+def test_benchmark_compare_assert_ratio():
+    old = {"results": [{"function": "f", "n_rows": 10, "min": 2.0}]}
+    new = {"results": [{"function": "f", "n_rows": 10, "min": 1.0}]}
+    assert benchmarks.compare(new=new, old=old)["ratio"].tolist() == [0.5]
@@ -0,0 +1,157 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from soep_preparation.config import ROOT
+from soep_preparation.utilities.data_manipulator import (
+    object_to_float,
+    object_to_int,
+)
+from soep_preparation.utilities.general import load_script
+
+synthetic = load_script(
+    ROOT / "benchmarks" / "synthetic_soep_data.py", expected_function="main"
+)
+
+CLEAN_SCRIPT = """
+import pandas as pd
+
+from soep_preparation.utilities.data_manipulator import (
+    apply_smallest_int_dtype,
+    object_to_bool_categorical,
+    object_to_float,
+    object_to_str_categorical,
+    replace_not_applicable_answer,
+)
+
+SEX = {"[1] maennlich": "male", "[2] weiblich": "female"}
+
+
+def _yes_no(series, renaming):
+    return object_to_bool_categorical(series, renaming=renaming)
+
+
+def clean(raw_data: pd.DataFrame) -> pd.DataFrame:
+    out = pd.DataFrame()
+    out["p_id"] = apply_smallest_int_dtype(raw_data["pid"])
+    out["survey_year"] = apply_smallest_int_dtype(raw_data["syear"])
+    out["gender"] = object_to_str_categorical(raw_data["sex"], renaming=SEX)
+    out["married"] = _yes_no(
+        raw_data["married"], renaming={"[1] Ja": True, 2: False}
+    )
+    out["status"] = object_to_str_categorical(raw_data["status"], nr_identifiers=2)
+    out["income"] = object_to_float(
+        replace_not_applicable_answer(raw_data["income"], value=0)
+    )
+    return out
+"""
+
+
+@pytest.fixture
+def clean_modules_directory(tmp_path: Path) -> Path:
+    directory = tmp_path / "clean_modules"
+    directory.mkdir()
+    (directory / "mymodule.py").write_text(CLEAN_SCRIPT, encoding="utf-8")
+    return directory
+
+
+def test_get_column_specs_assert_labels_from_renaming(clean_modules_directory: Path):
+    specs = synthetic.get_column_specs(clean_modules_directory / "mymodule.py")
+    assert specs["sex"]["answers"] == ["[1] maennlich", "[2] weiblich"]
+    assert specs["married"]["answers"] == ["[1] Ja", 2]
+    assert specs["income"] == {
+        "answers": [],
+        "integer": False,
+        "storage": "labelled",
+        "dtype": None,
+    }
+    assert specs["pid"]["storage"] == "int"
+
+
+def test_get_column_specs_assert_identifiers_without_renaming(
+    clean_modules_directory: Path,
+):
+    specs = synthetic.get_column_specs(clean_modules_directory / "mymodule.py")
+    assert specs["status"]["answers"][0] == "[1] id1 Kategorie 1"
+
+
+def test_make_population_assert_consistent_keys():
+    population = synthetic.make_population(n_persons=50, survey_years=[2020, 2021])
+    assert not population.duplicated(subset=["pid", "syear"]).any()
+    assert (population["pid"] // 100 == population["hid"]).all()
+    assert (population["cid"] == population["hid"]).all()
+    assert population["syear"].isin([2020, 2021]).all()
+
+
+def test_generate_assert_written_data_can_be_cleaned(
+    clean_modules_directory: Path, tmp_path: Path
+):
+    (path,) = synthetic.generate(
+        n_persons=100,
+        data_root=tmp_path / "data",
+        soep_version="V0",
+        survey_years=[2020, 2021],
+        clean_modules_directory=clean_modules_directory,
+    )
+    with pd.io.stata.StataReader(path, convert_categoricals=False) as reader:
+        value_labels = reader.value_labels()
+        raw_data = reader.read().replace(value_labels)
+    script = load_script(clean_modules_directory / "mymodule.py", "clean")
+    cleaned = script.clean(raw_data)
+    assert set(cleaned["gender"].dropna()) <= {"male", "female"}
+    assert set(cleaned["married"].dropna()) == {True, False}
+    assert cleaned["income"].notna().any()
+
+
+def test_generate_assert_fails_if_files_exist(
+    clean_modules_directory: Path, tmp_path: Path
+):
+    kwargs = {
+        "n_persons": 10,
+        "data_root": tmp_path,
+        "soep_version": "V0",
+        "clean_modules_directory": clean_modules_directory,
+    }
+    synthetic.generate(**kwargs)
+    with pytest.raises(FileExistsError):
+        synthetic.generate(**kwargs)
+
+
+def test_generate_assert_fails_if_directory_contains_files(
+    clean_modules_directory: Path, tmp_path: Path
+):
+    data_directory = tmp_path / "V0"
+    data_directory.mkdir()
+    (data_directory / "raw.dta").write_bytes(b"")
+    with pytest.raises(FileExistsError, match=r"raw\.dta"):
+        synthetic.generate(
+            n_persons=10,
+            data_root=tmp_path,
+            soep_version="V0",
+            clean_modules_directory=clean_modules_directory,
+        )
+    assert [path.name for path in data_directory.iterdir()] == ["raw.dta"]
+
+
+@pytest.mark.parametrize(
+    ("dtype", "storage", "clean"),
+    [
+        ("float[pyarrow]", "labelled", object_to_float),
+        ("double[pyarrow]", "labelled", object_to_float),
+        ("int16[pyarrow]", "int", object_to_int),
+        ("int32[pyarrow]", "int", object_to_int),
+    ],
+)
+def test_make_module_assert_numbers_cleaned_to_recorded_dtype(
+    dtype: str, storage: str, clean: Callable
+):
+    population = synthetic.make_population(n_persons=100, survey_years=[2020])
+    column_specs = {
+        "pid": {"answers": [], "integer": True, "storage": "int", "dtype": None},
+        "number": {"answers": [], "integer": False, "storage": storage, "dtype": dtype},
+    }
+    data, value_labels = synthetic.make_module(column_specs, population=population)
+    raw = data["number"].astype("object").replace(value_labels.get("number", {}))
+    assert str(clean(raw).dtype) == dtype
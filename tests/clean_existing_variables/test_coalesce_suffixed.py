@@ -0,0 +1,102 @@
+import pandas as pd
+import pytest
+
+from soep_preparation.utilities.data_manipulator import (
+    coalesce_suffixed,
+    combine_first_and_make_categorical,
+)
+
+
+def _categorical(values: list, categories: list) -> pd.Series:
+    return pd.Series(
+        pd.Categorical(
+            values,
+            categories=pd.Series(categories).astype("string[pyarrow]"),
+            ordered=True,
+        )
+    )
+
+
+def test_coalesce_suffixed_assert_equal_to_combine_first():
+    data = pd.DataFrame(
+        {
+            "bmi_pequiv": pd.Series([20.5, None, None], dtype="double[pyarrow]"),
+            "bmi_pl": pd.Series([21.0, 22.0, None], dtype="double[pyarrow]"),
+            "obese_pequiv": pd.Series([False, None, None], dtype="bool[pyarrow]"),
+            "obese_pl": pd.Series([True, True, None], dtype="bool[pyarrow]"),
+        }
+    )
+    expected = pd.DataFrame(
+        {
+            "bmi": data["bmi_pequiv"].combine_first(data["bmi_pl"]),
+            "obese": data["obese_pequiv"].combine_first(data["obese_pl"]),
+        }
+    )
+    actual = coalesce_suffixed(
+        data=data, names=["bmi", "obese"], precedence=["pequiv", "pl"]
+    )
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_coalesce_suffixed_assert_precedence_of_three_suffixes():
+    data = pd.DataFrame(
+        {
+            "bmi_pl": pd.Series([None, 2.0, None, None], dtype="double[pyarrow]"),
+            "bmi_pequiv": pd.Series([1.0, 1.0, None, None], dtype="double[pyarrow]"),
+            "bmi_hl": pd.Series([3.0, 3.0, 3.0, None], dtype="double[pyarrow]"),
+        }
+    )
+    expected = pd.DataFrame(
+        {"bmi": pd.Series([1.0, 2.0, 3.0, None], dtype="double[pyarrow]")}
+    )
+    actual = coalesce_suffixed(
+        data=data, names=["bmi"], precedence=["pl", "pequiv", "hl"]
+    )
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_coalesce_suffixed_assert_variables_of_same_dtype_coalesced_together():
+    data = pd.DataFrame(
+        {
+            "bmi_pequiv": pd.Series([20.5, None, None], dtype="double[pyarrow]"),
+            "bmi_pl": pd.Series([21.0, 22.0, None], dtype="double[pyarrow]"),
+            "height_pequiv": pd.Series([None, 1.8, None], dtype="double[pyarrow]"),
+            "height_pl": pd.Series([1.7, 1.6, 1.5], dtype="double[pyarrow]"),
+            "weight_pequiv": pd.Series([None, 80, None], dtype="int16[pyarrow]"),
+            "weight_pl": pd.Series([70.0, None, 60.0], dtype="double[pyarrow]"),
+        },
+        index=[3, 1, 2],
+    )
+    names = ["bmi", "weight", "height"]
+    expected = pd.DataFrame(
+        {
+            name: data[f"{name}_pequiv"].combine_first(data[f"{name}_pl"])
+            for name in names
+        }
+    )
+    actual = coalesce_suffixed(data=data, names=names, precedence=["pequiv", "pl"])
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_coalesce_suffixed_assert_equal_to_combine_first_and_make_categorical():
+    data = pd.DataFrame(
+        {
+            "med_krebs_pequiv": _categorical(["Ja", None, None], ["Ja", "Nein"]),
+            "med_krebs_pl": _categorical(["Nein", "Nein", None], ["Ja", "Nein"]),
+        }
+    )
+    expected = combine_first_and_make_categorical(
+        series_1=data["med_krebs_pequiv"],
+        series_2=data["med_krebs_pl"],
+        ordered=True,
+    ).rename("med_krebs")
+    actual = coalesce_suffixed(
+        data=data, names=["med_krebs"], precedence=["pequiv", "pl"], ordered=True
+    )
+    pd.testing.assert_series_equal(actual["med_krebs"], expected)
+
+
+def test_coalesce_suffixed_assert_missing_column_raises():
+    data = pd.DataFrame({"bmi_pequiv": [20.5]})
+    with pytest.raises(ValueError, match="bmi_pl"):
+        coalesce_suffixed(data=data, names=["bmi"], precedence=["pequiv", "pl"])
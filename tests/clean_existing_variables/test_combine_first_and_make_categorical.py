@@ -0,0 +1,40 @@
+import pandas as pd
+
+from soep_preparation.utilities.data_manipulator import (
+    combine_first_and_make_categorical,
+    convert_to_categorical,
+)
+
+
+def _categorical(values: list, categories: list, dtype: str) -> pd.Series:
+    return pd.Series(
+        pd.Categorical(
+            values, categories=pd.Series(categories).astype(dtype), ordered=True
+        )
+    )
+
+
+def test_combine_first_and_make_categorical_assert_precedence():
+    expected = pd.Series(
+        pd.Categorical(["a", "c", None], categories=pd.Series(["a", "c"]), ordered=True)
+    )
+    sr_1 = _categorical(["a", None, None], ["b", "a"], "string[pyarrow]")
+    sr_2 = _categorical(["c", "c", None], ["c", "b"], "string[pyarrow]")
+    actual = combine_first_and_make_categorical(sr_1, sr_2, ordered=True)
+    pd.testing.assert_series_equal(actual, expected)
+
+
+def test_combine_first_and_make_categorical_assert_equal_to_general_path():
+    sr_1 = _categorical([True, None, None, False], [False, True], "bool[pyarrow]")
+    sr_2 = _categorical([False, True, None, True], [False, True], "bool[pyarrow]")
+    expected = convert_to_categorical(sr_1.combine_first(sr_2), ordered=False)
+    actual = combine_first_and_make_categorical(sr_1, sr_2, ordered=False)
+    pd.testing.assert_series_equal(actual, expected)
+
+
+def test_combine_first_and_make_categorical_assert_numerical_categories():
+    sr_1 = _categorical([1, None, None], [1, 2], "int64")
+    sr_2 = _categorical([2, 3, None], [2, 3], "int64")
+    expected = convert_to_categorical(sr_1.combine_first(sr_2), ordered=True)
+    actual = combine_first_and_make_categorical(sr_1, sr_2, ordered=True)
+    pd.testing.assert_series_equal(actual, expected)
@@ -1,6 +1,7 @@
 import pandas as pd
 
 from soep_preparation.utilities.data_manipulator import (
+    create_dummies,
     create_dummy,
 )
 
@@ -42,3 +43,50 @@ def test_create_dummy_assert_correct_bool():
     sr = pd.Series([False, True], dtype=object)
     actual = create_dummy(sr, value_for_comparison=True, comparison_type="equal")
     pd.testing.assert_series_equal(actual, expected)
+
+
+def test_create_dummy_assert_missing_kept_for_categorical():
+    expected = pd.Series([True, pd.NA, False], dtype="bool[pyarrow]")
+    sr = pd.Series(["a", None, "b"], dtype="category")
+    actual = create_dummy(series=sr, value_for_comparison="a")
+    pd.testing.assert_series_equal(actual, expected)
+
+
+def test_create_dummy_assert_startswith_for_categorical():
+    expected = pd.Series([True, False, pd.NA], dtype="bool[pyarrow]")
+    sr = pd.Series(["Beamte (mittel)", "Arbeiter", None], dtype="category")
+    actual = create_dummy(
+        series=sr, value_for_comparison="Beamte", comparison_type="startswith"
+    )
+    pd.testing.assert_series_equal(actual, expected)
+
+
+def test_create_dummies_assert_equal_to_create_dummy():
+    sr = pd.Series(["a", "b", None, "c", "a"], dtype="category")
+    conditions = {
+        "is_a": ("a", "equal"),
+        "not_b": ("b", "neq"),
+        "in_b_c": (["b", "c"], "isin"),
+    }
+    actual = create_dummies(series=sr, conditions=conditions)
+    assert list(actual.columns) == list(conditions)
+    for name, (value, comparison_type) in conditions.items():
+        expected = create_dummy(
+            series=sr, value_for_comparison=value, comparison_type=comparison_type
+        ).rename(name)
+        pd.testing.assert_series_equal(actual[name], expected)
+
+
+def test_create_dummies_assert_object_series():
+    expected = pd.DataFrame(
+        {
+            "is_true": pd.Series([False, True, pd.NA], dtype="bool[pyarrow]"),
+            "is_false": pd.Series([True, False, pd.NA], dtype="bool[pyarrow]"),
+        }
+    )
+    sr = pd.Series(["false", "true", None], dtype=object)
+    actual = create_dummies(
+        series=sr,
+        conditions={"is_true": ("true", "equal"), "is_false": ("false", "equal")},
+    )
+    pd.testing.assert_frame_equal(actual, expected)
@@ -1,9 +1,12 @@
 import pandas as pd
+import pytest
 
+from soep_preparation.config import get_metadata_dtype
 from soep_preparation.utilities.data_manipulator import (
     apply_smallest_float_dtype,
     apply_smallest_int_dtype,
     float_to_int,
+    object_to_int,
 )
 
 
@@ -54,3 +57,27 @@ def test_float_to_int_assert_code_negative_values_as_na():
     sr = pd.Series([0.0, 1.0, -1.0], dtype="float[pyarrow]")
     actual = float_to_int(series=sr, code_negative_values_as_na=True)
     pd.testing.assert_series_equal(actual, expected)
+
+
+def test_apply_smallest_int_dtype_assert_recorded_dtype():
+    expected = pd.Series([0, 1, pd.NA], dtype="int32[pyarrow]")
+    sr = pd.Series([0, 1, None], dtype=object)
+    actual = apply_smallest_int_dtype(sr, dtype="int32[pyarrow]")
+    pd.testing.assert_series_equal(actual, expected)
+
+
+def test_apply_smallest_int_dtype_assert_recorded_dtype_bounds():
+    sr = pd.Series([-1, 128])
+    with pytest.raises(ValueError, match="bounds of int8"):
+        apply_smallest_int_dtype(sr, dtype="int8[pyarrow]")
+
+
+def test_object_to_int_assert_recorded_dtype():
+    expected = pd.Series([1, pd.NA], dtype="int16[pyarrow]")
+    sr = pd.Series([1, "[-1] keine Angabe"], dtype=object)
+    actual = object_to_int(sr, dtype="int16[pyarrow]")
+    pd.testing.assert_series_equal(actual, expected)
+
+
+def test_get_metadata_dtype_falls_back_for_unknown_variable():
+    assert get_metadata_dtype("variable_not_in_mapping") is None
@@ -0,0 +1,129 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from soep_preparation.final_dataset import create_final_dataset
+from soep_preparation.utilities.dataset_cache import (
+    cache_dataset,
+    clear_cached_datasets,
+    get_request_key,
+    list_cached_datasets,
+    load_cached_dataset,
+)
+
+
+def _cache(cache_dir: Path, variables: list[str], max_bytes: int = 2**30) -> None:
+    cache_dataset(
+        pd.DataFrame({"p_id": [1, 2], "column1": [3, 4]}),
+        cache_dir=cache_dir,
+        variables=variables,
+        survey_years=[2020],
+        fingerprints={"module": "a"},
+        max_bytes=max_bytes,
+    )
+
+
+def test_get_request_key_ignores_order_of_survey_years_only():
+    assert get_request_key(["a", "b", "a"], [2021, 2020]) == get_request_key(
+        ["a", "b"], [2020, 2021]
+    )
+    assert get_request_key(["b", "a"], [2020]) != get_request_key(["a", "b"], [2020])
+
+
+def test_get_request_key_assert_backend_and_filter_value_types():
+    key = get_request_key(["a"], [2020], filters=[("x", "==", 18)])
+    assert key == get_request_key(["a"], [2020], filters=[("x", "==", 18)])
+    assert key != get_request_key(["a"], [2020], filters=[("x", "==", "18")])
+    assert key != get_request_key(["a"], [2020], filters=[("x", "==", np.int64(18))])
+    assert key != get_request_key(
+        ["a"], [2020], filters=[("x", "==", 18)], backend="pyarrow"
+    )
+
+
+def test_load_cached_dataset_assert_hit(tmp_path: Path):
+    _cache(tmp_path, variables=["column1"])
+    actual = load_cached_dataset(
+        cache_dir=tmp_path,
+        variables=["column1"],
+        survey_years=[2020],
+        fingerprints={"module": "a"},
+    )
+    expected = pd.DataFrame({"p_id": [1, 2], "column1": [3, 4]})
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_load_cached_dataset_removes_entry_of_changed_module(tmp_path: Path):
+    _cache(tmp_path, variables=["column1"])
+    actual = load_cached_dataset(
+        cache_dir=tmp_path,
+        variables=["column1"],
+        survey_years=[2020],
+        fingerprints={"module": "b"},
+    )
+    assert actual is None
+    assert list_cached_datasets(tmp_path).empty
+
+
+def test_cache_dataset_evicts_least_recently_used(tmp_path: Path):
+    _cache(tmp_path, variables=["column1"])
+    _cache(tmp_path, variables=["column2"])
+    (first,) = tmp_path.glob(f"{get_request_key(['column1'], [2020])}.pkl")
+    os.utime(first, ns=(0, 0))
+    _cache(tmp_path, variables=["column3"], max_bytes=2 * first.stat().st_size)
+    actual = list_cached_datasets(tmp_path)["variables"].tolist()
+    assert sorted(actual) == [["column2"], ["column3"]]
+
+
+def test_clear_cached_datasets_assert_keys(tmp_path: Path):
+    _cache(tmp_path, variables=["column1"])
+    _cache(tmp_path, variables=["column2"])
+    clear_cached_datasets(tmp_path, keys=[get_request_key(["column1"], [2020])])
+    assert list_cached_datasets(tmp_path)["variables"].tolist() == [["column2"]]
+    clear_cached_datasets(tmp_path)
+    assert not list(tmp_path.iterdir())
+
+
+def test_create_final_dataset_assert_cache_invalidated_by_module(tmp_path: Path):
+    module = pd.DataFrame({"p_id": [1, 2], "survey_year": [2020, 2020], "bmi": [1, 2]})
+    first = create_final_dataset(
+        modules={"pequiv_pl": module},
+        variables=["bmi"],
+        survey_years=[2020],
+        cache_dir=tmp_path,
+    )
+    cached = create_final_dataset(
+        modules={"pequiv_pl": module},
+        variables=["bmi"],
+        survey_years=[2020],
+        cache_dir=tmp_path,
+    )
+    pd.testing.assert_frame_equal(cached, first)
+    changed = create_final_dataset(
+        modules={"pequiv_pl": module.assign(bmi=[3, 4])},
+        variables=["bmi"],
+        survey_years=[2020],
+        cache_dir=tmp_path,
+    )
+    assert changed["bmi"].tolist() == [3, 4]
+    assert len(list_cached_datasets(tmp_path)) == 1
+
+
+def test_create_final_dataset_assert_cached_columns_in_request_order(tmp_path: Path):
+    module = pd.DataFrame(
+        {"p_id": [1, 2], "survey_year": [2020, 2020], "bmi": [1, 2], "age": [3, 4]}
+    )
+    create_final_dataset(
+        modules={"pequiv_pl": module},
+        variables=["bmi", "age"],
+        survey_years=[2020],
+        cache_dir=tmp_path,
+    )
+    actual = create_final_dataset(
+        modules={"pequiv_pl": module},
+        variables=["age", "bmi"],
+        survey_years=[2020],
+        cache_dir=tmp_path,
+    )
+    assert actual.columns.tolist() == ["p_id", "survey_year", "age", "bmi"]
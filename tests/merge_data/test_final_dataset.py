@@ -1,12 +1,25 @@
+from collections.abc import Callable
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
 import pytest
 
 from soep_preparation.final_dataset import (
     DatasetMergingInfo,
+    _fail_if_survey_years_not_valid,
+    _get_dataset_order,
     _get_sorted_dataset_merging_information,
     _harmonize_variables,
+    _load_modules,
     _merge_data,
+    _merge_data_with_pyarrow,
+    _push_down_filters,
+    _select_required_modules,
+    create_final_dataset,
+    create_final_datasets,
+    describe_variables,
+    export_final_dataset,
 )
 
 
@@ -80,6 +93,40 @@ def test_merge_data_assert_data(
     pd.testing.assert_frame_equal(actual, expected)
 
 
+def test_merge_data_assert_equal_to_chained_merges():
+    person_year = pd.DataFrame(
+        {
+            "p_id": [1, 1, 2, 3],
+            "survey_year": [2000, 2001, 2000, 2001],
+            "column1": [1.0, np.nan, 3.0, np.nan],
+        },
+    )
+    person_year_other = pd.DataFrame(
+        {"p_id": [1, 4], "survey_year": [2001, 2000], "column2": [True, False]},
+    )
+    person = pd.DataFrame({"p_id": [1, 2, 5], "column3": [7, 8, 9]})
+    merging_information = {
+        "person_year": {
+            "data": person_year,
+            "index_variables": ["p_id", "survey_year"],
+        },
+        "person_year_other": {
+            "data": person_year_other,
+            "index_variables": ["p_id", "survey_year"],
+        },
+        "person": {"data": person, "index_variables": ["p_id"]},
+    }
+    expected = (
+        person_year.merge(person_year_other, on=["p_id", "survey_year"], how="outer")
+        .merge(person, on="p_id", how="outer")
+        .dropna(subset=["column1", "column2", "column3"], how="all")
+        .sort_values(by=["p_id", "survey_year"])
+        .reset_index(drop=True)
+    )
+    actual = _merge_data(merging_information=merging_information)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
 def test_get_sorted_dataset_merging_information_drops_unused_and_sorts_by_index_count():
     """Modules without a requested variable are dropped; the rest are ordered by
     descending index-variable count.
@@ -97,3 +144,437 @@ def test_get_sorted_dataset_merging_information_drops_unused_and_sorts_by_index_
         survey_years=None,
     )
     assert list(actual) == ["two_indexes", "one_index"]
+
+
+def test_get_sorted_dataset_merging_information_selects_survey_years():
+    modules = {
+        "person_year": pd.DataFrame(
+            {
+                "p_id": [1, 1, 2],
+                "survey_year": [2000, 2001, 2001],
+                "column1": [1, 2, 3],
+                "other": [4, 5, 6],
+            },
+        ),
+    }
+    actual = _get_sorted_dataset_merging_information(
+        modules=modules,
+        variables=["column1"],
+        survey_years=[2001],
+    )
+    expected = pd.DataFrame(
+        {"p_id": [1, 2], "survey_year": [2001, 2001], "column1": [2, 3]},
+        index=[1, 2],
+    )
+    pd.testing.assert_frame_equal(actual["person_year"]["data"], expected)
+
+
+def test_describe_variables_assert_statistics_for_survey_years(tmp_path: Path):
+    statistics_path = tmp_path / "variable_statistics.pkl"
+    pd.DataFrame(
+        {
+            "variable": ["bmi", "bmi", "bmi", "birth_month"],
+            "survey_year": pd.array([2019, 2020, 2021, None], dtype="Int16"),
+            "n_rows": [10, 20, 30, 5],
+            "n_missing": [1, 2, 30, 1],
+            "min": [18.0, 17.0, np.nan, np.nan],
+            "max": [30.0, 35.0, np.nan, np.nan],
+            "module": ["pequiv_pl", "pequiv_pl", "pequiv_pl", "ppathl_bioedu"],
+        }
+    ).to_pickle(statistics_path)
+    actual = describe_variables(
+        variables=["p_id", "bmi", "birth_month"],
+        survey_years=[2020, 2021],
+        statistics_path=statistics_path,
+    )
+    assert actual.index.tolist() == ["bmi", "birth_month"]
+    assert actual["module"].tolist() == ["pequiv_pl", "ppathl_bioedu"]
+    assert actual["n_rows"].tolist() == [50, 5]
+    assert actual["n_non_missing"].tolist() == [18, 4]
+    assert actual.loc["bmi", ["min", "max"]].tolist() == [17.0, 35.0]
+
+
+def test_describe_variables_assert_missing_statistics_raises(tmp_path: Path):
+    with pytest.raises(FileNotFoundError, match="Run pytask"):
+        describe_variables(variables=["bmi"], statistics_path=tmp_path / "missing.pkl")
+
+
+def test_select_required_modules_selects_loaded_and_modules_of_variables(
+    tmp_path: Path,
+):
+    modules = {
+        "pequiv_pl": tmp_path / "pequiv_pl.pkl",
+        "pequiv": tmp_path / "pequiv.pkl",
+        "loaded": pd.DataFrame({"p_id": [1], "column1": [2]}),
+    }
+    actual = _select_required_modules(modules=modules, variables=["bmi"])
+    assert list(actual) == ["pequiv_pl", "loaded"]
+
+
+def test_load_modules_projects_loaded_modules(tmp_path: Path):
+    pequiv_pl_path = tmp_path / "pequiv_pl.pkl"
+    pd.DataFrame(
+        {"p_id": [1], "survey_year": [2020], "bmi": [20.0], "other": [1]}
+    ).to_pickle(pequiv_pl_path)
+    actual = _load_modules(modules={"pequiv_pl": pequiv_pl_path}, variables=["bmi"])
+    assert actual["pequiv_pl"].columns.tolist() == ["p_id", "survey_year", "bmi"]
+
+
+def test_export_final_dataset_assert_partitions_equal_dataset(tmp_path: Path):
+    modules = {
+        "person_year": pd.DataFrame(
+            {
+                "p_id": [1, 1, 2],
+                "survey_year": [2000, 2001, 2001],
+                "bmi": [20.0, 21.0, 22.0],
+            },
+        ),
+        "person": pd.DataFrame({"p_id": [1, 2, 3], "birth_month": [4, 5, 6]}),
+    }
+    variables = ["bmi", "birth_month"]
+    expected = create_final_dataset(
+        modules=modules, variables=variables, survey_years=[2000, 2001]
+    )
+    without_survey_year = export_final_dataset(
+        modules=modules,
+        variables=variables,
+        survey_years=[2000, 2001],
+        out_dir=tmp_path,
+    )
+    partitions = pd.read_parquet(tmp_path).astype({"survey_year": "int64"})
+    actual = (
+        pd.concat([partitions, without_survey_year])
+        .sort_values(by=["p_id", "survey_year"])
+        .reset_index(drop=True)[expected.columns]
+    )
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    assert without_survey_year["p_id"].tolist() == [3]
+
+
+def test_merge_data_with_pyarrow_assert_equal_to_pandas(
+    merging_information: dict[str, DatasetMergingInfo],
+):
+    expected = _merge_data(merging_information=merging_information)
+    actual = _merge_data_with_pyarrow(merging_information=merging_information)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_merge_data_with_pyarrow_assert_dtypes_and_missing_keys():
+    person_year = pd.DataFrame(
+        {
+            "p_id": pd.array([1, 2, 2], dtype="int32[pyarrow]"),
+            "survey_year": pd.array([2000, 2000, 2001], dtype="int16[pyarrow]"),
+            "hh_id": pd.array([1, None, 2], dtype="int16[pyarrow]"),
+            "column1": pd.Categorical(["a", "b", None], ordered=True),
+        },
+    )
+    person = pd.DataFrame(
+        {
+            "p_id": pd.array([2, 3], dtype="int32[pyarrow]"),
+            "hh_id": pd.array([None, 3], dtype="int16[pyarrow]"),
+            "column2": pd.array([True, False], dtype="bool[pyarrow]"),
+        },
+    )
+    merging_information = {
+        "person_year": {
+            "data": person_year,
+            "index_variables": ["hh_id", "p_id", "survey_year"],
+        },
+        "person": {"data": person, "index_variables": ["hh_id", "p_id"]},
+    }
+    expected = _merge_data(merging_information=merging_information)
+    actual = _merge_data_with_pyarrow(merging_information=merging_information)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_create_final_dataset_assert_invalid_backend_raises():
+    with pytest.raises(ValueError, match="backend"):
+        create_final_dataset(
+            modules={}, variables=["bmi"], survey_years=[2020], backend="polars"
+        )
+
+
+def test_push_down_filters_restricts_modules_sharing_index_variables():
+    merging_information = {
+        "person_year": {
+            "data": pd.DataFrame(
+                {
+                    "p_id": [1, 1, 2],
+                    "survey_year": [2000, 2001, 2001],
+                    "age": [30, 31, 50],
+                },
+            ),
+            "index_variables": ["p_id", "survey_year"],
+        },
+        "person": {
+            "data": pd.DataFrame({"p_id": [1, 2, 3], "birth_month": [4, 5, 6]}),
+            "index_variables": ["p_id"],
+        },
+    }
+    actual = _push_down_filters(merging_information, filters=[("age", "<", 40)])
+    assert actual["person_year"]["data"]["survey_year"].tolist() == [2000, 2001]
+    assert actual["person"]["data"]["p_id"].tolist() == [1]
+
+
+def test_create_final_dataset_assert_filters_equal_to_filtering_dataset():
+    modules = {
+        "person_year": pd.DataFrame(
+            {
+                "p_id": [1, 1, 2, 3],
+                "survey_year": [2000, 2001, 2001, 2001],
+                "bmi": [20.0, 30.0, 25.0, np.nan],
+            },
+        ),
+        "person": pd.DataFrame({"p_id": [1, 2, 4], "birth_month": [4, 5, 6]}),
+    }
+    dataset = create_final_dataset(
+        modules=modules, variables=["bmi", "birth_month"], survey_years=[2000, 2001]
+    )
+    expected = dataset.loc[dataset["bmi"] >= 25].reset_index(drop=True)  # noqa: PLR2004
+    actual = create_final_dataset(
+        modules=modules,
+        variables=["bmi", "birth_month"],
+        survey_years=[2000, 2001],
+        filters=[("bmi", ">=", 25)],
+    )
+    # Fewer rows without a survey year are merged, so numpy dtypes are not upcast.
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_create_final_dataset_assert_invalid_filter_operator_raises():
+    with pytest.raises(ValueError, match="operator"):
+        create_final_dataset(
+            modules={},
+            variables=["bmi"],
+            survey_years=[2020],
+            filters=[("bmi", "~", 25)],
+        )
+
+
+def test_create_final_datasets_assert_equal_to_create_final_dataset():
+    modules = {
+        "person_year": pd.DataFrame(
+            {
+                "p_id": [1, 1, 2, 3],
+                "survey_year": [2000, 2001, 2001, 2001],
+                "bmi": [20.0, 30.0, 25.0, np.nan],
+                "age": [30, 31, 50, 40],
+            },
+        ),
+        "person": pd.DataFrame({"p_id": [1, 2, 4], "birth_month": [4, 5, 6]}),
+    }
+    requests = {
+        "bmi": {"variables": ["bmi"], "survey_years": [2000, 2001]},
+        "bmi_age": {"variables": ["age", "bmi"], "survey_years": [2000, 2001]},
+        "all": {
+            "variables": ["bmi", "age", "birth_month"],
+            "survey_years": [2001, 2000],
+        },
+        "birth_month": {"variables": ["birth_month"]},
+        "filtered": {
+            "variables": ["birth_month", "bmi"],
+            "survey_years": [2001],
+            "filters": [("age", "<", 45)],
+        },
+    }
+    actual = create_final_datasets(modules=modules, requests=requests)
+    assert list(actual) == list(requests)
+    for name, request in requests.items():
+        expected = create_final_dataset(modules=modules, **request)
+        pd.testing.assert_frame_equal(actual[name], expected)
+
+
+def test_create_final_dataset_assert_invalid_survey_year_raises_before_loading(
+    tmp_path: Path,
+):
+    with pytest.raises(ValueError, match="Expected survey years"):
+        create_final_dataset(
+            modules={"pequiv_pl": tmp_path / "missing.pkl"},
+            variables=["bmi"],
+            survey_years=[2020, 1900],
+        )
+
+
+def test_fail_if_survey_years_not_valid_assert_intervals():
+    _fail_if_survey_years_not_valid(
+        survey_years=[1984, 2000, 2024], valid_survey_years=[[1984, 1990], [2000, 2024]]
+    )
+    with pytest.raises(ValueError, match="1984-1990, 2000-2024"):
+        _fail_if_survey_years_not_valid(
+            survey_years=[1995], valid_survey_years=[[1984, 1990], [2000, 2024]]
+        )
+
+
+def test_get_dataset_order_assert_sorted_keys_keep_their_order():
+    keys = pd.DataFrame(
+        {"p_id": [1, 1, 2, 3], "survey_year": [2000, 2001, 2000, 2000]},
+    )
+    has_value = np.array([True, False, True, True])
+    actual = _get_dataset_order(keys, has_value=has_value, by=["p_id", "survey_year"])
+    assert actual.tolist() == [0, 2, 3]
+    actual = _get_dataset_order(keys, has_value=has_value, by=["survey_year", "p_id"])
+    assert actual.tolist() == [0, 2, 3]
+    actual = _get_dataset_order(
+        keys.iloc[::-1].reset_index(drop=True),
+        has_value=has_value[::-1],
+        by=["p_id", "survey_year"],
+    )
+    assert actual.tolist() == [3, 1, 0]
+    actual = _get_dataset_order(
+        keys.iloc[::-1], has_value=has_value[::-1], by=["p_id", "survey_year"]
+    )
+    assert actual.tolist() == [3, 1, 0]
+
+
+def test_create_final_dataset_assert_single_unsorted_module_with_survey_years():
+    module = pd.DataFrame(
+        {
+            "p_id": [2, 2, 1, 1],
+            "survey_year": [2002, 2001, 2001, 2000],
+            "age": [41, 40, 31, 30],
+        },
+    )
+    actual = create_final_dataset(
+        modules={"pequiv": module}, variables=["age"], survey_years=[2000, 2001]
+    )
+    expected = pd.DataFrame(
+        {"p_id": [1, 1, 2], "survey_year": [2000, 2001, 2001], "age": [30, 31, 40]},
+    )
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_merge_data_assert_missing_keys_in_unsorted_module():
+    person_year = pd.DataFrame(
+        {
+            "hh_id": [np.nan, 1.0, 2.0],
+            "p_id": [3, 1, 2],
+            "survey_year": [2001, 2001, 2001],
+            "column1": [3, 1, 2],
+        },
+        index=[7, 5, 6],
+    )
+    person = pd.DataFrame({"p_id": [2, 1], "column2": [20, 10]}, index=[4, 3])
+    merging_information = {
+        "person_year": {
+            "data": person_year,
+            "index_variables": ["hh_id", "p_id", "survey_year"],
+        },
+        "person": {"data": person, "index_variables": ["p_id"]},
+    }
+    expected = pd.DataFrame(
+        {
+            "hh_id": [1.0, 2.0, np.nan],
+            "p_id": [1, 2, 3],
+            "survey_year": [2001, 2001, 2001],
+            "column1": [1, 2, 3],
+            "column2": [10.0, 20.0, np.nan],
+        },
+    )
+    actual = _merge_data(merging_information=merging_information)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+@pytest.mark.parametrize("backend", ["pandas", "pyarrow"])
+def test_create_final_dataset_assert_modules_without_shared_keys_raise(backend: str):
+    modules = {
+        "bioedu": pd.DataFrame({"p_id": [1, 2], "birth_month_bioedu": [1, 2]}),
+        "hl": pd.DataFrame(
+            {
+                "hh_id": [1, 2],
+                "survey_year": [2010, 2010],
+                "arbeitslosengeld_2_m_hh_hl": [1.0, 2.0],
+            },
+        ),
+    }
+    with pytest.raises(ValueError, match="bioedu shares no index variables"):
+        create_final_dataset(
+            modules=modules,
+            variables=["birth_month_bioedu", "arbeitslosengeld_2_m_hh_hl"],
+            survey_years=[2010],
+            backend=backend,
+        )
+
+
+@pytest.mark.parametrize("backend", ["pandas", "pyarrow"])
+def test_create_final_dataset_assert_module_without_rows_in_survey_years(
+    backend: str,
+):
+    modules = {
+        "pequiv": pd.DataFrame(
+            {"p_id": [1, 2], "survey_year": [2012, 2012], "age": [30, 40]},
+        ),
+        "pl": pd.DataFrame(
+            {"p_id": [1, 2], "survey_year": [2010, 2011], "bmi": [20.0, 25.0]},
+        ),
+    }
+    actual = create_final_dataset(
+        modules=modules, variables=["age", "bmi"], survey_years=[2012], backend=backend
+    )
+    assert actual["age"].tolist() == [30, 40]
+    assert actual["bmi"].isna().all()
+
+
+def test_merge_data_with_pyarrow_assert_order_of_duplicated_keys():
+    children = pd.DataFrame(
+        {
+            "p_id": [2, 1, 2, 1, 2],
+            "birth_year_child": [2005, 1999, 2001, 1995, 2003],
+        },
+    )
+    person = pd.DataFrame({"p_id": [1, 2, 3], "birth_month": [4, 5, 6]})
+    merging_information = {
+        "person": {"data": person, "index_variables": ["p_id"]},
+        "children": {"data": children, "index_variables": ["p_id"]},
+    }
+    expected = _merge_data(merging_information=merging_information)
+    actual = _merge_data_with_pyarrow(merging_information=merging_information)
+    pd.testing.assert_frame_equal(actual, expected)
+    assert actual["birth_year_child"].tolist()[:4] == [1999, 1995, 2005, 2001]
+
+
+@pytest.mark.parametrize("backend", ["pandas", "pyarrow"])
+def test_create_final_dataset_assert_filters_matching_nothing_give_empty_dataset(
+    backend: str,
+):
+    modules = {
+        "person_year": pd.DataFrame(
+            {"p_id": [1, 2], "survey_year": [2000, 2000], "bmi": [20.0, 25.0]},
+        ),
+        "person": pd.DataFrame({"p_id": [1, 2], "birth_month": [4, 5]}),
+    }
+    actual = create_final_dataset(
+        modules=modules,
+        variables=["bmi", "birth_month"],
+        survey_years=[2000],
+        filters=[("bmi", ">", 30)],
+        backend=backend,
+    )
+    assert actual.empty
+    assert actual.columns.tolist() == ["p_id", "survey_year", "bmi", "birth_month"]
+
+
+@pytest.mark.parametrize("merge_data", [_merge_data, _merge_data_with_pyarrow])
+def test_merge_data_assert_columns_in_order_of_modules(merge_data: Callable):
+    modules = {
+        "household_year": pd.DataFrame(
+            {"hh_id": [1, 2], "survey_year": [2000, 2000], "rent": [500, 600]}
+        ),
+        "person_year": pd.DataFrame(
+            {"p_id": [1, 2], "survey_year": [2000, 2000], "bmi": [20.0, 25.0]}
+        ),
+        "household_year_2": pd.DataFrame(
+            {"hh_id": [1, 2], "survey_year": [2000, 2000], "size": [1, 2]}
+        ),
+    }
+    merging_information = _get_sorted_dataset_merging_information(
+        modules=modules, variables=["rent", "bmi", "size"], survey_years=None
+    )
+    actual = merge_data(merging_information=merging_information)
+    assert actual.columns.tolist() == [
+        "hh_id",
+        "survey_year",
+        "rent",
+        "p_id",
+        "bmi",
+        "size",
+    ]
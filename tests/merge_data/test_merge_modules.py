@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+from soep_preparation.utilities.merging import merge_modules, plan_merge
+
+
+@pytest.fixture
+def modules() -> dict[str, pd.DataFrame]:
+    person_years = pd.DataFrame(
+        {
+            "p_id": pd.Series([10, 10, 11, 20, 30], dtype="int32[pyarrow]"),
+            "survey_year": pd.Series([2020, 2021, 2020, 2020, 2021], dtype="int16"),
+            "hh_id": pd.Series([1, 1, 1, 2, 3], dtype="int32[pyarrow]"),
+            "income_pl": [1.0, 2.0, 3.0, 4.0, 5.0],
+        }
+    )
+    households = pd.DataFrame(
+        {
+            "hh_id": pd.Series([1, 1, 4], dtype="int32[pyarrow]"),
+            "survey_year": pd.Series([2020, 2021, 2020], dtype="int16"),
+            "rent_hl": pd.Series([500, 600, 700], dtype="int16[pyarrow]"),
+        }
+    )
+    persons = pd.DataFrame(
+        {
+            "p_id": pd.Series([10, 20, 40], dtype="int32[pyarrow]"),
+            "birth_month_bioedu": [1, 2, 3],
+        }
+    )
+    return {"bioedu": persons, "hl": households, "pl": person_years}
+
+
+def test_plan_merge_assert_largest_first_then_most_shared_keys(
+    modules: dict[str, pd.DataFrame],
+):
+    expected = [
+        ("pl", []),
+        ("hl", ["survey_year", "hh_id"]),
+        ("bioedu", ["p_id"]),
+    ]
+    assert plan_merge(modules) == expected
+
+
+def test_merge_modules_assert_equal_to_pairwise_merges(
+    modules: dict[str, pd.DataFrame],
+):
+    expected = pd.merge(
+        pd.merge(
+            modules["pl"], modules["hl"], on=["survey_year", "hh_id"], how="outer"
+        ),
+        modules["bioedu"],
+        on="p_id",
+        how="outer",
+    )
+    actual = merge_modules(modules)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_merge_modules_assert_projection(modules: dict[str, pd.DataFrame]):
+    modules["pl"]["other_pl"] = 0.0
+    actual = merge_modules(modules, columns={"pl": ["income_pl"], "bioedu": []})
+    assert "other_pl" not in actual.columns
+    assert "birth_month_bioedu" not in actual.columns
+    assert {"income_pl", "rent_hl", "p_id", "hh_id"} <= set(actual.columns)
+
+
+def test_merge_modules_assert_no_shared_keys_raises(
+    modules: dict[str, pd.DataFrame],
+):
+    with pytest.raises(ValueError, match="share no key columns"):
+        merge_modules({"bioedu": modules["bioedu"], "hl": modules["hl"]})
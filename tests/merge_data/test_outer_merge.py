@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from soep_preparation.utilities.merging import (
+    get_key_columns,
+    is_sorted_by,
+    outer_merge,
+    sort_by_key_columns,
+)
+
+
+@pytest.fixture
+def person_years() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "hh_id": pd.Series([2, 1, 1, 1, 3], dtype="int32[pyarrow]"),
+            "p_id": pd.Series([20, 10, 10, 11, 30], dtype="int32[pyarrow]"),
+            "survey_year": pd.Series([2020, 2021, 2020, 2020, 2021], dtype="int16"),
+            "income": [1.0, 2.0, 3.0, np.nan, 5.0],
+            "status": pd.Categorical(["a", "b", "a", "b", "a"]),
+        }
+    )
+
+
+@pytest.fixture
+def households() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "hh_id": pd.Series([1, 1, 4], dtype="int32[pyarrow]"),
+            "survey_year": pd.Series([2020, 2021, 2020], dtype="int16"),
+            "rent": pd.Series([500, 600, 700], dtype="int16[pyarrow]"),
+            "owner": [True, False, True],
+        }
+    )
+
+
+def test_get_key_columns_assert_entity_then_survey_year(
+    person_years: pd.DataFrame, households: pd.DataFrame
+):
+    assert get_key_columns(person_years) == ["p_id", "survey_year", "hh_id"]
+    assert get_key_columns(households) == ["hh_id", "survey_year"]
+    assert get_key_columns(pd.DataFrame({"x": [1]})) == []
+
+
+def test_sort_by_key_columns_assert_sorted(person_years: pd.DataFrame):
+    actual = sort_by_key_columns(person_years)
+    assert is_sorted_by(data=actual, keys=["p_id", "survey_year", "hh_id"])
+    assert actual["p_id"].tolist() == [10, 10, 11, 20, 30]
+    assert actual["survey_year"].tolist() == [2020, 2021, 2020, 2020, 2021]
+    assert actual.index.equals(pd.RangeIndex(5))
+
+
+@pytest.mark.parametrize(
+    "keys", [["p_id", "survey_year", "hh_id"], ["hh_id", "p_id"], ["survey_year"]]
+)
+def test_is_sorted_by_assert_equal_to_sorting(
+    person_years: pd.DataFrame, keys: list[str]
+):
+    for data in [person_years, sort_by_key_columns(person_years)]:
+        expected = data.sort_values(by=keys, kind="stable").index.equals(data.index)
+        assert is_sorted_by(data=data, keys=keys) == expected
+
+
+@pytest.mark.parametrize("presort", [True, False])
+@pytest.mark.parametrize("on", [["hh_id", "survey_year"], ["survey_year", "hh_id"]])
+def test_outer_merge_assert_equal_to_pd_merge(
+    person_years: pd.DataFrame,
+    households: pd.DataFrame,
+    on: list[str],
+    presort: bool,
+):
+    left, right = households, person_years
+    if presort:
+        left = left.sort_values(on, ignore_index=True)
+        right = right.sort_values(on, ignore_index=True)
+    expected = pd.merge(left=left, right=right, on=on, how="outer")
+    actual = outer_merge(left=left, right=right, on=on)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_outer_merge_assert_single_key_as_string(households: pd.DataFrame):
+    left = households.drop_duplicates("hh_id")[["hh_id", "rent"]]
+    right = pd.DataFrame({"hh_id": pd.Series([4, 5], dtype="int32[pyarrow]")})
+    expected = pd.merge(left=left, right=right, on="hh_id", how="outer")
+    actual = outer_merge(left=left, right=right, on="hh_id")
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_outer_merge_assert_many_to_many_falls_back(person_years: pd.DataFrame):
+    left = person_years[["p_id", "income"]]
+    right = person_years[["p_id", "status"]].sort_values("p_id")
+    expected = pd.merge(left=left, right=right, on="p_id", how="outer")
+    actual = outer_merge(left=left, right=right, on="p_id")
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_outer_merge_assert_fails_if_key_missing(
+    person_years: pd.DataFrame, households: pd.DataFrame
+):
+    with pytest.raises(ValueError, match="p_id"):
+        outer_merge(left=households, right=person_years, on="p_id")
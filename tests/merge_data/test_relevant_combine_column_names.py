@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pytest
+
+from soep_preparation.utilities.general import get_relevant_combine_column_names
+
+SCRIPT = '''
+import pandas as pd
+
+
+def combine(pequiv: pd.DataFrame, pl: pd.DataFrame) -> pd.DataFrame:
+    """Docstring mentioning "not_a_column"."""
+    merged = pd.merge(pequiv[["p_id", "bmi_pequiv"]], pl, on="p_id", how="outer")
+    out = pd.DataFrame(index=merged.index)
+    # merged["commented_column"]
+    out["bmi"] = merged["bmi_pequiv"].combine_first(merged["bmi_pl"])
+    out = out.loc[out["bmi"] > 0]
+    return out
+'''
+
+
+def _write_script(tmp_path: Path, content: str) -> Path:
+    script_path = tmp_path / "pequiv_pl.py"
+    script_path.write_text(content, encoding="utf-8")
+    return script_path
+
+
+def test_get_relevant_combine_column_names_assert_literals(tmp_path: Path):
+    actual = get_relevant_combine_column_names(_write_script(tmp_path, SCRIPT))
+    assert "bmi_pequiv" in actual
+    assert "bmi_pl" in actual
+    assert "not_a_column" not in actual
+    assert "commented_column" not in actual
+
+
+@pytest.mark.parametrize(
+    "dynamic_read",
+    ['merged[f"bmi_{name}"]', "merged[name]"],
+)
+def test_get_relevant_combine_column_names_assert_none_if_dynamic(
+    tmp_path: Path, dynamic_read: str
+):
+    content = SCRIPT.replace(
+        "    return out\n",
+        f'    for name in ["pequiv", "pl"]:\n        out[name] = {dynamic_read}\n'
+        "    return out\n",
+    )
+    assert get_relevant_combine_column_names(_write_script(tmp_path, content)) is None
+
+
+def test_get_relevant_combine_column_names_assert_coalesced_columns(
+    tmp_path: Path,
+):
+    content = SCRIPT.replace(
+        "    return out\n",
+        "    return coalesce_suffixed(\n"
+        '        data=merged, names=["obese"], precedence=["pequiv", "pl"]\n'
+        "    )\n",
+    )
+    actual = get_relevant_combine_column_names(_write_script(tmp_path, content))
+    assert "obese_pequiv" in actual
+    assert "obese_pl" in actual
+
+
+def test_get_relevant_combine_column_names_assert_none_if_dynamic_suffixes(
+    tmp_path: Path,
+):
+    content = SCRIPT.replace(
+        "    return out\n",
+        '    return coalesce_suffixed(merged, ["obese"], precedence=suffixes)\n',
+    )
+    assert get_relevant_combine_column_names(_write_script(tmp_path, content)) is None
@@ -10,7 +10,11 @@ from soep_preparation.create_metadata.task import _fail_if_mapping_changed
 def test_new_variable():
     """Test error when new variable is added."""
     new_mapping = {
-        "var1": {"module": "test_module", "dtype": "int64", "survey_years": [2020]}
+        "var1": {
+            "module": "test_module",
+            "dtype": "int64",
+            "survey_years": [[2020, 2020]],
+        }
     }
     existing_mapping = {}
 
@@ -26,7 +30,11 @@ def test_removed_variable():
     """Test error when variable is removed."""
     new_mapping = {}
     existing_mapping = {
-        "var1": {"module": "test_module", "dtype": "int64", "survey_years": [2020]}
+        "var1": {
+            "module": "test_module",
+            "dtype": "int64",
+            "survey_years": [[2020, 2020]],
+        }
     }
 
     with pytest.raises(ValueError, match="removed"):
@@ -40,10 +48,18 @@ def test_removed_variable():
 def test_dtype_changed():
     """Test error when dtype changes."""
     new_mapping = {
-        "var1": {"module": "test_module", "dtype": "float64", "survey_years": [2020]}
+        "var1": {
+            "module": "test_module",
+            "dtype": "float64",
+            "survey_years": [[2020, 2020]],
+        }
     }
     existing_mapping = {
-        "var1": {"module": "test_module", "dtype": "int64", "survey_years": [2020]}
+        "var1": {
+            "module": "test_module",
+            "dtype": "int64",
+            "survey_years": [[2020, 2020]],
+        }
     }
 
     with pytest.raises(ValueError, match="dtype changed"):
@@ -60,11 +76,15 @@ def test_new_survey_years():
         "var1": {
             "module": "test_module",
             "dtype": "int64",
-            "survey_years": [2020, 2021],
+            "survey_years": [[2020, 2021]],
         }
     }
     existing_mapping = {
-        "var1": {"module": "test_module", "dtype": "int64", "survey_years": [2020]}
+        "var1": {
+            "module": "test_module",
+            "dtype": "int64",
+            "survey_years": [[2020, 2020]],
+        }
     }
 
     with pytest.raises(ValueError, match="new survey years"):
@@ -78,13 +98,17 @@ def test_new_survey_years():
 def test_removed_survey_years():
     """Test error when survey years are removed."""
     new_mapping = {
-        "var1": {"module": "test_module", "dtype": "int64", "survey_years": [2020]}
+        "var1": {
+            "module": "test_module",
+            "dtype": "int64",
+            "survey_years": [[2020, 2020]],
+        }
     }
     existing_mapping = {
         "var1": {
             "module": "test_module",
             "dtype": "int64",
-            "survey_years": [2020, 2021],
+            "survey_years": [[2020, 2021]],
         }
     }
 
@@ -102,14 +126,14 @@ def test_all_errors_together():
         "var1": {
             "module": "test_module",
             "dtype": "float64",
-            "survey_years": [2020, 2022],
+            "survey_years": [[2020, 2020], [2022, 2022]],
         }
     }
     existing_mapping = {
         "var1": {
             "module": "test_module",
             "dtype": "int64",
-            "survey_years": [2020, 2021],
+            "survey_years": [[2020, 2021]],
         }
     }
 
@@ -0,0 +1,70 @@
+"""Test loading the metadata mapping through its cache."""
+
+import hashlib
+import pickle
+from pathlib import Path
+
+import pytest
+
+from soep_preparation import config
+from soep_preparation.create_metadata import task as metadata_task
+from soep_preparation.create_metadata.task import _calculate_hash
+
+
+@pytest.fixture
+def metadata_paths(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    metadata_path = tmp_path / "mapping.yaml"
+    metadata_path.write_text(
+        "---\nvar1:\n  dtype: int64\n  module: pl\n  survey_years: null\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(config, "METADATA_PATH", metadata_path)
+    monkeypatch.setattr(config, "_METADATA_CACHE_PATH", tmp_path / "cache.pkl")
+    return metadata_path
+
+
+def test_metadata_parsed_and_cached(metadata_paths: Path):
+    """Test the YAML file is parsed and the result cached."""
+    expected = {"var1": {"dtype": "int64", "module": "pl", "survey_years": None}}
+    assert config.get_metadata.__wrapped__() == expected
+    digest, cached = pickle.loads(  # noqa: S301
+        (metadata_paths.parent / "cache.pkl").read_bytes()
+    )
+    assert digest == hashlib.sha256(metadata_paths.read_bytes()).hexdigest()
+    assert cached == expected
+
+
+def test_metadata_loaded_from_cache(metadata_paths: Path):
+    """Test a cache matching the YAML file is used instead of parsing it."""
+    digest = hashlib.sha256(metadata_paths.read_bytes()).hexdigest()
+    (metadata_paths.parent / "cache.pkl").write_bytes(
+        pickle.dumps((digest, {"from_cache": {}}))
+    )
+    assert config.get_metadata.__wrapped__() == {"from_cache": {}}
+
+
+def test_metadata_reparsed_if_file_changed(metadata_paths: Path):
+    """Test a stale cache is ignored once the YAML file changes."""
+    config.get_metadata.__wrapped__()
+    metadata_paths.write_text(
+        "---\nvar2:\n  dtype: bool\n  module: pl\n  survey_years: null\n",
+        encoding="utf-8",
+    )
+    assert list(config.get_metadata.__wrapped__()) == ["var2"]
+
+
+def test_metadata_attribute_is_loaded_mapping():
+    """Test `config.METADATA` gives the loaded mapping."""
+    assert config.METADATA is config.get_metadata()
+
+
+def test_metadata_node_hash_follows_yaml_file(
+    metadata_paths: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test the hash of the metadata node changes with the YAML file only."""
+    monkeypatch.setattr(metadata_task, "METADATA_PATH", metadata_paths)
+    metadata = config.get_metadata.__wrapped__()
+    before = _calculate_hash(metadata)
+    assert _calculate_hash({}) == before
+    metadata_paths.write_text("---\n", encoding="utf-8")
+    assert _calculate_hash(metadata) != before
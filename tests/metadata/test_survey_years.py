@@ -0,0 +1,56 @@
+"""Test the interval encoding of survey years."""
+
+import pytest
+
+from soep_preparation.utilities.survey_years import (
+    from_intervals,
+    is_in_intervals,
+    subtract_intervals,
+    to_intervals,
+)
+
+
+def test_to_intervals_merges_consecutive_years():
+    """Test consecutive years are merged into one interval."""
+    years = [2013, 1985, 1984, 2024, 1986, 2014, 1984]
+    assert to_intervals(years) == [[1984, 1986], [2013, 2014], [2024, 2024]]
+
+
+def test_to_intervals_of_no_years():
+    """Test no years are encoded as no intervals."""
+    assert to_intervals([]) == []
+
+
+def test_from_intervals_inverts_to_intervals():
+    """Test decoding the intervals gives the sorted unique years."""
+    years = [2001, 1999, 2000, 2010, 2012]
+    assert from_intervals(to_intervals(years)) == sorted(years)
+
+
+@pytest.mark.parametrize(
+    ("year", "expected"),
+    [(1983, False), (1984, True), (2011, True), (2012, False), (2024, True)],
+)
+def test_is_in_intervals(year: int, expected: bool):
+    """Test membership at and between interval bounds."""
+    assert is_in_intervals(year, [[1984, 2011], [2013, 2024]]) is expected
+
+
+@pytest.mark.parametrize(
+    ("intervals", "other", "expected"),
+    [
+        ([[1984, 2024]], [[2000, 2005]], [[1984, 1999], [2006, 2024]]),
+        ([[1984, 2000]], [[1980, 1990], [1995, 2010]], [[1991, 1994]]),
+        ([[1984, 1990], [2000, 2005]], [], [[1984, 1990], [2000, 2005]]),
+        ([[2000, 2005]], [[1984, 2024]], []),
+        ([[2000, 2005], [2010, 2012]], [[2003, 2011]], [[2000, 2002], [2012, 2012]]),
+    ],
+)
+def test_subtract_intervals_equal_to_set_difference(
+    intervals: list[list[int]], other: list[list[int]], expected: list[list[int]]
+):
+    """Test the difference of intervals matches the difference of years."""
+    assert subtract_intervals(intervals, other) == expected
+    assert from_intervals(expected) == sorted(
+        set(from_intervals(intervals)) - set(from_intervals(other))
+    )
@@ -0,0 +1,72 @@
+"""Test _get_variable_metadata function."""
+
+import pandas as pd
+
+from soep_preparation.create_metadata.task import (
+    _create_variable_statistics,
+    _get_statistics,
+    _get_variable_metadata,
+)
+from soep_preparation.utilities.survey_years import to_intervals
+
+
+def test_survey_years_equal_to_dropna_per_variable():
+    """Test survey years match the years with non-missing values per variable."""
+    module = pd.DataFrame(
+        {
+            "p_id": [1, 1, 2, 2, 3],
+            "survey_year": pd.Series(
+                [2020, 2021, 2020, 2022, None], dtype="int16[pyarrow]"
+            ),
+            "income": pd.Series([1.0, None, None, 4.0, 5.0], dtype="double[pyarrow]"),
+            "status": pd.Categorical(["a", None, "b", None, "a"]),
+            "never_observed": pd.Series([None] * 5, dtype="bool[pyarrow]"),
+        }
+    )
+    metadata = _get_variable_metadata(module)
+    for variable in ["income", "status", "never_observed"]:
+        expected = to_intervals(
+            module[["survey_year", variable]].dropna()["survey_year"]
+        )
+        assert metadata[variable]["survey_years"] == expected
+    assert metadata["income"]["survey_years"] == [[2020, 2020], [2022, 2022]]
+    assert "p_id" not in metadata
+
+
+def test_survey_years_none_without_survey_year():
+    """Test survey years are None for modules without survey year."""
+    module = pd.DataFrame({"p_id": [1, 2], "birth_month": [3, None]})
+    assert _get_variable_metadata(module)["birth_month"]["survey_years"] is None
+
+
+def test_statistics_per_survey_year():
+    """Test row counts, missing counts, and ranges per variable and survey year."""
+    module = pd.DataFrame(
+        {
+            "p_id": [1, 1, 2, 2],
+            "survey_year": pd.Series([2020, 2021, 2020, 2021], dtype="int16[pyarrow]"),
+            "income": pd.Series([1.0, None, 3.0, 4.0], dtype="double[pyarrow]"),
+            "status": pd.Categorical(["a", None, None, None]),
+        }
+    )
+    actual = _get_statistics(module).set_index(["variable", "survey_year"])
+    assert actual["n_rows"].tolist() == [2, 2, 2, 2]
+    assert actual["n_missing"].tolist() == [0, 1, 1, 2]
+    assert actual.loc["income", "min"].tolist() == [1.0, 4.0]
+    assert actual.loc["income", "max"].tolist() == [3.0, 4.0]
+    assert actual.loc["status", "min"].isna().all()
+
+
+def test_variable_statistics_without_modules():
+    """Test the statistics of no modules are empty with the statistics columns."""
+    actual = _create_variable_statistics({})
+    assert actual.empty
+    assert actual.columns.tolist() == [
+        "variable",
+        "survey_year",
+        "n_rows",
+        "n_missing",
+        "min",
+        "max",
+        "module",
+    ]
@@ -0,0 +1,53 @@
+"""Test _write_mapping_if_changed function."""
+
+import os
+from pathlib import Path
+
+import yaml
+
+from soep_preparation.create_metadata.task import _write_mapping_if_changed
+
+MAPPING = {
+    "var1": {"module": "test_module", "dtype": "int64", "survey_years": [2020]},
+    "var2": {"module": "test_module", "dtype": "float64", "survey_years": None},
+}
+
+
+def test_mapping_written_if_missing(tmp_path: Path):
+    """Test the YAML file is written and loads as the mapping."""
+    out_path = tmp_path / "mapping.yaml"
+    _write_mapping_if_changed(mapping=MAPPING, out_path=out_path)
+    content = out_path.read_text(encoding="utf-8")
+    assert content.startswith("---")
+    assert yaml.safe_load(content) == MAPPING
+
+
+def test_mapping_not_rewritten_if_unchanged(tmp_path: Path):
+    """Test an up-to-date YAML file is left untouched."""
+    out_path = tmp_path / "mapping.yaml"
+    _write_mapping_if_changed(mapping=MAPPING, out_path=out_path)
+    os.utime(out_path, ns=(0, 0))
+    _write_mapping_if_changed(
+        mapping=dict(reversed(MAPPING.items())), out_path=out_path
+    )
+    assert out_path.stat().st_mtime_ns == 0
+
+
+def test_mapping_rewritten_if_file_edited(tmp_path: Path):
+    """Test the YAML file is rewritten if it no longer holds the mapping."""
+    out_path = tmp_path / "mapping.yaml"
+    _write_mapping_if_changed(mapping=MAPPING, out_path=out_path)
+    out_path.write_text("--- sentinel\n", encoding="utf-8")
+    _write_mapping_if_changed(mapping=MAPPING, out_path=out_path)
+    assert yaml.safe_load(out_path.read_text(encoding="utf-8")) == MAPPING
+
+
+def test_mapping_rewritten_if_changed(tmp_path: Path):
+    """Test the YAML file is rewritten if the mapping changed."""
+    out_path = tmp_path / "mapping.yaml"
+    _write_mapping_if_changed(mapping=MAPPING, out_path=out_path)
+    new_mapping = MAPPING | {
+        "var3": {"module": "test_module", "dtype": "bool", "survey_years": [2021]}
+    }
+    _write_mapping_if_changed(mapping=new_mapping, out_path=out_path)
+    assert yaml.safe_load(out_path.read_text(encoding="utf-8")) == new_mapping